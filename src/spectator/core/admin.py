@@ -1,10 +1,201 @@
+import hashlib
+
 from django.contrib import admin
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import JsonResponse
+from django.urls import NoReverseMatch, path, reverse
+from django.utils.functional import cached_property
+
+from .models import Creator, Task
+from .search import autocomplete, get_cache_version
+
+# How long to cache each page of autocomplete results, in seconds:
+AUTOCOMPLETE_CACHE_TIMEOUT = 60 * 10
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    For admin changelists of large tables, where counting every row on every
+    page view is slow.
+
+    If the list is unfiltered and the database is PostgreSQL, uses the query
+    planner's estimate of the table's size, as long as that's at least
+    `estimate_threshold` rows. Otherwise does a normal count.
+    """
+
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        estimate = self.get_estimated_count()
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
+
+    def get_estimated_count(self):
+        "Returns the estimated number of rows, or None if unknown."
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+        if query is None or query.where or query.is_sliced or query.distinct:
+            return None
+
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 if the table has never been analyzed:
+        return row[0] if row and row[0] >= 0 else None
+
+
+class LargeListAdminMixin:
+    """
+    For ModelAdmins whose changelists may have many rows.
+    Avoids the extra queries that count all the rows.
+    """
+
+    paginator = EstimatedCountPaginator
+
+    # Otherwise each filtered page also counts the unfiltered total:
+    show_full_result_count = False
+
+
+class IndexedAutocompleteJsonView(AutocompleteJsonView):
+    """
+    Like the admin's standard autocomplete view, but instead of using the
+    ModelAdmin's search_fields (which do slow `icontains` lookups) it uses
+    spectator.core.search.autocomplete(), and caches the results.
+    """
+
+    def get(self, request, *args, **kwargs):
+        (
+            self.term,
+            self.model_admin,
+            self.source_field,
+            to_field_name,
+        ) = self.process_request(request)
+
+        if not self.has_perm(request):
+            raise PermissionDenied
+
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+
+        queryset = self.model_admin.get_queryset(request).complex_filter(
+            self.source_field.get_limit_choices_to()
+        )
+        ids, more = self.get_ids(queryset, page)
+        objects = queryset.in_bulk(ids)
+
+        return JsonResponse(
+            {
+                "results": [
+                    self.serialize_result(objects[pk], to_field_name)
+                    for pk in ids
+                    if pk in objects
+                ],
+                "pagination": {"more": more},
+            }
+        )
+
+    def get_ids(self, queryset, page):
+        "Returns a tuple of (list of pks, more) for this page of results."
+        object_type = queryset.model._meta.label_lower
+        term = " ".join(self.term.lower().split())
+        key = "spectator:autocomplete:{}:{}:{}:{}:{}".format(
+            object_type,
+            get_cache_version(object_type),
+            self.source_field.model._meta.label_lower,
+            self.source_field.name,
+            hashlib.md5(f"{page}:{term}".encode(), usedforsecurity=False).hexdigest(),
+        )
+        result = cache.get(key)
+        if result is None:
+            result = autocomplete(
+                queryset,
+                self.model_admin.autocomplete_sort_field,
+                term,
+                offset=(page - 1) * self.paginate_by,
+                limit=self.paginate_by,
+            )
+            cache.set(key, result, AUTOCOMPLETE_CACHE_TIMEOUT)
+        return result
+
 
-from .models import Creator
+class IndexedAutocompleteSelect(AutocompleteSelect):
+    """
+    Uses the IndexedAutocompleteJsonView of the related model's ModelAdmin,
+    if it has one, instead of the admin's standard autocomplete view.
+    """
+
+    def get_url(self):
+        opts = self.field.remote_field.model._meta
+        try:
+            return reverse(
+                f"{self.admin_site.name}:{opts.app_label}_{opts.model_name}"
+                "_autocomplete"
+            )
+        except NoReverseMatch:
+            return super().get_url()
+
+
+class IndexedAutocompleteAdminMixin:
+    """
+    For the ModelAdmin of a model that other models' autocomplete_fields
+    point to. Adds an "autocomplete/" URL for IndexedAutocompleteJsonView.
+
+    autocomplete_sort_field should be the name of an indexed lowercase
+    version of the object's name or title, like "name_sort".
+    """
+
+    autocomplete_sort_field = "name_sort"
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                "autocomplete/",
+                self.admin_site.admin_view(
+                    IndexedAutocompleteJsonView.as_view(admin_site=self.admin_site)
+                ),
+                name=f"{opts.app_label}_{opts.model_name}_autocomplete",
+            ),
+            *super().get_urls(),
+        ]
+
+
+class IndexedAutocompleteFieldsMixin:
+    """
+    For ModelAdmins and inlines. Makes the fields in autocomplete_fields use
+    IndexedAutocompleteSelect widgets.
+    """
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if "widget" not in kwargs and db_field.name in self.get_autocomplete_fields(
+            request
+        ):
+            kwargs["widget"] = IndexedAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get("using")
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
 @admin.register(Creator)
-class CreatorAdmin(admin.ModelAdmin):
+class CreatorAdmin(
+    LargeListAdminMixin, IndexedAutocompleteAdminMixin, admin.ModelAdmin
+):
     list_display = (
         "name",
         "name_sort",
@@ -47,3 +238,36 @@ class CreatorAdmin(admin.ModelAdmin):
         "time_created",
         "time_modified",
     )
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    "For seeing which background tasks are waiting or have failed."
+
+    list_display = (
+        "name",
+        "status",
+        "attempts",
+        "run_after",
+        "time_modified",
+    )
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+
+    readonly_fields = (
+        "name",
+        "kwargs",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_after",
+        "last_error",
+        "time_created",
+        "time_modified",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -34,7 +34,37 @@ DATE_FORMAT = getattr(settings, "SPECTATOR_DATE_FORMAT", "%-d %b %Y")
 THUMBNAIL_DETAIL_SIZE = getattr(settings, "SPECTATOR_THUMBNAIL_DETAIL_SIZE", (320, 320))
 THUMBNAIL_LIST_SIZE = getattr(settings, "SPECTATOR_THUMBNAIL_LIST_SIZE", (80, 160))
 
+# Smaller formats to also generate thumbnails in, in order of preference,
+# for browsers that support them. Any that Pillow can't save are ignored.
+THUMBNAIL_FORMATS = getattr(settings, "SPECTATOR_THUMBNAIL_FORMATS", ("avif", "webp"))
+
 # Top-level directories, within MEDIA_ROOT, for the Event and
 # Publication thumbnails to go in:
 EVENTS_DIR_BASE = getattr(settings, "SPECTATOR_EVENTS_DIR_BASE", "events")
 READING_DIR_BASE = getattr(settings, "SPECTATOR_READING_DIR_BASE", "reading")
+
+# If True, uploaded thumbnails are named using a hash of their contents,
+# instead of being put in a directory named after their object's slug.
+# Identical files are only stored once, and files are never overwritten.
+THUMBNAIL_CONTENT_ADDRESSED = getattr(
+    settings, "SPECTATOR_THUMBNAIL_CONTENT_ADDRESSED", False
+)
+
+# If True, keep a record of which thumbnail sizes have been generated, in
+# the database and cache, and use that instead of checking the storage for
+# them. Useful if the storage is remote, like S3. See core.cachefiles.
+THUMBNAIL_MANIFEST = getattr(settings, "SPECTATOR_THUMBNAIL_MANIFEST", False)
+
+# Which search backend to use: "sqlite" (FTS5), "postgresql" (tsvector),
+# "python", or "auto" to pick one based on the database:
+SEARCH_BACKEND = getattr(settings, "SPECTATOR_SEARCH_BACKEND", "auto")
+
+# How background tasks, like generating thumbnails, are run once the
+# current transaction commits:
+# "thread" - in a pool of worker threads in the current process.
+# "sync" - straight away, in the current thread.
+# "queue" - not at all; run them with the spectator_run_tasks command.
+TASKS_MODE = getattr(settings, "SPECTATOR_TASKS_MODE", "thread")
+
+# How many worker threads to use in "thread" mode:
+TASKS_WORKERS = getattr(settings, "SPECTATOR_TASKS_WORKERS", 2)
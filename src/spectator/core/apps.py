@@ -1,4 +1,5 @@
 from django.apps import AppConfig, apps
+from django.db.models.signals import post_migrate, pre_migrate
 
 
 class SpectatorCoreAppConfig(AppConfig):
@@ -9,6 +10,23 @@ class SpectatorCoreAppConfig(AppConfig):
     # Maintain pre Django 3.2 default behaviour:
     default_auto_field = "django.db.models.AutoField"
 
+    def ready(self):
+        import spectator.core.signals
+        import spectator.core.tasks  # noqa: F401
+        from spectator.core import reports
+
+        # The reporting views would stop migrations altering their tables:
+        pre_migrate.connect(
+            reports.drop_views_before_migrate,
+            sender=self,
+            dispatch_uid="spectator.reports.pre_migrate",
+        )
+        post_migrate.connect(
+            reports.create_views_after_migrate,
+            sender=self,
+            dispatch_uid="spectator.reports.post_migrate",
+        )
+
 
 class Apps:
     """Methods for seeing which Spectator apps are installed/enabled.
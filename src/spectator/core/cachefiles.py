@@ -0,0 +1,86 @@
+"""
+A record, or manifest, of the thumbnail files that imagekit has generated,
+so that we can tell they exist without asking the storage.
+
+With imagekit's default JustInTime strategy, getting a thumbnail's URL
+checks that the file exists. With remote storage, like S3, that's a request
+per image, unless imagekit's cache already knows the answer.
+
+If the SPECTATOR_THUMBNAIL_MANIFEST setting is True, ThumbnailModelMixin's
+ImageSpecFields use the Manifest strategy instead. Each generated file is
+saved as a GeneratedThumbnail, and the names of all those generated from
+one original image are cached together. So getting the URLs of all an
+object's thumbnails needs one cache lookup, or one database query if that
+isn't cached, and no requests to the storage.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+from .models import GeneratedThumbnail
+
+
+def get_cache_key(source_name):
+    digest = hashlib.sha256(source_name.encode()).hexdigest()
+    return f"spectator:thumbnails:generated:{digest}"
+
+
+def get_generated_names(source_name):
+    "Returns the set of names of files generated from the named image."
+    key = get_cache_key(source_name)
+    names = cache.get(key)
+    if names is None:
+        names = set(
+            GeneratedThumbnail.objects.filter(source=source_name).values_list(
+                "name", flat=True
+            )
+        )
+        cache.set(key, names, None)
+    return names
+
+
+def record_generated(source_name, names):
+    "Add the names of files generated from the named image to the manifest."
+    GeneratedThumbnail.objects.bulk_create(
+        [GeneratedThumbnail(source=source_name, name=name) for name in names],
+        ignore_conflicts=True,
+    )
+    cache.delete(get_cache_key(source_name))
+
+
+def forget_generated(names):
+    "Remove the names of generated files that have been deleted."
+    sources = set(
+        GeneratedThumbnail.objects.filter(name__in=names).values_list(
+            "source", flat=True
+        )
+    )
+    GeneratedThumbnail.objects.filter(name__in=names).delete()
+    cache.delete_many([get_cache_key(source) for source in sources])
+
+
+class Manifest:
+    """
+    An imagekit cache file strategy. Like JustInTime, it generates files
+    when their URL or contents are needed, but it checks the manifest to
+    see if they already exist, instead of the storage.
+    """
+
+    def on_existence_required(self, file):
+        self.ensure_generated(file)
+
+    def on_content_required(self, file):
+        self.ensure_generated(file)
+
+    def should_verify_existence(self, file):
+        # We've already made sure it exists:
+        return False
+
+    def ensure_generated(self, file):
+        source_name = file.generator.source.name
+        if file.name in get_generated_names(source_name):
+            return
+        # Not in the manifest, so check the storage, and generate if needed:
+        file.generate()
+        record_generated(source_name, [file.name])
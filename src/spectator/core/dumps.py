@@ -0,0 +1,352 @@
+"""
+Dumping all of Spectator's data to newline-delimited JSON, and restoring it,
+without holding it all in memory or saving objects one at a time.
+
+Each line is one object, like those written by Django's "jsonl" serializer:
+
+    {"model": "spectator_core.creator", "pk": 1, "fields": {"name": ...}}
+
+Models are dumped in an order where every object comes after any objects it
+has a ForeignKey to, apart from Publication.current_reading, which is
+restored after the Readings.
+"""
+
+import datetime
+import decimal
+import json
+import tarfile
+from contextlib import contextmanager, suppress
+
+from django.apps import apps
+from django.core.files import File
+from django.core.management.color import no_style
+from django.db import connections, transaction
+
+from .apps import spectator_apps
+from .fields import NaturalSortField
+from .models import SluggedModelMixin, ThumbnailModelMixin, get_thumbnail_directory
+
+# Models in the order they're dumped and restored, for each app.
+# Derived data, like SearchEntries, generated thumbnails and Tasks, aren't
+# included.
+DUMP_MODELS = {
+    "core": ("spectator_core.Creator",),
+    "events": (
+        "spectator_events.Venue",
+        "spectator_events.Work",
+        "spectator_events.WorkRole",
+        "spectator_events.Event",
+        "spectator_events.EventRole",
+        "spectator_events.WorkSelection",
+    ),
+    "reading": (
+        "spectator_reading.PublicationSeries",
+        "spectator_reading.Publication",
+        "spectator_reading.PublicationRole",
+        "spectator_reading.Reading",
+    ),
+}
+
+# Fields that refer to objects that are restored later. They're left empty
+# when the object is created, and set once everything else is restored:
+DEFERRED_FIELDS = {
+    "spectator_reading.Publication": ("current_reading",),
+}
+
+
+def get_dump_models():
+    "The models of all the enabled apps, in the order to dump them."
+    return [
+        apps.get_model(label)
+        for app, labels in DUMP_MODELS.items()
+        if app == "core" or spectator_apps.is_enabled(app)
+        for label in labels
+    ]
+
+
+def json_default(value):
+    """
+    For json.dumps(). Unlike DjangoJSONEncoder, times keep their
+    microseconds, so they're restored exactly.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def dump_model(model, file, chunk_size=2000):
+    """
+    Write a line of JSON to file for each of a model's objects, in pk order,
+    reading them from the database in chunks.
+    Returns the number of objects.
+    """
+    label = model._meta.label_lower
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    attnames = ["pk"] + [f.attname for f in fields]
+
+    rows = (
+        model._base_manager.order_by("pk")
+        .values_list(*attnames)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    count = 0
+    for row in rows:
+        data = {
+            "model": label,
+            "pk": row[0],
+            "fields": {
+                field.name: value for field, value in zip(fields, row[1:], strict=True)
+            },
+        }
+        file.write(json.dumps(data, default=json_default, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+@contextmanager
+def stored_values(models):
+    """
+    While in use, fields that usually get their values when an object is
+    saved - NaturalSortFields and auto_now(_add) DateTimeFields - keep the
+    values the objects already have, as if saved with raw=True.
+
+    So that bulk_create() inserts the dumped sort keys and times, rather than
+    recalculating them, which for Events would need their Works and Creators.
+    Fields with no value get one as usual.
+    """
+    patched = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if (
+                isinstance(field, NaturalSortField)
+                or getattr(field, "auto_now", False)
+                or getattr(field, "auto_now_add", False)
+            ):
+                patched.append(field)
+
+    def make_pre_save(field, pre_save):
+        def stored_pre_save(model_instance, add):
+            value = getattr(model_instance, field.attname)
+            if value in (None, ""):
+                return pre_save(model_instance, add)
+            return value
+
+        return stored_pre_save
+
+    for field in patched:
+        # Set on the instance, so that deleting it restores the method:
+        field.pre_save = make_pre_save(field, field.pre_save)
+    try:
+        yield
+    finally:
+        for field in patched:
+            del field.pre_save
+
+
+class Restorer:
+    """
+    Restores objects from lines of JSON written by dump_model(), using
+    bulk_create() in batches, so no signals are sent and each object is
+    only written once.
+
+    Use like:
+
+        with transaction.atomic():
+            restorer = Restorer(models)
+            for line in file:
+                restorer.add(line)
+            restorer.finish()
+
+    Objects must be in the same order as get_dump_models().
+    """
+
+    def __init__(self, models, batch_size=1000, using="default"):
+        self.models = {model._meta.label_lower: model for model in models}
+        self.batch_size = batch_size
+        self.using = using
+        self.counts = {label: 0 for label in self.models}
+
+        self.model = None
+        self.batch = []
+
+        # e.g. {(Publication, current_reading field): {publication pk: reading pk}}
+        self.deferred = {}
+
+    def add(self, line):
+        "Add an object from a line of JSON."
+        line = line.strip()
+        if not line:
+            return
+        try:
+            data = json.loads(line)
+            label = data["model"]
+            pk = data["pk"]
+            fields = data["fields"]
+        except (ValueError, KeyError, TypeError) as e:
+            msg = f"Invalid line: {line[:100]}"
+            raise ValueError(msg) from e
+
+        if label not in self.models:
+            msg = f"Unknown or disabled model: {label}"
+            raise ValueError(msg)
+        model = self.models[label]
+
+        if model is not self.model:
+            self.flush()
+            self.model = model
+
+        self.batch.append(self.make_object(model, pk, fields))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def make_object(self, model, pk, fields):
+        "Returns an unsaved object from the dumped data."
+        values = {}
+        for name, value in fields.items():
+            field = model._meta.get_field(name)
+            values[field.attname] = value
+
+        for name in DEFERRED_FIELDS.get(model._meta.label, ()):
+            field = model._meta.get_field(name)
+            value = values.pop(field.attname, None)
+            if value is not None:
+                self.deferred.setdefault((model, field), {})[pk] = value
+
+        obj = model(pk=pk, **values)
+
+        if isinstance(obj, SluggedModelMixin) and not obj.slug:
+            # Usually set after the object is first saved, using its pk:
+            obj.slug = obj._generate_slug(pk)
+
+        return obj
+
+    def flush(self):
+        "Create the current batch of objects."
+        if not self.batch:
+            return
+        with stored_values([self.model]):
+            self.model._base_manager.using(self.using).bulk_create(self.batch)
+        self.counts[self.model._meta.label_lower] += len(self.batch)
+        self.batch = []
+
+    def finish(self):
+        """
+        Create any remaining objects, set the deferred fields, and reset the
+        database's sequences so that new objects get the next pks.
+        """
+        self.flush()
+
+        for (model, field), values in self.deferred.items():
+            objs = [
+                model(pk=pk, **{field.attname: value}) for pk, value in values.items()
+            ]
+            model._base_manager.using(self.using).bulk_update(
+                objs, [field.name], batch_size=self.batch_size
+            )
+
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), list(self.models.values())
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+
+def restore(lines, models, batch_size=1000, using="default"):
+    """
+    Restore objects from an iterable of lines of JSON, in one transaction.
+    Returns a dict of the number of objects restored for each model label.
+    """
+    with transaction.atomic(using=using):
+        restorer = Restorer(models, batch_size=batch_size, using=using)
+        for line in lines:
+            restorer.add(line)
+        restorer.finish()
+    return restorer.counts
+
+
+def get_tar_mode(path, mode):
+    "e.g. 'w|gz' for writing a stream to 'thumbnails.tar.gz'."
+    if mode == "w" and path.endswith((".gz", ".tgz")):
+        return "w|gz"
+    # When reading, tarfile can tell for itself:
+    return f"{mode}|" if mode == "w" else "r|*"
+
+
+def dump_thumbnails(models, path):
+    """
+    Write every thumbnail file that the models' objects use to a tar
+    archive at path, one file at a time. Gzipped if path ends in .gz.
+    Returns a tuple of the number of files written, and the number that
+    couldn't be found in storage.
+    """
+    count = missing = 0
+    with tarfile.open(path, mode=get_tar_mode(path, "w")) as tar:
+        for model in models:
+            if not issubclass(model, ThumbnailModelMixin):
+                continue
+            storage = model._meta.get_field("thumbnail").storage
+            names = (
+                model._base_manager.exclude(thumbnail="")
+                .order_by("thumbnail")
+                .values_list("thumbnail", flat=True)
+                .distinct()
+                .iterator(chunk_size=2000)
+            )
+            for name in names:
+                try:
+                    with storage.open(name, "rb") as file:
+                        info = tarfile.TarInfo(name)
+                        info.size = storage.size(name)
+                        with suppress(NotImplementedError):
+                            info.mtime = storage.get_modified_time(name).timestamp()
+                        tar.addfile(info, file)
+                except FileNotFoundError:
+                    missing += 1
+                else:
+                    count += 1
+    return count, missing
+
+
+def restore_thumbnails(models, path):
+    """
+    Save the files from a tar archive written by dump_thumbnails() to the
+    storage of the models' thumbnail fields, one at a time.
+
+    Only files within the models' thumbnail directories are saved, and
+    files that are already in storage are left alone.
+
+    Returns a tuple of the number of files saved, and the number skipped.
+    """
+    storages = {
+        get_thumbnail_directory(model) + "/": model._meta.get_field("thumbnail").storage
+        for model in models
+        if issubclass(model, ThumbnailModelMixin)
+    }
+
+    count = skipped = 0
+    with tarfile.open(path, mode=get_tar_mode(path, "r")) as tar:
+        for member in tar:
+            storage = next(
+                (
+                    storage
+                    for directory, storage in storages.items()
+                    if member.name.startswith(directory)
+                ),
+                None,
+            )
+            if not member.isfile() or storage is None or storage.exists(member.name):
+                skipped += 1
+                continue
+            file = File(tar.extractfile(member), name=member.name)
+            # It can't be found by seeking to the end of the stream:
+            file.size = member.size
+            storage.save(member.name, file)
+            count += 1
+    return count, skipped
@@ -0,0 +1,106 @@
+"""
+Removing location data from the EXIF data of uploaded images.
+
+JPEGs and WebP images are supported. For JPEGs only the header segments are
+read to find the EXIF data, and the whole image is only read, and rewritten,
+if that contains GPS data.
+"""
+
+import io
+import os
+
+import piexif
+from django.core.files.base import ContentFile
+
+# JPEG markers:
+START_OF_IMAGE = b"\xff\xd8"
+APP1 = 0xE1
+START_OF_SCAN = 0xDA
+END_OF_IMAGE = 0xD9
+
+EXIF_HEADER = b"Exif\x00\x00"
+
+
+def get_jpeg_exif_segment(file):
+    """
+    Returns the contents of a JPEG file's EXIF (APP1) segment, starting
+    with b"Exif\\x00\\x00", or None if it has none or isn't a JPEG.
+
+    Only reads the segments before the image data.
+    """
+    file.seek(0)
+    if file.read(2) != START_OF_IMAGE:
+        return None
+
+    while True:
+        marker = file.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (START_OF_SCAN, END_OF_IMAGE):
+            # Nothing but image data from here on.
+            return None
+
+        length_bytes = file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        # The length includes its own two bytes:
+        length = int.from_bytes(length_bytes, "big") - 2
+
+        if marker[1] == APP1:
+            segment = file.read(length)
+            if segment.startswith(EXIF_HEADER):
+                return segment
+        else:
+            file.seek(length, os.SEEK_CUR)
+
+
+def get_exif_dict(file):
+    """
+    Returns the file's EXIF data as a piexif dict, or None if there's none,
+    or it's not a JPEG or WebP image. For JPEGs this only reads the header
+    segments.
+    """
+    segment = get_jpeg_exif_segment(file)
+    try:
+        if segment is not None:
+            return piexif.load(segment)
+
+        file.seek(0)
+        header = file.read(12)
+        if header[:4] == b"RIFF" and header[8:] == b"WEBP":
+            # piexif can also handle WebP files, though not by only
+            # reading their headers.
+            file.seek(0)
+            return piexif.load(file.read())
+        return None
+    except (piexif.InvalidImageDataError, ValueError):
+        return None
+
+
+def has_gps_data(file):
+    "Does the file have any GPS data? For JPEGs this only reads the header."
+    exif_dict = get_exif_dict(file)
+    return bool(exif_dict and exif_dict.get("GPS"))
+
+
+def remove_gps_data(file):
+    """
+    Returns the file without any GPS data in its EXIF data.
+
+    If it has no GPS data, the same file is returned, without having read
+    the whole thing. Otherwise, a new ContentFile with the same name.
+    """
+    exif_dict = get_exif_dict(file)
+
+    if not exif_dict or not exif_dict.get("GPS"):
+        file.seek(0)
+        return file
+
+    exif_dict["GPS"] = {}
+    exif_bytes = piexif.dump(exif_dict)
+
+    file.seek(0)
+    output = io.BytesIO()
+    piexif.insert(exif_bytes, file.read(), output)
+
+    return ContentFile(output.getvalue(), name=file.name)
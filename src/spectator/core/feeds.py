@@ -0,0 +1,133 @@
+import datetime
+import hashlib
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_response_headers
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from .search import get_cache_version
+
+
+class CachedFeed(Feed):
+    """
+    A Feed whose XML is cached, and which responds to conditional requests
+    with "304 Not Modified", because feed readers request them often.
+
+    Each request makes one query, for the newest time_modified and number of
+    the objects in get_version_queryset(). The cached XML is used until those
+    change, or until objects of the types in version_object_types change, as
+    recorded by spectator.core.search.get_cache_version(). Last-Modified is
+    the later of the newest time_modified and when those types last changed.
+
+    Subclasses should use item_title() etc. that don't make more queries per
+    item, e.g. by prefetching in items().
+    """
+
+    # How long to cache the XML for, in seconds:
+    cache_timeout = 60 * 60 * 24
+
+    # How long feed readers and proxies can cache responses for, in seconds:
+    max_age = 60 * 10
+
+    # How many items the feed has:
+    item_count = 20
+
+    # Object types, like "spectator_core.creator", whose objects' data is used
+    # in the items, in addition to those from get_version_queryset():
+    version_object_types = ()
+
+    def get_version_queryset(self, obj):
+        "The objects whose changes mean the feed has changed."
+        raise NotImplementedError
+
+    def get_version(self, request, obj):
+        """
+        Returns a tuple of a string that changes whenever the feed's XML
+        would, and the time it last changed: the newest time_modified, or
+        when objects of the version_object_types last changed, if that's
+        later. The time is None if there are no objects.
+        """
+        data = (
+            self.get_version_queryset(obj)
+            .order_by()
+            .aggregate(last_modified=Max("time_modified"), count=Count("pk"))
+        )
+        last_modified = data["last_modified"]
+        # Each is the time.time_ns() when objects of that type last changed:
+        versions = [get_cache_version(t) for t in self.version_object_types]
+        parts = [
+            type(self).__module__,
+            type(self).__qualname__,
+            request.path,
+            request.get_host(),
+            request.scheme,
+            last_modified.isoformat() if last_modified else "",
+            str(data["count"]),
+            *(str(v) for v in versions),
+        ]
+
+        # Related objects' changes, e.g. a renamed Creator, change the items
+        # without changing their time_modified:
+        if last_modified is not None:
+            for version in versions:
+                changed = datetime.datetime.fromtimestamp(
+                    version / 1_000_000_000, tz=datetime.timezone.utc
+                )
+                last_modified = max(last_modified, changed)
+
+        return hashlib.md5("|".join(parts).encode()).hexdigest(), last_modified
+
+    def __call__(self, request, *args, **kwargs):
+        try:
+            obj = self.get_object(request, *args, **kwargs)
+        except ObjectDoesNotExist as e:
+            msg = "Feed object does not exist."
+            raise Http404(msg) from e
+
+        version, last_modified = self.get_version(request, obj)
+        etag = quote_etag(version)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            key = f"spectator:feed:{version}"
+            cached = cache.get(key)
+            if cached is None:
+                feedgen = self.get_feed(obj, request)
+                cached = (feedgen.content_type, feedgen.writeString("utf-8"))
+                cache.set(key, cached, self.cache_timeout)
+            content_type, content = cached
+            response = HttpResponse(content, content_type=content_type)
+
+        response.headers["ETag"] = etag
+        if timestamp is not None:
+            response.headers["Last-Modified"] = http_date(timestamp)
+        patch_response_headers(response, cache_timeout=self.max_age)
+        return response
+
+    def items(self, obj=None):
+        return self.get_items(obj)[: self.item_count]
+
+    def get_items(self, obj):
+        "The queryset of items, in order, before it's sliced."
+        raise NotImplementedError
+
+    def item_pubdate(self, item):
+        return item.time_created
+
+    def item_updateddate(self, item):
+        return item.time_modified
+
+
+class AtomFeedMixin:
+    "Add this to a CachedFeed subclass to make an Atom version of it."
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr("description", obj)
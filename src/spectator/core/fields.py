@@ -1,8 +1,13 @@
+import hashlib
 import logging
+import os
 import re
 
 from django.db import models
+from django.db.models.fields.files import ImageFieldFile
 
+from . import app_settings
+from .exif import remove_gps_data
 from .utils import truncate_string
 
 logger = logging.getLogger(__name__)
@@ -307,3 +312,60 @@ class PersonNaturalSortField(NaturalSortField):
 
 class PersonDisplayNaturalSortField(NaturalSortField):
     pass
+
+
+# How many hex characters of a file's SHA-256 hash to use as its name:
+CONTENT_HASH_LENGTH = 32
+
+
+def get_content_hash(content):
+    "Returns a hex hash of a File's contents, reading it in chunks."
+    sha = hashlib.sha256()
+    for chunk in content.chunks():
+        sha.update(chunk)
+    content.seek(0)
+    return sha.hexdigest()[:CONTENT_HASH_LENGTH]
+
+
+class ThumbnailFieldFile(ImageFieldFile):
+    def save(self, name, content, save=True):  # noqa: FBT002
+        # Remove any GPS data before the file is written to storage:
+        content = remove_gps_data(content)
+
+        if not app_settings.THUMBNAIL_CONTENT_ADDRESSED:
+            super().save(name, content, save=save)
+            return
+
+        extension = os.path.splitext(name)[1].lower()
+        name = f"{get_content_hash(content)}{extension}"
+
+        path = self.field.generate_filename(self.instance, name)
+        if not self.storage.exists(path):
+            super().save(name, content, save=save)
+            return
+
+        # An identical file is already stored, so use that one:
+        self.name = path
+        self._set_instance_attribute(self.name, content)
+        self._committed = True
+        if save:
+            self.instance.save()
+
+
+class ThumbnailField(models.ImageField):
+    """
+    An ImageField whose uploaded files have any GPS data removed from their
+    EXIF data before they're first written to storage.
+
+    Only a JPEG's header segments are read to check for GPS data, so files
+    without any are stored unchanged, without being read into memory.
+
+    If the SPECTATOR_THUMBNAIL_CONTENT_ADDRESSED setting is True, files are
+    named using a hash of their contents, after any GPS data is removed. If
+    an identical file is already stored, that's used instead of storing
+    another copy. So a file's contents never change, and neither do those
+    of the thumbnails imagekit generates from it, whose names are based on
+    its name.
+    """
+
+    attr_class = ThumbnailFieldFile
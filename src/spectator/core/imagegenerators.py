@@ -1,7 +1,7 @@
 from imagekit import ImageSpec, register
-from imagekit.processors import ResizeToFit
 
 from spectator.core import app_settings
+from spectator.core.processors import ResizeToFit
 
 # NOTE: All of these generators are deprecated.
 # Use the thumbnail properties on Publication and Reading models instead.
@@ -0,0 +1,76 @@
+"""
+Getting information about uploaded images, so that templates can display
+them without having to open the files from storage.
+"""
+
+import base64
+import io
+
+from PIL import ExifTags, Image, ImageOps, features
+
+# The maximum width and height of placeholder images, in pixels:
+PLACEHOLDER_SIZE = (16, 16)
+
+# EXIF orientations that rotate the image by 90 degrees, swapping its
+# width and height:
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def get_image_info(file):
+    """
+    Returns a tuple of an image file's width, its height, and a tiny
+    version of it as a data URI, for showing while the real image loads.
+
+    The width and height are those of the image once it's been rotated
+    according to its EXIF Orientation, as its thumbnails are.
+
+    The file is only read once, and JPEGs are only partly decoded.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = get_oriented_size(image)
+
+        # For JPEGs, only decode the image at a fraction of its size:
+        image.draft("RGB", (PLACEHOLDER_SIZE[0] * 4, PLACEHOLDER_SIZE[1] * 4))
+        small = ImageOps.exif_transpose(image.convert("RGB"))
+        small.thumbnail(PLACEHOLDER_SIZE)
+
+    file.seek(0)
+    return width, height, make_data_uri(small)
+
+
+def get_orientation(image):
+    "Returns a PIL Image's EXIF Orientation, from 1 (the default) to 8."
+    orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+    return orientation if orientation in range(1, 9) else 1
+
+
+def get_oriented_size(image):
+    "Returns a PIL Image's (width, height) once it's rotated to be upright."
+    width, height = image.size
+    if get_orientation(image) in ROTATED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def make_data_uri(image):
+    "Returns a small PIL Image as a data URI, in WebP if possible."
+    output = io.BytesIO()
+    if features.check_module("webp"):
+        image.save(output, format="WEBP", quality=30)
+        mime_type = "image/webp"
+    else:
+        image.save(output, format="PNG", optimize=True)
+        mime_type = "image/png"
+    data = base64.b64encode(output.getvalue()).decode("ascii")
+    return f"data:{mime_type};base64,{data}"
+
+
+def get_resized_dimensions(width, height, max_width, max_height):
+    """
+    Returns the (width, height) an image of width x height will have after
+    being resized to fit within max_width x max_height, keeping its
+    proportions, e.g. by the ResizeToFit processor.
+    """
+    ratio = min(max_width / width, max_height / height)
+    return round(width * ratio), round(height * ratio)
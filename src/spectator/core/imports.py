@@ -0,0 +1,251 @@
+"""
+Shared code for importing many Events or Readings at once, from CSV or JSON,
+without saving each object individually.
+
+Objects that might already exist (Creators, Venues, Works, Publications and
+PublicationSeries) are looked up in batches using their indexed sort key
+columns. Missing ones are created with bulk_create(). Then the fields that
+are usually set when saving each object - slugs, and sort keys that depend on
+related objects - are set with bulk_update(), and the new objects are added
+to the search index.
+
+See spectator.events.imports and spectator.reading.imports.
+"""
+
+import copy
+import csv
+import json
+import re
+from datetime import date
+
+from django.db import connections
+
+from .models import Creator
+from .search import index_objects
+
+# How many values to put in each "IN (...)" lookup:
+LOOKUP_BATCH_SIZE = 500
+
+# A Creator's name_sort depends on its kind, which import data doesn't always
+# give, so existing Creators are looked for using the sort keys of each kind:
+CREATOR_SORT_VARIANTS = tuple({"kind": kind} for kind in Creator.Kind.values)
+
+# e.g. "Caryl Churchill (Writer)":
+CREATOR_ROLE_RE = re.compile(r"^(?P<name>.*?)\s*\((?P<role>[^()]*)\)$")
+
+
+class ImportRowError(ValueError):
+    "A row of import data is invalid."
+
+    def __init__(self, row_number, message):
+        self.row_number = row_number
+        super().__init__(f"Row {row_number}: {message}")
+
+
+def read_rows(file, file_format):
+    """
+    Returns a list of dicts, one per row, from a file of CSV, with a header
+    row, or JSON, containing a list of objects.
+    """
+    if file_format == "csv":
+        return list(csv.DictReader(file))
+    if file_format == "json":
+        rows = json.load(file)
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            msg = "JSON data should be a list of objects."
+            raise ValueError(msg)
+        return rows
+    msg = f"Unknown format: {file_format}"
+    raise ValueError(msg)
+
+
+def get_value(row, key):
+    "A stripped string from a row, or '' if it's missing."
+    value = row.get(key)
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def get_list(row, key):
+    """
+    A list from a row. In JSON it can be a list. In CSV, items are separated
+    with semicolons, e.g. "Caryl Churchill; Max Stafford-Clark (Director)".
+    """
+    value = row.get(key)
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in str(value).split(";") if item.strip()]
+
+
+def parse_creator(row_number, value):
+    """
+    Returns a tuple of (name, role_name, kind) from either a string, like
+    "Name" or "Name (Role)", or a dict with "name" and optional "role" and
+    "kind" keys.
+    """
+    if isinstance(value, dict):
+        name = get_value(value, "name")
+        role_name = get_value(value, "role")
+        kind = get_value(value, "kind") or Creator.Kind.INDIVIDUAL
+    else:
+        value = str(value).strip()
+        match = CREATOR_ROLE_RE.match(value)
+        name, role_name = (
+            (match["name"], match["role"].strip()) if match else (value, "")
+        )
+        kind = Creator.Kind.INDIVIDUAL
+
+    if not name:
+        raise ImportRowError(row_number, "A creator has no name.")
+    if kind not in Creator.Kind.values:
+        raise ImportRowError(row_number, f"Unknown creator kind: {kind}")
+    return name, role_name, kind
+
+
+def parse_date(row_number, value, *, required=False):
+    """
+    Returns a tuple of a date and how much of it we know: "day", "month" or
+    "year". Accepts "YYYY-MM-DD", "YYYY-MM" or "YYYY", or "" if not required.
+    e.g. "2017-02" is (date(2017, 2, 1), "month").
+    """
+    if value == "":
+        if required:
+            raise ImportRowError(row_number, "A date is required.")
+        return None, None
+    parts = value.split("-")
+    try:
+        if len(parts) == 3:
+            return date.fromisoformat(value), "day"
+        if len(parts) == 2:
+            return date(int(parts[0]), int(parts[1]), 1), "month"
+        if len(parts) == 1:
+            return date(int(parts[0]), 1, 1), "year"
+    except ValueError:
+        pass
+    raise ImportRowError(row_number, f"Invalid date: {value}")
+
+
+def check_database(using="default"):
+    """
+    Raises a ValueError if the database can't tell us the pks of objects
+    created with bulk_create(), which we need to create related objects.
+    """
+    if not connections[using].features.can_return_rows_from_bulk_insert:
+        msg = (
+            "Importing needs a database that returns primary keys from bulk "
+            "inserts, e.g. PostgreSQL, MariaDB 10.5+ or SQLite 3.35+."
+        )
+        raise ValueError(msg)
+
+
+def get_sort_key(obj, field_name):
+    "The value a NaturalSortField would have when obj is saved."
+    return obj._meta.get_field(field_name).pre_save(obj, add=True)
+
+
+class Resolver:
+    """
+    Finds or creates objects of a model that has a NaturalSortField.
+
+    Use like:
+
+        resolver = Resolver(Creator, "name_sort", ("name",))
+        resolver.add(("Caryl Churchill",), {"name": "Caryl Churchill"})
+        resolver.resolve()
+        creator = resolver.get(("Caryl Churchill",))
+
+    Each object is identified by a key, a tuple of the values of key_fields.
+    Existing objects are found by querying for all the keys' sort keys, in
+    batches, and then matching their key_fields exactly. If several objects
+    match, the one with the lowest pk is used. Objects that aren't found are
+    created, using the attributes passed to add(), with bulk_create().
+
+    If the sort key depends on attributes that aren't in key_fields, such as
+    a Creator's kind, sort_variants is a list of dicts of the values those
+    can have, and the sort keys for all of them are looked for, e.g.
+    CREATOR_SORT_VARIANTS.
+    """
+
+    def __init__(
+        self, model, sort_field, key_fields, batch_size=1000, sort_variants=None
+    ):
+        self.model = model
+        self.sort_field = sort_field
+        self.key_fields = key_fields
+        self.batch_size = batch_size
+        self.sort_variants = sort_variants or ({},)
+
+        # Keyed by key tuple, the attributes to create each object with:
+        self.wanted = {}
+        # Keyed by key tuple, the found or created objects:
+        self.objects = {}
+        # The objects that were created:
+        self.created = []
+
+    def add(self, key, attrs):
+        "Add an object we want. attrs are only used if it has to be created."
+        self.wanted.setdefault(key, attrs)
+
+    def get(self, key):
+        return self.objects[key]
+
+    def get_key(self, obj):
+        return tuple(getattr(obj, field) for field in self.key_fields)
+
+    def get_sort_keys(self, obj):
+        "The sort keys obj could have, with each of the sort_variants."
+        sort_keys = set()
+        for attrs in self.sort_variants:
+            variant = copy.copy(obj)
+            for name, value in attrs.items():
+                setattr(variant, name, value)
+            sort_keys.add(get_sort_key(variant, self.sort_field))
+        return sort_keys
+
+    def resolve(self):
+        "Find the existing objects, and create the missing ones."
+        new_objects = {
+            key: self.model(**attrs)
+            for key, attrs in self.wanted.items()
+            if key not in self.objects
+        }
+        sort_keys = list(
+            set().union(*(self.get_sort_keys(obj) for obj in new_objects.values()))
+        )
+
+        for start in range(0, len(sort_keys), LOOKUP_BATCH_SIZE):
+            batch = sort_keys[start : start + LOOKUP_BATCH_SIZE]
+            existing = self.model._base_manager.filter(
+                **{f"{self.sort_field}__in": batch}
+            ).order_by("pk")
+            for obj in existing:
+                key = self.get_key(obj)
+                if key in new_objects and key not in self.objects:
+                    self.objects[key] = obj
+
+        missing = [obj for key, obj in new_objects.items() if key not in self.objects]
+        self.model._base_manager.bulk_create(missing, batch_size=self.batch_size)
+        for obj in missing:
+            self.objects[self.get_key(obj)] = obj
+        self.created += missing
+
+
+def set_slugs(objs, batch_size=1000):
+    """
+    Set the slugs of objects using SluggedModelMixin, which are usually set
+    when they're first saved, based on their pks.
+    """
+    if not objs:
+        return
+    for obj in objs:
+        obj.slug = obj._generate_slug(obj.pk)
+    type(objs[0])._base_manager.bulk_update(objs, ["slug"], batch_size=batch_size)
+
+
+def index_created(objs):
+    "Add new objects, all of the same model, to the search index."
+    if objs:
+        index_objects(type(objs[0]), [obj.pk for obj in objs])
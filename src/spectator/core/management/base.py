@@ -0,0 +1,256 @@
+import csv
+import itertools
+import json
+import os
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from spectator.core.thumbnails import get_thumbnail_models
+
+
+class ThumbnailsCommand(BaseCommand):
+    """
+    Base class for commands that do something with the thumbnail file of
+    every Event and Publication, in a pool of workers.
+
+    Objects are fetched in batches, in pk order. Each object is passed to
+    `work()` as a tuple of (model label, pk, thumbnail name, dry run), and
+    the results are passed to `handle_result()`. Then `report()` is called
+    with the number of seconds it took.
+
+    With --checkpoint, the last pk done for each model is saved to a file,
+    so that if the command is stopped it continues from there next time.
+
+    Child classes should set `executor_class` and `worker_name`, and
+    implement `work()`, `handle_result()` and `report()`.
+    """
+
+    # e.g. ProcessPoolExecutor:
+    executor_class = None
+
+    # e.g. "processes", for the --workers help text:
+    worker_name = "workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=self.get_default_workers(),
+            help=f"How many {self.worker_name} to use "
+            f"(default {self.get_default_workers()}). Use 1 to use none.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="How many objects to fetch and process at a time (default 100).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be done.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Path to a file to save progress in. If it exists, continue "
+            "from where it left off. It's deleted when finished.",
+        )
+
+    def get_default_workers(self):
+        return os.cpu_count() or 1
+
+    def get_executor_kwargs(self):
+        return {}
+
+    def work(self, job):
+        "Called in a worker for each object, with the job tuple."
+        raise NotImplementedError
+
+    def handle_result(self, model, pk, name, ready, result):
+        "Called in the main thread with the result of each call to work()."
+        raise NotImplementedError
+
+    def report(self, elapsed):
+        "Called at the end with the number of seconds it all took."
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        if options["workers"] < 1:
+            msg = "--workers must be 1 or more."
+            raise CommandError(msg)
+
+        self.verbosity = options["verbosity"]
+        self.dry_run = options["dry_run"]
+        self.batch_size = options["batch_size"]
+        self.checkpoint_path = options["checkpoint"]
+        self.checkpoint = self.load_checkpoint()
+
+        executor = None
+        if options["workers"] > 1:
+            executor = self.executor_class(
+                max_workers=options["workers"], **self.get_executor_kwargs()
+            )
+
+        start = time.monotonic()
+        try:
+            for model in get_thumbnail_models():
+                self.process_model(model, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        elapsed = time.monotonic() - start
+
+        if (
+            not self.dry_run
+            and self.checkpoint_path
+            and os.path.exists(self.checkpoint_path)
+        ):
+            os.remove(self.checkpoint_path)
+
+        self.report(elapsed)
+
+    def process_model(self, model, executor):
+        "Process all the objects of one model that have thumbnails."
+        model_label = model._meta.label_lower
+        queryset = model._base_manager.exclude(thumbnail="").order_by("pk")
+        last_pk = self.checkpoint.get(model_label, 0)
+
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk).values_list(
+                    "pk", "thumbnail", "thumbnails_ready"
+                )[: self.batch_size]
+            )
+            if not batch:
+                break
+
+            jobs = [(model_label, pk, name, self.dry_run) for pk, name, _ in batch]
+            if executor is None:
+                results = map(self.work, jobs)
+            else:
+                results = executor.map(self.work, jobs)
+
+            for (pk, name, ready), result in zip(batch, results, strict=True):
+                self.handle_result(model, pk, name, ready, result)
+
+            last_pk = batch[-1][0]
+            self.save_checkpoint(model_label, last_pk)
+
+            if self.verbosity > 1:
+                self.stdout.write(f"{model_label}: processed up to pk {last_pk}")
+
+    def load_checkpoint(self):
+        "Returns a dict of the last pk processed for each model's label."
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        return {}
+
+    def save_checkpoint(self, model_label, last_pk):
+        self.checkpoint[model_label] = last_pk
+        if self.checkpoint_path and not self.dry_run:
+            with open(self.checkpoint_path, "w") as f:
+                json.dump(self.checkpoint, f)
+
+
+class CSVExportCommand(BaseCommand):
+    """
+    Base class for commands that export data as a CSV file, e.g. to import
+    into another service.
+
+    Rows are written as `make_rows()` yields them, so the whole export is
+    never held in memory. Use --output to choose the file, or - to write to
+    stdout. If --since is used, its date is passed to `make_rows()`.
+
+    Child classes should set `filename`, `fieldnames`, `noun` and
+    `noun_plural`, and implement `make_rows()`.
+    """
+
+    # The default file to write to, e.g. "watched_movies.csv":
+    filename = None
+
+    # The CSV's column names, and so the keys of each row's dict:
+    fieldnames = ()
+
+    # What each row is, for messages, e.g. "movie" and "movies":
+    noun = "row"
+    noun_plural = "rows"
+
+    since_help = "Only include rows on or after this date (YYYY-MM-DD)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=self.filename,
+            help=f"Path of the CSV file to write, or - for stdout "
+            f"(default {self.filename}).",
+        )
+        parser.add_argument("--since", help=self.since_help)
+
+    def make_rows(self, since=None):
+        """
+        Yields a dict for each row of the CSV.
+
+        since -- A date, or None if all rows should be included.
+        """
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        since = None
+        if options["since"]:
+            try:
+                since = date.fromisoformat(options["since"])
+            except ValueError as e:
+                msg = "--since should be a date like 2024-01-31."
+                raise CommandError(msg) from e
+
+        rows = self.make_rows(since=since)
+
+        # Check there's something to write before creating the file:
+        first_row = next(rows, None)
+        if first_row is None:
+            msg = f"No {self.noun_plural} were found."
+            raise CommandError(msg)
+        rows = itertools.chain([first_row], rows)
+
+        output = options["output"]
+        if output == "-":
+            count = self.write_csv(self.stdout, rows)
+            # Keep stdout for the CSV:
+            messages = self.stderr
+        else:
+            with open(output, mode="w", newline="", encoding="utf-8") as file:
+                count = self.write_csv(file, rows)
+            messages = self.stdout
+
+        noun = self.noun if count == 1 else self.noun_plural
+        messages.write(
+            self.style.SUCCESS(
+                f"Wrote {count} {noun} to {'stdout' if output == '-' else output}"
+            )
+        )
+
+    def write_csv(self, file, rows):
+        """
+        Passed a file-like object and an iterable of dicts, writes them out
+        as CSV, one row at a time. Returns the number of rows written.
+        """
+        writer = csv.DictWriter(
+            file,
+            fieldnames=self.fieldnames,
+            delimiter=",",
+            quotechar='"',
+            quoting=csv.QUOTE_MINIMAL,
+        )
+
+        writer.writeheader()
+
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
@@ -0,0 +1,166 @@
+import io
+import multiprocessing
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from imagekit.processors import ResizeToFit as ImagekitResizeToFit
+from PIL import Image
+
+from spectator.core import app_settings
+from spectator.core.processors import ResizeToFit
+
+PROCESSORS = {
+    "imagekit": ImagekitResizeToFit,
+    "spectator": ResizeToFit,
+}
+
+
+def _peak_memory_bytes():
+    """
+    The most memory this process has used so far, or None if that can't be
+    found, e.g. on Windows.
+    """
+    try:
+        # On Linux, unlike ru_maxrss, this doesn't include memory used by the
+        # parent process before this one was started:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        # Only available on Unix:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # It's in bytes on macOS, and kilobytes elsewhere:
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _run(processor_name, data, sizes, repeat):
+    """
+    Run in a new process, so that its peak memory use is only from this.
+    Returns a tuple of the median seconds it took to make all the sizes
+    from the image, and how many bytes the process's peak memory grew by,
+    or None if that isn't known.
+    """
+    processor_class = PROCESSORS[processor_name]
+    start_rss = _peak_memory_bytes()
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for size in sizes:
+            image = Image.open(io.BytesIO(data))
+            processor_class(*size).process(image).load()
+        timings.append(time.perf_counter() - start)
+
+    end_rss = _peak_memory_bytes()
+    peak = None if start_rss is None or end_rss is None else end_rss - start_rss
+    return statistics.median(timings), peak
+
+
+def make_photo(width, height):
+    "Returns the bytes of a noisy JPEG, which is slower to decode than a flat one."
+    channels = [
+        Image.linear_gradient("L").resize((width, height)),
+        Image.effect_noise((width, height), 32),
+        Image.radial_gradient("L").resize((width, height)),
+    ]
+    output = io.BytesIO()
+    Image.merge("RGB", channels).save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+class Command(BaseCommand):
+    """
+    Compares how long imagekit's ResizeToFit processor, and Spectator's,
+    take to make the four thumbnail sizes from an image, and how much
+    memory they use.
+
+    By default it uses a generated 12 megapixel JPEG, like a phone photo.
+    Or pass it the paths of some of your own images.
+    """
+
+    help = "Compares the speed and memory use of thumbnail resizing processors."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Image files to use.")
+        parser.add_argument(
+            "--size",
+            default="4032x3024",
+            help="Size of the image to generate if no paths are given "
+            "(default 4032x3024).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="How many times to make each image's thumbnails (default 5).",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        if options["repeat"] < 1:
+            msg = "--repeat must be 1 or more."
+            raise CommandError(msg)
+
+        images = []
+        if options["paths"]:
+            for path in options["paths"]:
+                with open(path, "rb") as f:
+                    images.append((path, f.read()))
+        else:
+            try:
+                width, height = (int(d) for d in options["size"].split("x"))
+            except ValueError as e:
+                msg = "--size should be like 4032x3024."
+                raise CommandError(msg) from e
+            images.append(
+                (f"Generated {width}x{height} JPEG", make_photo(width, height))
+            )
+
+        list_size = app_settings.THUMBNAIL_LIST_SIZE
+        detail_size = app_settings.THUMBNAIL_DETAIL_SIZE
+        sizes = [
+            list_size,
+            [d * 2 for d in list_size],
+            detail_size,
+            [d * 2 for d in detail_size],
+        ]
+
+        for name, data in images:
+            with Image.open(io.BytesIO(data)) as image:
+                megapixels = image.width * image.height / 1_000_000
+                self.stdout.write(f"{name} ({megapixels:.1f} megapixels):")
+
+            results = {}
+            for processor_name in PROCESSORS:
+                # Start each process afresh so none of its memory is shared:
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                ) as executor:
+                    results[processor_name] = executor.submit(
+                        _run, processor_name, data, sizes, options["repeat"]
+                    ).result()
+
+                seconds, peak = results[processor_name]
+                line = f"  {processor_name:<10} {seconds * 1000:8.1f} ms"
+                if peak is not None:
+                    line += f" {peak / 1_000_000:8.1f} MB peak memory"
+                self.stdout.write(line)
+
+            old_seconds, old_peak = results["imagekit"]
+            new_seconds, new_peak = results["spectator"]
+            summary = f"  spectator is {old_seconds / new_seconds:.1f}x as fast"
+            if old_peak is not None and new_peak is not None:
+                summary += (
+                    f", and uses {new_peak / 1_000_000:.1f} MB instead of "
+                    f"{old_peak / 1_000_000:.1f} MB"
+                )
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,70 @@
+import gzip
+
+from django.core.management.base import BaseCommand
+
+from spectator.core.dumps import dump_model, dump_thumbnails, get_dump_models
+
+
+class Command(BaseCommand):
+    """
+    Writes all of Spectator's data as newline-delimited JSON, one object per
+    line, reading objects from the database in chunks.
+
+    The output can be restored by the spectator_restore command, or by
+    Django's loaddata command as a .jsonl fixture.
+    """
+
+    help = "Writes all Spectator data as newline-delimited JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Path of the file to write, or - for stdout (the default). "
+            "Compressed with gzip if it ends in .gz.",
+        )
+        parser.add_argument(
+            "--thumbnails",
+            help="Path of a tar archive to write all the thumbnail files to. "
+            "Compressed with gzip if it ends in .gz or .tgz.",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        models = get_dump_models()
+        output = options["output"]
+
+        if output == "-":
+            counts = self.dump(models, self.stdout)
+            # Keep stdout for the data:
+            messages = self.stderr
+        else:
+            opener = gzip.open if output.endswith(".gz") else open
+            with opener(output, mode="wt", encoding="utf-8") as file:
+                counts = self.dump(models, file)
+            messages = self.stdout
+
+        if options["verbosity"] > 1:
+            for label, count in counts.items():
+                messages.write(f"{label}: {count:,}")
+
+        total = sum(counts.values())
+        plural = "object" if total == 1 else "objects"
+        messages.write(self.style.SUCCESS(f"Dumped {total:,} {plural}"))
+
+        if options["thumbnails"]:
+            count, missing = dump_thumbnails(models, options["thumbnails"])
+            plural = "file" if count == 1 else "files"
+            messages.write(
+                self.style.SUCCESS(
+                    f"Archived {count:,} thumbnail {plural} to {options['thumbnails']}"
+                )
+            )
+            if missing:
+                messages.write(
+                    self.style.WARNING(f"{missing:,} thumbnail files were missing")
+                )
+
+    def dump(self, models, file):
+        "Returns a dict of the number of objects dumped for each model label."
+        return {model._meta.label_lower: dump_model(model, file) for model in models}
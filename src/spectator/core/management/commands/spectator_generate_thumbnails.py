@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+
+from spectator.core import app_settings
+from spectator.core.cachefiles import record_generated
+from spectator.core.management.base import ThumbnailsCommand
+from spectator.core.thumbnails import (
+    generate_missing_thumbnails,
+    get_thumbnail_file_names,
+    get_thumbnail_info,
+)
+
+
+def _init_worker():
+    # Needed where worker processes are started afresh rather than forked:
+    django.setup()
+
+
+class Command(ThumbnailsCommand):
+    """
+    Generates any sizes of Event and Publication thumbnails that don't
+    exist in storage, using a pool of processes.
+
+    Useful after moving media to new storage, or changing the
+    SPECTATOR_THUMBNAIL_LIST_SIZE or SPECTATOR_THUMBNAIL_DETAIL_SIZE
+    settings, so that visitors don't have to wait for them to be generated.
+
+    Also saves each thumbnail's width, height and placeholder image on its
+    object, for thumbnails uploaded before those were saved. And, if the
+    SPECTATOR_THUMBNAIL_MANIFEST setting is True, adds all the generated
+    files to the manifest.
+
+    With --checkpoint, progress is saved to a file, so that if the command
+    is stopped it will continue from the same place next time.
+    """
+
+    help = "Generates any missing thumbnail sizes for Events and Publications."
+
+    # Resizing images is CPU-bound. The workers only use storage, never the
+    # database, so they don't need their own database connections:
+    executor_class = ProcessPoolExecutor
+    worker_name = "processes"
+
+    num_objects = 0
+    num_generated = 0
+    bytes_written = 0
+
+    def get_executor_kwargs(self):
+        return {"initializer": _init_worker}
+
+    @staticmethod
+    def work(job):
+        "Returns a tuple of (missing, bytes_written, info, error)."
+        model_label, pk, name, dry_run = job
+        info = None
+        try:
+            missing, bytes_written = generate_missing_thumbnails(
+                model_label, pk, name, dry_run=dry_run
+            )
+            if not dry_run:
+                info = get_thumbnail_info(model_label, pk, name)
+        except Exception as e:  # noqa: BLE001
+            return 0, 0, None, f"{model_label} {pk} ({name}): {e}"
+        return missing, bytes_written, info, None
+
+    def handle_result(self, model, pk, name, ready, result):
+        missing, bytes_written, info, error = result
+        self.num_objects += 1
+        self.num_generated += missing
+        self.bytes_written += bytes_written
+        if error:
+            self.stderr.write(f"Couldn't generate thumbnails for {error}")
+        elif not self.dry_run:
+            model._base_manager.filter(pk=pk, thumbnail=name).update(
+                thumbnails_ready=True, **info
+            )
+            if app_settings.THUMBNAIL_MANIFEST:
+                record_generated(
+                    name,
+                    get_thumbnail_file_names(model._meta.label_lower, pk, name),
+                )
+
+    def report(self, elapsed):
+        if self.dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Would generate {self.num_generated} thumbnails "
+                    f"for {self.num_objects} objects"
+                )
+            )
+            return
+
+        rate = self.num_generated / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {self.num_generated} thumbnails for {self.num_objects} "
+                f"objects in {elapsed:.1f} seconds ({rate:.1f} images/second, "
+                f"{self.bytes_written:,} bytes written)"
+            )
+        )
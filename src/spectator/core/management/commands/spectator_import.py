@@ -0,0 +1,77 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from spectator.core.apps import spectator_apps
+from spectator.core.imports import read_rows
+
+
+class Command(BaseCommand):
+    """
+    Imports Events or Readings from a CSV or JSON file, creating any Venues,
+    Works, Creators, Publications and PublicationSeries that don't exist yet.
+
+    All the rows are checked first, and then everything is created in one
+    transaction, in batches, instead of saving each object. See
+    spectator.events.imports and spectator.reading.imports for the columns.
+    """
+
+    help = "Imports Events or Readings from a CSV or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "kind", choices=["events", "readings"], help="What the file contains."
+        )
+        parser.add_argument("path", help="Path of the CSV or JSON file.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "json"],
+            help="The file's format, if it can't be told from its extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="How many objects to create at a time (default 1000).",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        if options["batch_size"] < 1:
+            msg = "--batch-size must be 1 or more."
+            raise CommandError(msg)
+
+        kind = options["kind"]
+        app = "events" if kind == "events" else "reading"
+        if not spectator_apps.is_enabled(app):
+            msg = f"The {app} app isn't enabled."
+            raise CommandError(msg)
+
+        if kind == "events":
+            from spectator.events.imports import import_events as import_rows
+        else:
+            from spectator.reading.imports import import_readings as import_rows
+
+        path = options["path"]
+        file_format = options["format"] or os.path.splitext(path)[1][1:].lower()
+        if file_format not in ("csv", "json"):
+            msg = "Use --format to say whether the file is csv or json."
+            raise CommandError(msg)
+
+        start = time.monotonic()
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as file:
+                rows = read_rows(file, file_format)
+            counts = import_rows(rows, batch_size=options["batch_size"])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        elapsed = time.monotonic() - start
+
+        created = ", ".join(f"{count:,} {name}" for name, count in counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(rows):,} rows in {elapsed:.1f} seconds. "
+                f"Created {created}."
+            )
+        )
@@ -0,0 +1,200 @@
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from imagekit.utils import get_storage
+
+from spectator.core import app_settings
+from spectator.core.cachefiles import forget_generated
+from spectator.core.models import get_thumbnail_directory
+from spectator.core.thumbnails import (
+    get_generator_file_names,
+    get_thumbnail_file_names,
+    get_thumbnail_models,
+)
+
+
+def walk_storage(storage, path):
+    """
+    Yields the name of every file in the storage within path, including in
+    its subdirectories, one directory listing at a time.
+    """
+    try:
+        directories, files = storage.listdir(path)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield posixpath.join(path, name)
+    for directory in directories:
+        yield from walk_storage(storage, posixpath.join(path, directory))
+
+
+def get_referenced_files():
+    """
+    Returns the set of names of all the files that objects' thumbnails use:
+    the uploaded files, all the sizes generated from them, and the files
+    the "spectator:*" image generators make from them.
+    """
+    referenced = set()
+    for model in get_thumbnail_models():
+        model_label = model._meta.label_lower
+        names = (
+            model._base_manager.exclude(thumbnail="")
+            .values_list("thumbnail", flat=True)
+            .iterator(chunk_size=2000)
+        )
+        for name in names:
+            referenced.add(name)
+            referenced.update(get_thumbnail_file_names(model_label, None, name))
+            referenced.update(get_generator_file_names(model_label, None, name))
+    return referenced
+
+
+class Command(BaseCommand):
+    """
+    Deletes files that no Event or Publication uses any more, from within
+    the directories their thumbnails are uploaded to, and the imagekit cache
+    directories for those. e.g. sizes generated from replaced thumbnails,
+    and files uploaded in admin forms that were never saved.
+
+    Storage is listed one directory at a time, and each file is compared
+    against a set of the names of all the files that are used. Files that
+    were modified recently are left alone, in case they belong to an object
+    that's still being saved.
+    """
+
+    help = "Deletes unused thumbnail and image cache files from media storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report which files would be deleted.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=float,
+            default=24,
+            help="Only delete files last modified at least this many hours ago "
+            "(default 24).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="How many files to delete at a time (default 100).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="How many threads to use for checking and deleting files (default 8).",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            msg = "--workers and --batch-size must be 1 or more."
+            raise CommandError(msg)
+
+        self.verbosity = options["verbosity"]
+        self.dry_run = options["dry_run"]
+        self.batch_size = options["batch_size"]
+        self.cutoff = timezone.now() - timedelta(hours=options["min_age"])
+
+        referenced = get_referenced_files()
+
+        total_scanned = total_pruned = total_size = 0
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            self.executor = executor
+            for storage, root in self.get_roots():
+                scanned, pruned, size = self.prune(storage, root, referenced)
+                total_scanned += scanned
+                total_pruned += pruned
+                total_size += size
+                if self.verbosity > 0:
+                    self.stdout.write(
+                        f"{root}: {scanned:,} files, {pruned:,} unused "
+                        f"({size / 1_000_000:.1f} MB)"
+                    )
+
+        verb = "Would delete" if self.dry_run else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {total_pruned:,} of {total_scanned:,} files "
+                f"({total_size / 1_000_000:.1f} MB, {total_size:,} bytes)"
+            )
+        )
+
+    def get_roots(self):
+        """
+        Returns a list of (storage, directory) tuples to look for files in.
+        Only the directories of installed apps, so that files belonging to
+        an app that's been removed aren't deleted.
+        """
+        roots = []
+        for model in get_thumbnail_models():
+            directory = get_thumbnail_directory(model)
+            roots.append((model._meta.get_field("thumbnail").storage, directory))
+            # imagekit puts generated files in a matching directory:
+            roots.append(
+                (
+                    get_storage(),
+                    posixpath.join(settings.IMAGEKIT_CACHEFILE_DIR, directory),
+                )
+            )
+        return roots
+
+    def prune(self, storage, root, referenced):
+        """
+        Delete unused files within root.
+        Returns a tuple of the number of files found, the number of them that
+        were unused, and their total size in bytes.
+        """
+        scanned = pruned = total_size = 0
+        batch = []
+
+        def flush():
+            nonlocal pruned, total_size
+            deleted = []
+            for name, size in self.executor.map(
+                lambda name: self.prune_file(storage, name), batch
+            ):
+                if size is not None:
+                    deleted.append(name)
+                    total_size += size
+                    if self.verbosity > 1:
+                        self.stdout.write(f"  {name} ({size:,} bytes)")
+            pruned += len(deleted)
+            if deleted and not self.dry_run and app_settings.THUMBNAIL_MANIFEST:
+                forget_generated(deleted)
+            batch.clear()
+
+        for name in walk_storage(storage, root):
+            scanned += 1
+            if name in referenced:
+                continue
+            batch.append(name)
+            if len(batch) >= self.batch_size:
+                flush()
+        if batch:
+            flush()
+
+        return scanned, pruned, total_size
+
+    def prune_file(self, storage, name):
+        """
+        Delete an unused file, unless it was modified too recently.
+        Called in a worker thread. Returns a tuple of its name and its size,
+        or None instead of the size if it's been left alone.
+        """
+        if storage.get_modified_time(name) > self.cutoff:
+            return name, None
+        size = storage.size(name)
+        if not self.dry_run:
+            storage.delete(name)
+        return name, size
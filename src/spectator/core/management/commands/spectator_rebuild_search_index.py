@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from spectator.core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Recreates the SearchEntry for every searchable object.
+
+    Entries are updated automatically when objects are saved, so this only
+    needs running when search is first installed, or if entries get out of
+    sync, e.g. after changes made with QuerySet.update().
+    """
+
+    help = "Rebuilds the search index for all Creators, Events, Publications, etc."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="How many objects to fetch and index at a time (default 500).",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        count = rebuild_index(batch_size=options["batch_size"])
+
+        plural = "entry" if count == 1 else "entries"
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} search {plural}"))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from spectator.core.reports import is_materialized, refresh_reports
+
+
+class Command(BaseCommand):
+    """
+    Refreshes the materialized views behind the reporting models, such as
+    EventFact and ReadingFact, on PostgreSQL. Run it after changing data, e.g.
+    from a scheduled job. On other databases the views are always up to date.
+    """
+
+    help = "Refreshes the reporting views, if they're materialized."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-concurrently",
+            action="store_false",
+            dest="concurrently",
+            help="Refresh faster, but lock each view while it's refreshed.",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        if not is_materialized():
+            self.stdout.write(
+                "The reporting views aren't materialized on this database."
+            )
+            return
+
+        start = time.monotonic()
+        refreshed = refresh_reports(concurrently=options["concurrently"])
+        elapsed = time.monotonic() - start
+
+        if options["verbosity"] > 1:
+            for model in refreshed:
+                self.stdout.write(model._meta.db_table)
+
+        plural = "view" if len(refreshed) == 1 else "views"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Refreshed {len(refreshed)} reporting {plural} "
+                f"in {elapsed:.1f} seconds"
+            )
+        )
@@ -0,0 +1,87 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from spectator.core.dumps import get_dump_models, restore, restore_thumbnails
+from spectator.core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Restores data written by the spectator_dump command into an empty
+    database, in one transaction.
+
+    Objects are read a line at a time and created in batches with
+    bulk_create(), using the slugs, sort keys and times from the dump. No
+    signals are sent, so the search index is rebuilt once at the end.
+    """
+
+    help = "Restores Spectator data written by spectator_dump."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help="Path of the file to read, or - for stdin. "
+            "Read with gzip if it ends in .gz.",
+        )
+        parser.add_argument(
+            "--thumbnails",
+            help="Path of a tar archive of thumbnail files, written by "
+            "spectator_dump, to save to storage.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="How many objects to create at a time (default 1000).",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        if options["batch_size"] < 1:
+            msg = "--batch-size must be 1 or more."
+            raise CommandError(msg)
+
+        models = get_dump_models()
+
+        not_empty = [m._meta.label for m in models if m._base_manager.exists()]
+        if not_empty:
+            msg = (
+                "Data can only be restored into empty tables. These have objects: "
+                + ", ".join(not_empty)
+            )
+            raise CommandError(msg)
+
+        path = options["path"]
+        try:
+            if path == "-":
+                counts = restore(sys.stdin, models, batch_size=options["batch_size"])
+            else:
+                opener = gzip.open if path.endswith(".gz") else open
+                with opener(path, mode="rt", encoding="utf-8") as file:
+                    counts = restore(file, models, batch_size=options["batch_size"])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        if options["verbosity"] > 1:
+            for label, count in counts.items():
+                self.stdout.write(f"{label}: {count:,}")
+
+        total = sum(counts.values())
+        plural = "object" if total == 1 else "objects"
+        self.stdout.write(self.style.SUCCESS(f"Restored {total:,} {plural}"))
+
+        entries = rebuild_index()
+        plural = "entry" if entries == 1 else "entries"
+        self.stdout.write(self.style.SUCCESS(f"Indexed {entries:,} search {plural}"))
+
+        if options["thumbnails"]:
+            count, skipped = restore_thumbnails(models, options["thumbnails"])
+            plural = "file" if count == 1 else "files"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Saved {count:,} thumbnail {plural} ({skipped:,} skipped). "
+                    "Run spectator_generate_thumbnails to generate their sizes."
+                )
+            )
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from spectator.core.tasks import run_due_tasks
+
+
+class Command(BaseCommand):
+    """
+    Runs queued background tasks, such as generating thumbnails.
+
+    Tasks are usually run in worker threads as soon as they're queued, so
+    this is only needed if SPECTATOR_TASKS_MODE is "queue", or to catch up
+    on tasks left behind when a process stopped. With --watch it can be run
+    as a separate worker process.
+    """
+
+    help = "Runs any background tasks that are due."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running, checking for new tasks every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10,
+            help="How many seconds to wait between checks with --watch (default 10).",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        while True:
+            count = run_due_tasks()
+
+            if count or not options["watch"]:
+                plural = "task" if count == 1 else "tasks"
+                self.stdout.write(self.style.SUCCESS(f"Ran {count} {plural}"))
+
+            if not options["watch"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from spectator.core.management.base import ThumbnailsCommand
+from spectator.core.thumbnails import sanitize_thumbnail
+
+
+class Command(ThumbnailsCommand):
+    """
+    Removes GPS data from the EXIF data of all stored Event and Publication
+    thumbnails, using a pool of threads.
+
+    New uploads have this removed before they're stored, but older files,
+    or ones added some other way, might still have it.
+
+    Only the start of each file is read to look for GPS data, and only files
+    that have it are rewritten.
+
+    With --checkpoint, progress is saved to a file, so that if the command
+    is stopped it will continue from the same place next time.
+    """
+
+    help = "Removes GPS data from stored Event and Publication thumbnails."
+
+    # Most of the time is spent waiting for storage, so threads will do:
+    executor_class = ThreadPoolExecutor
+    worker_name = "threads"
+
+    num_objects = 0
+    num_changed = 0
+
+    def get_default_workers(self):
+        return 8
+
+    @staticmethod
+    def work(job):
+        "Returns a tuple of (had GPS data, new name, error)."
+        model_label, pk, name, dry_run = job
+        try:
+            changed, new_name = sanitize_thumbnail(
+                model_label, pk, name, dry_run=dry_run
+            )
+        except Exception as e:  # noqa: BLE001
+            return False, name, f"{model_label} {pk} ({name}): {e}"
+        return changed, new_name, None
+
+    def handle_result(self, model, pk, name, ready, result):
+        changed, new_name, error = result
+        self.num_objects += 1
+        if error:
+            self.stderr.write(f"Couldn't check thumbnail for {error}")
+            return
+        if changed:
+            self.num_changed += 1
+            if self.verbosity > 1:
+                self.stdout.write(f"GPS data in {name}")
+        if new_name != name and model._base_manager.filter(
+            pk=pk, thumbnail=name
+        ).update(thumbnail=new_name, thumbnails_ready=False):
+            # The new file's sizes have different names:
+            model(pk=pk, thumbnail=new_name).enqueue_thumbnail_generation()
+
+    def report(self, elapsed):
+        if self.dry_run:
+            message = (
+                f"Found GPS data in {self.num_changed} of {self.num_objects} thumbnails"
+            )
+        else:
+            message = (
+                f"Removed GPS data from {self.num_changed} of "
+                f"{self.num_objects} thumbnails in {elapsed:.1f} seconds"
+            )
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,57 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from spectator.core.snapshots import snapshot
+
+
+class Command(BaseCommand):
+    """
+    Copies all of Spectator's data into a new SQLite file, with indexes and
+    views that join Events and Readings to their related objects, so that it
+    can be analysed without querying the live database.
+    """
+
+    help = "Copies all Spectator data into a new SQLite file for analysis."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the SQLite file to create.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Replace the file if it already exists.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="How many rows to read and insert at a time (default 2000).",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        path = options["path"]
+        if options["batch_size"] < 1:
+            msg = "--batch-size must be 1 or more."
+            raise CommandError(msg)
+        if os.path.exists(path) and not options["force"]:
+            msg = f"{path} already exists. Use --force to replace it."
+            raise CommandError(msg)
+
+        start = time.monotonic()
+        counts = snapshot(path, batch_size=options["batch_size"])
+        elapsed = time.monotonic() - start
+
+        if options["verbosity"] > 1:
+            for table, count in counts.items():
+                self.stdout.write(f"{table}: {count:,}")
+
+        total = sum(counts.values())
+        plural = "row" if total == 1 else "rows"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Copied {total:,} {plural} from {len(counts)} tables to {path} "
+                f"in {elapsed:.1f} seconds"
+            )
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_core', '0004_auto_20180102_0959'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time_created', models.DateTimeField(auto_now_add=True, help_text='The time this item was created in the database.')),
+                ('time_modified', models.DateTimeField(auto_now=True, help_text='The time this item was last saved to the database.')),
+                ('object_type', models.CharField(max_length=100)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(blank=True, help_text="The object's title, for display.", max_length=255)),
+                ('title_text', models.TextField(blank=True, help_text="The normalized words from the object's title or name.")),
+                ('body_text', models.TextField(blank=True, help_text="The normalized words from the object's other text, e.g. notes and series titles.")),
+            ],
+            options={
+                'verbose_name_plural': 'search entries',
+                'ordering': ('title',),
+                'constraints': [models.UniqueConstraint(fields=('object_type', 'object_id'), name='spectator_search_object')],
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:28
+
+from django.db import OperationalError, migrations
+
+# Keep in sync with spectator.core.search.SQLITE_TABLE:
+SQLITE_TABLE = "spectator_core_searchentry_fts"
+
+SQLITE_CREATE = [
+    # An FTS5 table using the SearchEntry table for its content:
+    f"""CREATE VIRTUAL TABLE {SQLITE_TABLE} USING fts5(
+        title_text,
+        body_text,
+        content='spectator_core_searchentry',
+        content_rowid='id'
+    )""",
+    # Triggers to keep it in sync with the SearchEntry table:
+    f"""CREATE TRIGGER spectator_searchentry_ai
+    AFTER INSERT ON spectator_core_searchentry BEGIN
+        INSERT INTO {SQLITE_TABLE} (rowid, title_text, body_text)
+        VALUES (new.id, new.title_text, new.body_text);
+    END""",
+    f"""CREATE TRIGGER spectator_searchentry_ad
+    AFTER DELETE ON spectator_core_searchentry BEGIN
+        INSERT INTO {SQLITE_TABLE} ({SQLITE_TABLE}, rowid, title_text, body_text)
+        VALUES ('delete', old.id, old.title_text, old.body_text);
+    END""",
+    f"""CREATE TRIGGER spectator_searchentry_au
+    AFTER UPDATE ON spectator_core_searchentry BEGIN
+        INSERT INTO {SQLITE_TABLE} ({SQLITE_TABLE}, rowid, title_text, body_text)
+        VALUES ('delete', old.id, old.title_text, old.body_text);
+        INSERT INTO {SQLITE_TABLE} (rowid, title_text, body_text)
+        VALUES (new.id, new.title_text, new.body_text);
+    END""",
+    # Index any existing entries:
+    f"INSERT INTO {SQLITE_TABLE} ({SQLITE_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS spectator_searchentry_ai",
+    "DROP TRIGGER IF EXISTS spectator_searchentry_ad",
+    "DROP TRIGGER IF EXISTS spectator_searchentry_au",
+    f"DROP TABLE IF EXISTS {SQLITE_TABLE}",
+]
+
+
+def get_postgresql_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # Must match spectator.core.search.search_vector():
+    return GinIndex(
+        SearchVector("title_text", "body_text", config="simple"),
+        name="spectator_search_vector",
+    )
+
+
+def create_search_backend(apps, schema_editor):
+    """
+    On SQLite, create an FTS5 table, if the FTS5 extension is available.
+    On PostgreSQL, create a GIN index for full text search.
+    On other databases spectator.core.search will use its Python backend.
+    """
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        try:
+            for sql in SQLITE_CREATE:
+                schema_editor.execute(sql)
+        except OperationalError:
+            # Probably SQLite was compiled without FTS5.
+            for sql in SQLITE_DROP:
+                schema_editor.execute(sql)
+
+    elif vendor == "postgresql":
+        SearchEntry = apps.get_model("spectator_core", "SearchEntry")
+        schema_editor.add_index(SearchEntry, get_postgresql_index())
+
+
+def drop_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        for sql in SQLITE_DROP:
+            schema_editor.execute(sql)
+
+    elif vendor == "postgresql":
+        SearchEntry = apps.get_model("spectator_core", "SearchEntry")
+        schema_editor.remove_index(SearchEntry, get_postgresql_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("spectator_core", "0005_searchentry"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_backend, drop_search_backend),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_core', '0006_searchentry_backends'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time_created', models.DateTimeField(auto_now_add=True, help_text='The time this item was created in the database.')),
+                ('time_modified', models.DateTimeField(auto_now=True, help_text='The time this item was last saved to the database.')),
+                ('name', models.CharField(max_length=100)),
+                ('kwargs', models.JSONField(blank=True, default=dict, help_text='The arguments to run the task with.')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='How many times the task has been started.')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text="The task won't be run before this time.")),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ('run_after',),
+                'indexes': [models.Index(fields=['status', 'run_after'], name='spectator_task_due')],
+            },
+        ),
+    ]
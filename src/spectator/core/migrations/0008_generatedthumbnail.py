@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_core', '0007_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneratedThumbnail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time_created', models.DateTimeField(auto_now_add=True, help_text='The time this item was created in the database.')),
+                ('time_modified', models.DateTimeField(auto_now=True, help_text='The time this item was last saved to the database.')),
+                ('source', models.CharField(help_text='The name of the original image file.', max_length=255)),
+                ('name', models.CharField(help_text='The name of the generated file.', max_length=255, unique=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['source'], name='spectator_generated_source')],
+            },
+        ),
+    ]
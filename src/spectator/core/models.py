@@ -1,18 +1,21 @@
-import io
+import logging
 import os
 
-import piexif
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from hashids import Hashids
 from imagekit.models import ImageSpecField
-from imagekit.processors import ResizeToFit
+from PIL import features
 
 from . import app_settings
-from .fields import NaturalSortField
+from .exif import remove_gps_data
+from .fields import NaturalSortField, ThumbnailField
+from .images import get_image_info, get_resized_dimensions
 from .managers import CreatorManager
+from .processors import ResizeToFit
+
+logger = logging.getLogger(__name__)
 
 
 class TimeStampedModelMixin(models.Model):
@@ -66,12 +69,13 @@ class SluggedModelMixin(models.Model):
         return hashids.encode(value)
 
 
-def thumbnail_upload_path(instance, filename):
-    """For ImageFields' upload_to attribute.
-    e.g. '[MEDIA_ROOT]reading/publications/pok2d/my_cover_image.jpg'
+def get_thumbnail_directory(model):
+    """
+    The directory, within MEDIA_ROOT, that a model's thumbnails are
+    uploaded to, e.g. 'reading/publications'.
     """
     # e.g. "publications" or "events":
-    folder = f"{instance.__class__.__name__}s".lower()
+    folder = f"{model.__name__}s".lower()
 
     # This is kludgy, but...
     if folder == "publications":
@@ -82,7 +86,49 @@ def thumbnail_upload_path(instance, filename):
         msg = "No base directory set for this app's thumbnails"
         raise NotImplementedError(msg)
 
-    return os.path.join(path, folder, instance.slug, filename)
+    return os.path.join(path, folder)
+
+
+def thumbnail_upload_path(instance, filename):
+    """For ImageFields' upload_to attribute.
+    e.g. '[MEDIA_ROOT]reading/publications/pok2d/my_cover_image.jpg'
+
+    Or, if the SPECTATOR_THUMBNAIL_CONTENT_ADDRESSED setting is True, the
+    filename will be a hash of the file's contents (see ThumbnailFieldFile),
+    and it's put in a directory named after the hash's first two characters.
+    e.g. '[MEDIA_ROOT]reading/publications/3f/3f9ac0d2b4e8a1c65d7f0e9b2a4c6d8e.jpg'
+    """
+    directory = get_thumbnail_directory(instance.__class__)
+
+    if app_settings.THUMBNAIL_CONTENT_ADDRESSED:
+        return os.path.join(directory, filename[:2], filename)
+
+    return os.path.join(directory, instance.slug, filename)
+
+
+# The ImageSpecFields on ThumbnailModelMixin, in JPEG format:
+THUMBNAIL_SPEC_NAMES = (
+    "list_thumbnail",
+    "list_thumbnail_2x",
+    "detail_thumbnail",
+    "detail_thumbnail_2x",
+)
+
+
+def get_thumbnail_formats():
+    """
+    The formats from the SPECTATOR_THUMBNAIL_FORMATS setting that the
+    installed Pillow can save, e.g. ("avif", "webp").
+    """
+    formats = []
+    for image_format in app_settings.THUMBNAIL_FORMATS:
+        try:
+            if features.check_module(image_format):
+                formats.append(image_format)
+        except ValueError:
+            # This version of Pillow doesn't know about this format at all.
+            pass
+    return tuple(formats)
 
 
 class ThumbnailModelMixin(models.Model):
@@ -96,21 +142,83 @@ class ThumbnailModelMixin(models.Model):
     * detail_thumbnail - Used for detail pages
     * detail_thumbnail_2x - Retina version of detail_thumbnail
 
+    Each of those also has WebP and AVIF versions, e.g. list_thumbnail_webp
+    and list_thumbnail_2x_avif. Only those in `thumbnail_formats` are used.
+
     Specify the dimensions using the THUMBNAIL_LIST_SIZE and
     THUMBNAIL_DETAIL_SIZE Django settings.
+
+    Any GPS data is removed from a new thumbnail before it's stored (see
+    ThumbnailField). Then all its sizes are generated by a background task
+    (see spectator.core.tasks). Until then `thumbnails_ready` is False, and
+    templates show a placeholder.
+
+    When a new thumbnail is saved its width and height, and a tiny version
+    of it to use as a placeholder, are saved too. So templates can get the
+    size of any version from get_thumbnail_dimensions() without having to
+    open any files from storage.
     """
 
-    thumbnail = models.ImageField(
+    thumbnail = ThumbnailField(
         upload_to=thumbnail_upload_path, null=False, blank=True, default=""
     )
 
+    thumbnails_ready = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Have all the sizes of the current thumbnail been generated?",
+    )
+
+    thumbnail_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Width of the original thumbnail image, in pixels.",
+    )
+
+    thumbnail_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Height of the original thumbnail image, in pixels.",
+    )
+
+    thumbnail_placeholder = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="A tiny version of the thumbnail, as a data URI.",
+    )
+
+    # Other formats to use as well as JPEG, e.g. ("avif", "webp"):
+    thumbnail_formats = get_thumbnail_formats()
+
+    # The ImageSpecFields to generate when a thumbnail is uploaded:
+    thumbnail_spec_names = THUMBNAIL_SPEC_NAMES + tuple(
+        f"{name}_{image_format}"
+        for image_format in thumbnail_formats
+        for name in THUMBNAIL_SPEC_NAMES
+    )
+
+    # How imagekit checks whether thumbnails have been generated:
+    thumbnail_cachefile_strategy = (
+        "spectator.core.cachefiles.Manifest"
+        if app_settings.THUMBNAIL_MANIFEST
+        else None
+    )
+
     # Common ImageSpecField arguments:
     thumbnail_kwargs = {
         "source": "thumbnail",
         "format": "JPEG",
         "options": {"quality": 80},
+        "cachefile_strategy": thumbnail_cachefile_strategy,
     }
 
+    # For sizing placeholders until the thumbnails are ready:
+    list_thumbnail_dimensions = app_settings.THUMBNAIL_LIST_SIZE
+    detail_thumbnail_dimensions = app_settings.THUMBNAIL_DETAIL_SIZE
+
     # Calculate dimensions for 2x images:
     list_thumbnail_2x_dimensions = [d * 2 for d in app_settings.THUMBNAIL_LIST_SIZE]
     detail_thumbnail_2x_dimensions = [d * 2 for d in app_settings.THUMBNAIL_DETAIL_SIZE]
@@ -132,6 +240,46 @@ class ThumbnailModelMixin(models.Model):
         processors=[ResizeToFit(*detail_thumbnail_2x_dimensions)], **thumbnail_kwargs
     )
 
+    # Smaller versions of the above in other formats:
+    webp_kwargs = {
+        "source": "thumbnail",
+        "format": "WEBP",
+        "options": {"quality": 75},
+        "cachefile_strategy": thumbnail_cachefile_strategy,
+    }
+    avif_kwargs = {
+        "source": "thumbnail",
+        "format": "AVIF",
+        "options": {"quality": 60},
+        "cachefile_strategy": thumbnail_cachefile_strategy,
+    }
+
+    list_thumbnail_webp = ImageSpecField(
+        processors=[ResizeToFit(*app_settings.THUMBNAIL_LIST_SIZE)], **webp_kwargs
+    )
+    list_thumbnail_2x_webp = ImageSpecField(
+        processors=[ResizeToFit(*list_thumbnail_2x_dimensions)], **webp_kwargs
+    )
+    detail_thumbnail_webp = ImageSpecField(
+        processors=[ResizeToFit(*app_settings.THUMBNAIL_DETAIL_SIZE)], **webp_kwargs
+    )
+    detail_thumbnail_2x_webp = ImageSpecField(
+        processors=[ResizeToFit(*detail_thumbnail_2x_dimensions)], **webp_kwargs
+    )
+
+    list_thumbnail_avif = ImageSpecField(
+        processors=[ResizeToFit(*app_settings.THUMBNAIL_LIST_SIZE)], **avif_kwargs
+    )
+    list_thumbnail_2x_avif = ImageSpecField(
+        processors=[ResizeToFit(*list_thumbnail_2x_dimensions)], **avif_kwargs
+    )
+    detail_thumbnail_avif = ImageSpecField(
+        processors=[ResizeToFit(*app_settings.THUMBNAIL_DETAIL_SIZE)], **avif_kwargs
+    )
+    detail_thumbnail_2x_avif = ImageSpecField(
+        processors=[ResizeToFit(*detail_thumbnail_2x_dimensions)], **avif_kwargs
+    )
+
     class Meta:
         abstract = True
 
@@ -145,7 +293,8 @@ class ThumbnailModelMixin(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        Move thumbnail file to correct location, and remove any location EXIF data.
+        Move thumbnail file to correct location, and queue a task to generate
+        the different sizes.
 
         Ensure the uploaded thumbnail is in a directory for this object, with
         self.slug in the path.
@@ -155,6 +304,16 @@ class ThumbnailModelMixin(models.Model):
         it a pk, on which the slug is based. So we ensure the thumbnail is eventually
         saved the correct path here.
         """
+        # A new file that hasn't been stored yet might have the same name as
+        # the previous one:
+        thumbnail_changed = (
+            self.__original_thumbnail_name != self.thumbnail.name
+            or not self.thumbnail._committed
+        )
+        if thumbnail_changed:
+            # Until the new thumbnail's sizes have been generated:
+            self.thumbnails_ready = False
+
         if self.pk is None and self.thumbnail:
             # The thumbnail will have been saved to a directory that doesn't have the
             # slug name, because the slug hasn't been created yet.
@@ -166,49 +325,140 @@ class ThumbnailModelMixin(models.Model):
             self.thumbnail = saved_thumbnail
             kwargs["force_insert"] = False
 
+        if thumbnail_changed:
+            # Before the new file is stored, so it's not read from storage:
+            self.update_thumbnail_info()
+
         super().save(*args, **kwargs)
 
-        if self.thumbnail and self.__original_thumbnail_name != self.thumbnail.name:
-            # New thumbnail; remove GPS data.
-            self.sanitize_thumbnail_exif_data()
+        if self.thumbnail and thumbnail_changed:
+            # New thumbnail; generate sizes.
+            self.enqueue_thumbnail_generation()
 
         # Set the original to whatever the current thumbnail is, so we
         # can tell if it changes again.
         self.__original_thumbnail_name = self.thumbnail.name
 
-    def sanitize_thumbnail_exif_data(self):
+    def update_thumbnail_info(self):
+        """
+        Set the thumbnail's width, height and placeholder from its file.
+
+        A newly-uploaded file is read before it's stored, so this only needs
+        to open the file from storage if the thumbnail was set by name.
+        """
+        self.thumbnail_width = None
+        self.thumbnail_height = None
+        self.thumbnail_placeholder = ""
+
+        if not self.thumbnail:
+            return
+
+        try:
+            if self.thumbnail._committed:
+                storage = self.thumbnail.storage
+                with storage.open(self.thumbnail.name, mode="rb") as file:
+                    info = get_image_info(file)
+            else:
+                info = get_image_info(self.thumbnail.file)
+        except OSError:
+            logger.warning("Couldn't read thumbnail %s", self.thumbnail.name)
+            return
+
+        (
+            self.thumbnail_width,
+            self.thumbnail_height,
+            self.thumbnail_placeholder,
+        ) = info
+
+    def get_thumbnail_dimensions(self, spec_name):
+        """
+        Returns the (width, height) of one of the thumbnail's versions, e.g.
+        "list_thumbnail" or "detail_thumbnail_2x_webp", without opening it.
+
+        Returns None if the original thumbnail's size isn't known.
         """
-        If the thumbnail has any GPS data in its EXIF data, remove it.
+        if not self.thumbnail_width or not self.thumbnail_height:
+            return None
+
+        # e.g. "detail_thumbnail_2x_webp" is the same size as "detail_thumbnail_2x":
+        for image_format in self.thumbnail_formats:
+            spec_name = spec_name.removesuffix(f"_{image_format}")
+
+        max_width, max_height = getattr(self, f"{spec_name}_dimensions")
+        return get_resized_dimensions(
+            self.thumbnail_width, self.thumbnail_height, max_width, max_height
+        )
+
+    def enqueue_thumbnail_generation(self):
+        """
+        Queue a task to generate all the current thumbnail's sizes, once the
+        current transaction commits.
         """
-        if self.thumbnail:
-            # We can't just do piexif.load(self.thumbnail.path) in case files are
-            # stored on S3 or similar, where that doesn't work.
-            # So, we use default_storage:
-            file = default_storage.open(self.thumbnail.name, mode="rb")
-            file_data = file.read()
-            file.close()
+        # Imported here to avoid a circular import:
+        from .tasks import enqueue
+
+        enqueue(
+            "spectator.generate_thumbnails",
+            model=self._meta.label_lower,
+            pk=self.pk,
+            name=self.thumbnail.name,
+        )
 
-            # Get the EXIF data from the file contents as a dict:
-            exif_dict = piexif.load(file_data)
+    def sanitize_thumbnail_exif_data(self):
+        """
+        If the stored thumbnail has any GPS data in its EXIF data, remove it.
 
-            if "GPS" in exif_dict and len(exif_dict["GPS"]) > 0:
-                exif_dict["GPS"] = {}
-                exif_bytes = piexif.dump(exif_dict)
+        New thumbnails have this removed before they're stored, so this is
+        only needed for files uploaded before that happened.
 
-                # Create a temporary file with existing data:
-                temp_file = io.BytesIO(file_data)
-                # Insert our updated exif data into it:
-                piexif.insert(exif_bytes, file_data, temp_file)
+        Only the file's header is read, unless it has GPS data.
+        Returns True if the file was changed.
 
-                # Remove existing image from disk (or else, when we save the new one,
-                # we'll end up with both files, the new one with a different name):
-                filename = os.path.basename(self.thumbnail.name)
-                self.thumbnail.delete(save=False)
+        The sanitized file is saved through the thumbnail field, so if
+        SPECTATOR_THUMBNAIL_CONTENT_ADDRESSED is True it's stored under the
+        hash of its new contents, and the original is deleted if no other
+        object uses it. The object itself isn't saved.
+        """
+        if not self.thumbnail:
+            return False
+
+        # We can't just use self.thumbnail.path in case files are stored on
+        # S3 or similar, where that doesn't work. So, we use storage:
+        with self.thumbnail.storage.open(self.thumbnail.name, mode="rb") as file:
+            sanitized = remove_gps_data(file)
+        if sanitized is file:
+            return False
+
+        storage = self.thumbnail.storage
+        old_name = self.thumbnail.name
+
+        if not app_settings.THUMBNAIL_CONTENT_ADDRESSED:
+            # Replace the existing file, keeping the same name if we can:
+            storage.delete(old_name)
+            self.thumbnail.name = storage.save(old_name, sanitized)
+            return True
+
+        # A file named by its contents mustn't change, so store a new one:
+        self.thumbnail.save(os.path.basename(old_name), sanitized, save=False)
+        if self.thumbnail.name != old_name and not self.thumbnail_is_shared(old_name):
+            storage.delete(old_name)
+        return True
+
+    def thumbnail_is_shared(self, name):
+        """
+        Returns True if any other object's thumbnail is the file called name,
+        which can happen if SPECTATOR_THUMBNAIL_CONTENT_ADDRESSED is True.
+        """
+        # Imported here to avoid a circular import:
+        from .thumbnails import get_thumbnail_models
 
-                # Finally, save the temporary file as the new thumbnail:
-                self.thumbnail.save(
-                    filename, ContentFile(temp_file.getvalue()), save=False
-                )
+        for model in get_thumbnail_models():
+            objects = model._base_manager.filter(thumbnail=name)
+            if isinstance(self, model):
+                objects = objects.exclude(pk=self.pk)
+            if objects.exists():
+                return True
+        return False
 
 
 class BaseRole(TimeStampedModelMixin, models.Model):
@@ -347,3 +597,119 @@ class Creator(TimeStampedModelMixin, SluggedModelMixin, models.Model):
 
     def get_plays(self):
         return self.works.filter(kind="play").distinct()
+
+
+class SearchEntry(TimeStampedModelMixin, models.Model):
+    """
+    One indexed object, e.g. a Creator, Event or Publication, with the
+    normalized words used to search for it.
+
+    Kept up to date by the signals in spectator.core.signals, and by the
+    `spectator_rebuild_search_index` management command.
+    See spectator.core.search for how these are searched.
+    """
+
+    # e.g. "spectator_events.event":
+    object_type = models.CharField(max_length=100)
+
+    object_id = models.PositiveIntegerField()
+
+    title = models.CharField(
+        max_length=255, blank=True, help_text="The object's title, for display."
+    )
+
+    title_text = models.TextField(
+        blank=True, help_text="The normalized words from the object's title or name."
+    )
+
+    body_text = models.TextField(
+        blank=True,
+        help_text="The normalized words from the object's other text, "
+        "e.g. notes and series titles.",
+    )
+
+    class Meta:
+        ordering = ("title",)
+        verbose_name_plural = "search entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["object_type", "object_id"], name="spectator_search_object"
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class Task(TimeStampedModelMixin, models.Model):
+    """
+    A job for the background task queue, e.g. generating an object's
+    thumbnails after one is uploaded.
+
+    Created by spectator.core.tasks.enqueue() and run by the task worker,
+    or by the `spectator_run_tasks` management command. Deleted once it's
+    run successfully. See spectator.core.tasks for more.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+
+    # e.g. "spectator.generate_thumbnails":
+    name = models.CharField(max_length=100)
+
+    kwargs = models.JSONField(
+        default=dict, blank=True, help_text="The arguments to run the task with."
+    )
+
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0, help_text="How many times the task has been started."
+    )
+
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+
+    run_after = models.DateTimeField(
+        default=timezone.now, help_text="The task won't be run before this time."
+    )
+
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ("run_after",)
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="spectator_task_due"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.pk})"
+
+
+class GeneratedThumbnail(TimeStampedModelMixin, models.Model):
+    """
+    A thumbnail file that imagekit has generated and stored.
+
+    If the SPECTATOR_THUMBNAIL_MANIFEST setting is True, these are used to
+    tell whether a thumbnail exists without asking the storage, which might
+    be remote. See spectator.core.cachefiles.
+    """
+
+    source = models.CharField(
+        max_length=255, help_text="The name of the original image file."
+    )
+
+    name = models.CharField(
+        max_length=255, unique=True, help_text="The name of the generated file."
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["source"], name="spectator_generated_source"),
+        ]
+
+    def __str__(self):
+        return self.name
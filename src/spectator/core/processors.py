@@ -0,0 +1,66 @@
+"""
+imagekit processors for generating thumbnails.
+"""
+
+from PIL import Image, ImageOps
+
+from .images import (
+    ROTATED_ORIENTATIONS,
+    get_orientation,
+    get_resized_dimensions,
+)
+
+
+class ResizeToFit:
+    """
+    Resizes an image to fit within width x height, keeping its proportions.
+    The result is the same size as with imagekit's ResizeToFit, but it's
+    faster, and uses much less memory, with large photos:
+
+    * The image is rotated to be upright, according to its EXIF Orientation.
+    * JPEGs are only decoded at 1/2, 1/4 or 1/8 of their full size, using
+      Image.draft(), while keeping at least twice the size we need.
+    * The resize uses reducing_gap, so most of the shrinking is done by a
+      quick reduce() before the final, slower, resampling.
+
+    It must be the first processor, because draft() only works on an image
+    that hasn't been loaded yet.
+    """
+
+    # Decode JPEGs at no less than this many times the size we need, so that
+    # the final resize has enough detail to stay sharp:
+    draft_factor = 2
+
+    # See Image.resize(). 3 is almost indistinguishable from a full resize:
+    reducing_gap = 3.0
+
+    def __init__(self, width, height, upscale=True):  # noqa: FBT002
+        self.width = width
+        self.height = height
+        self.upscale = upscale
+
+    def process(self, img):
+        orientation = get_orientation(img)
+        width, height = img.size
+        if orientation in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        size = get_resized_dimensions(width, height, self.width, self.height)
+
+        if not self.upscale and size[0] >= width:
+            return ImageOps.exif_transpose(img)
+
+        # draft() works on the image before it's rotated:
+        draft_size = tuple(d * self.draft_factor for d in size)
+        if orientation in ROTATED_ORIENTATIONS:
+            draft_size = draft_size[::-1]
+        img.draft(None, draft_size)
+
+        if orientation != 1:
+            img = ImageOps.exif_transpose(img)
+
+        if img.mode == "P":
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        return img.resize(
+            size, Image.Resampling.LANCZOS, reducing_gap=self.reducing_gap
+        )
@@ -0,0 +1,379 @@
+"""
+The reporting models, which are unmanaged models of database views that join
+and count Spectator's data, for reports and dashboards.
+
+The views' SQL is all here. On PostgreSQL the views are materialized, so
+they're quick to query but need refreshing after the data changes, using
+refresh_reports() or the spectator_refresh_reports command. On other
+databases they're ordinary views, always up to date.
+
+The views are in the way of migrations that change the tables they select
+from: SQLite rebuilds a table to alter it, which fails if a view uses it,
+and PostgreSQL won't alter or drop columns that a view uses. So instead of
+migrations creating them, the views are dropped before the migrate command
+runs any migrations, and created again afterwards, once the
+spectator_events 0052_report_views or spectator_reading 0019_report_views
+migration has been applied. See SpectatorCoreAppConfig.ready().
+"""
+
+from django.apps import apps
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+
+from .apps import spectator_apps
+
+# How each database joins the `value` column of a subquery's rows into one
+# string, in the order of its `position` and `item_id` columns. Used for
+# {string_agg} in a ReportView's SQL. SQLite's group_concat() uses the order
+# of the rows, so the subquery should be ordered too:
+STRING_AGG = {
+    "postgresql": "string_agg(value, ', ' ORDER BY position, item_id)",
+    "sqlite": "group_concat(value, ', ')",
+}
+
+
+class ReportView:
+    """
+    Describes the database view behind one reporting model.
+
+    model_label - e.g. "spectator_events.EventFact".
+    name - The view's name, which is the model's db_table.
+    sql - The SELECT statement that the view is made from. It can use
+          {string_agg}, see STRING_AGG.
+    source_models - Labels of the models whose tables the SQL selects from.
+    indexes - Lists of columns to index when the view is materialized. The
+              first is the model's primary key, and is unique, so that the
+              view can be refreshed concurrently.
+    """
+
+    def __init__(self, model_label, name, sql, *, source_models, indexes):
+        self.model_label = model_label
+        self.name = name
+        self.sql = sql
+        self.source_models = source_models
+        self.indexes = indexes
+
+    def get_sql(self, vendor="sqlite"):
+        "The SELECT statement for a database vendor, e.g. 'postgresql'."
+        return self.sql.format(string_agg=STRING_AGG[vendor])
+
+    def get_create_sql(self, quote_name, *, materialized=False, vendor="sqlite"):
+        """
+        Returns a list of SQL statements that create the view and, if it's
+        materialized, its indexes. quote_name quotes table and column names.
+        """
+        name = quote_name(self.name)
+        sql = self.get_sql(vendor)
+        if not materialized:
+            return [f"CREATE VIEW {name} AS {sql}"]
+
+        statements = [f"CREATE MATERIALIZED VIEW {name} AS {sql}"]
+        for i, columns in enumerate(self.indexes):
+            unique = "UNIQUE " if i == 0 else ""
+            statements.append(
+                f"CREATE {unique}INDEX {quote_name(f'{self.name}_{i}')} ON {name} "
+                f"({', '.join(quote_name(c) for c in columns)})"
+            )
+        return statements
+
+    def get_drop_sql(self, quote_name, *, materialized=False):
+        kind = "MATERIALIZED VIEW" if materialized else "VIEW"
+        return f"DROP {kind} IF EXISTS {quote_name(self.name)}"
+
+
+# The views for each app:
+REPORT_VIEWS = {
+    "events": [
+        ReportView(
+            "spectator_events.EventFact",
+            "spectator_events_eventfact",
+            """
+                SELECT
+                    e.id AS event_id,
+                    e.kind,
+                    e.date,
+                    e.date_month,
+                    e.date_day,
+                    COALESCE(NULLIF(e.title, ''), works.titles, creators.names, '')
+                        AS title,
+                    e.title_sort,
+                    e.venue_id,
+                    e.venue_name,
+                    COALESCE(v.country, '') AS venue_country,
+                    (
+                        SELECT COUNT(*) FROM spectator_events_workselection ws
+                        WHERE ws.event_id = e.id
+                    ) AS work_count,
+                    (
+                        SELECT COUNT(*) FROM spectator_events_eventrole r
+                        WHERE r.event_id = e.id
+                    ) AS creator_count
+                FROM spectator_events_event e
+                LEFT JOIN spectator_events_venue v ON v.id = e.venue_id
+                LEFT JOIN (
+                    SELECT event_id, {string_agg} AS titles
+                    FROM (
+                        SELECT
+                            ws.event_id,
+                            w.title AS value,
+                            ws."order" AS position,
+                            ws.id AS item_id
+                        FROM spectator_events_workselection ws
+                        JOIN spectator_events_work w ON w.id = ws.work_id
+                        ORDER BY ws.event_id, ws."order", ws.id
+                    ) t
+                    GROUP BY event_id
+                ) works ON works.event_id = e.id
+                LEFT JOIN (
+                    SELECT event_id, {string_agg} AS names
+                    FROM (
+                        SELECT
+                            r.event_id,
+                            c.name AS value,
+                            r.role_order AS position,
+                            r.id AS item_id
+                        FROM spectator_events_eventrole r
+                        JOIN spectator_core_creator c ON c.id = r.creator_id
+                        ORDER BY r.event_id, r.role_order, r.id
+                    ) t
+                    GROUP BY event_id
+                ) creators ON creators.event_id = e.id
+            """,
+            source_models=(
+                "spectator_events.Event",
+                "spectator_events.Venue",
+                "spectator_events.WorkSelection",
+                "spectator_events.Work",
+                "spectator_events.EventRole",
+                "spectator_core.Creator",
+            ),
+            indexes=[("event_id",), ("date",), ("kind", "date"), ("venue_id",)],
+        ),
+        ReportView(
+            "spectator_events.EventParticipation",
+            "spectator_events_eventparticipation",
+            """
+                SELECT
+                    p.creator_id,
+                    p.event_id,
+                    e.kind AS event_kind,
+                    e.date AS event_date,
+                    e.venue_id,
+                    SUM(p.event_role) AS event_roles,
+                    SUM(p.work_role) AS work_roles
+                FROM (
+                    SELECT creator_id, event_id, 1 AS event_role, 0 AS work_role
+                    FROM spectator_events_eventrole
+                    UNION ALL
+                    SELECT wr.creator_id, ws.event_id, 0 AS event_role, 1 AS work_role
+                    FROM spectator_events_workselection ws
+                    JOIN spectator_events_workrole wr ON wr.work_id = ws.work_id
+                ) p
+                JOIN spectator_events_event e ON e.id = p.event_id
+                GROUP BY p.creator_id, p.event_id, e.kind, e.date, e.venue_id
+            """,
+            source_models=(
+                "spectator_events.Event",
+                "spectator_events.EventRole",
+                "spectator_events.WorkSelection",
+                "spectator_events.WorkRole",
+            ),
+            indexes=[
+                ("creator_id", "event_id"),
+                ("event_id",),
+                ("event_kind", "event_date"),
+            ],
+        ),
+        ReportView(
+            "spectator_events.VenueVisitSummary",
+            "spectator_events_venuevisitsummary",
+            """
+                SELECT
+                    v.id AS venue_id,
+                    v.name,
+                    v.country,
+                    COUNT(*) AS event_count,
+                    MIN(e.date) AS first_date,
+                    MAX(e.date) AS last_date
+                FROM spectator_events_venue v
+                JOIN spectator_events_event e ON e.venue_id = v.id
+                GROUP BY v.id, v.name, v.country
+            """,
+            source_models=(
+                "spectator_events.Event",
+                "spectator_events.Venue",
+            ),
+            indexes=[("venue_id",), ("event_count",)],
+        ),
+    ],
+    "reading": [
+        ReportView(
+            "spectator_reading.ReadingFact",
+            "spectator_reading_readingfact",
+            """
+                SELECT
+                    r.id AS reading_id,
+                    r.publication_id,
+                    p.title AS publication_title,
+                    p.kind AS publication_kind,
+                    p.is_removed,
+                    p.series_id,
+                    COALESCE(s.title, '') AS series_title,
+                    r.start_date,
+                    r.start_granularity,
+                    r.end_date,
+                    r.end_granularity,
+                    r.end_date_month,
+                    r.end_date_day,
+                    r.is_finished,
+                    (
+                        SELECT COUNT(*) FROM spectator_reading_publicationrole pr
+                        WHERE pr.publication_id = r.publication_id
+                    ) AS creator_count
+                FROM spectator_reading_reading r
+                JOIN spectator_reading_publication p ON p.id = r.publication_id
+                LEFT JOIN spectator_reading_publicationseries s ON s.id = p.series_id
+            """,
+            source_models=(
+                "spectator_reading.Reading",
+                "spectator_reading.Publication",
+                "spectator_reading.PublicationSeries",
+                "spectator_reading.PublicationRole",
+            ),
+            indexes=[("reading_id",), ("publication_id",), ("end_date",)],
+        ),
+        ReportView(
+            "spectator_reading.ReadingParticipation",
+            "spectator_reading_readingparticipation",
+            """
+                SELECT
+                    pr.creator_id,
+                    r.id AS reading_id,
+                    r.publication_id,
+                    p.kind AS publication_kind,
+                    r.start_date,
+                    r.end_date,
+                    r.is_finished,
+                    COUNT(*) AS roles
+                FROM spectator_reading_publicationrole pr
+                JOIN spectator_reading_publication p ON p.id = pr.publication_id
+                JOIN spectator_reading_reading r ON r.publication_id = p.id
+                GROUP BY
+                    pr.creator_id,
+                    r.id,
+                    r.publication_id,
+                    p.kind,
+                    r.start_date,
+                    r.end_date,
+                    r.is_finished
+            """,
+            source_models=(
+                "spectator_reading.Reading",
+                "spectator_reading.Publication",
+                "spectator_reading.PublicationRole",
+            ),
+            indexes=[("creator_id", "reading_id"), ("reading_id",), ("end_date",)],
+        ),
+    ],
+}
+
+# The migration after which each app's views should exist:
+REPORT_MIGRATIONS = {
+    "events": ("spectator_events", "0052_report_views"),
+    "reading": ("spectator_reading", "0019_report_views"),
+}
+
+
+def get_report_views(using=None):
+    """
+    The ReportViews of all the enabled apps. If using is a database alias,
+    only those whose app's report views migration has been applied to it.
+    """
+    if using is not None:
+        applied = MigrationRecorder(connections[using]).applied_migrations()
+    views = []
+    for app, app_views in REPORT_VIEWS.items():
+        if not spectator_apps.is_enabled(app):
+            continue
+        if using is not None and REPORT_MIGRATIONS[app] not in applied:
+            continue
+        views += app_views
+    return views
+
+
+def get_report_models():
+    "The reporting models of all the enabled apps."
+    return [apps.get_model(view.model_label) for view in get_report_views()]
+
+
+def is_materialized(using="default"):
+    "Whether the reporting views are materialized on this database."
+    return connections[using].vendor == "postgresql"
+
+
+def create_report_views(using="default"):
+    """
+    Create the reporting views, and their indexes if they're materialized,
+    replacing any that exist. Only the views whose migrations have been
+    applied are created.
+
+    Returns a list of the ReportViews created.
+    """
+    drop_report_views(using)
+
+    connection = connections[using]
+    materialized = is_materialized(using)
+    views = get_report_views(using)
+    with connection.cursor() as cursor:
+        for view in views:
+            for sql in view.get_create_sql(
+                connection.ops.quote_name,
+                materialized=materialized,
+                vendor=connection.vendor,
+            ):
+                cursor.execute(sql)
+    return views
+
+
+def drop_report_views(using="default"):
+    "Drop all the reporting views that exist."
+    connection = connections[using]
+    materialized = is_materialized(using)
+    with connection.cursor() as cursor:
+        for view in reversed(get_report_views()):
+            cursor.execute(
+                view.get_drop_sql(connection.ops.quote_name, materialized=materialized)
+            )
+
+
+def drop_views_before_migrate(sender, using="default", **kwargs):
+    "pre_migrate signal receiver."
+    drop_report_views(using)
+
+
+def create_views_after_migrate(sender, using="default", **kwargs):
+    "post_migrate signal receiver."
+    create_report_views(using)
+
+
+def refresh_reports(*, concurrently=True, using="default"):
+    """
+    Refresh all the materialized reporting views, if they are materialized.
+
+    concurrently -- If True, queries can still read the views while they're
+        refreshed, but it takes longer.
+
+    Returns a list of the models whose views were refreshed.
+    """
+    if not is_materialized(using):
+        return []
+
+    connection = connections[using]
+    refreshed = []
+    with connection.cursor() as cursor:
+        for view in get_report_views(using):
+            table = connection.ops.quote_name(view.name)
+            option = "CONCURRENTLY " if concurrently else ""
+            cursor.execute(f"REFRESH MATERIALIZED VIEW {option}{table}")
+            refreshed.append(apps.get_model(view.model_label))
+    return refreshed
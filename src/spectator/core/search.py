@@ -0,0 +1,653 @@
+"""
+Searching Creators, Events, Works, Venues, Publications and PublicationSeries.
+
+Each object has a SearchEntry containing the normalized words from its
+title or name, and from its other text (like notes). The entries are kept
+up to date by the signals in spectator.core.signals, which update each
+changed object's entry once, when the transaction is committed.
+
+Entries are searched using one of these backends:
+
+* "sqlite" - An FTS5 table, created by a migration, that mirrors the
+  SearchEntry table. Results are ranked using bm25().
+* "postgresql" - A GIN-indexed tsvector of the SearchEntry table, ranked
+  using ts_rank().
+* "python" - Filters SearchEntries using LIKE and ranks them in Python.
+  Used if neither of the above is available.
+
+Usage:
+
+    results = search("douglas adams")
+    for entry in results[:20]:
+        print(entry.kind_name, entry.title, entry.object.get_absolute_url())
+"""
+
+import re
+import time
+import unicodedata
+from collections.abc import Sequence
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.html import strip_tags
+
+from . import app_settings
+from .apps import spectator_apps
+from .models import SearchEntry
+
+# The name of the FTS5 table created by the migration:
+SQLITE_TABLE = "spectator_core_searchentry_fts"
+
+# How much more a matching word in the title is worth than one in the body:
+TITLE_WEIGHT = 10.0
+
+# Letters and digits; underscores are treated as separators, as FTS5 does:
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def normalize(text):
+    """
+    Returns a list of the lowercase words in text, with any HTML tags and
+    accents removed.
+
+    e.g. "<p>Björk's <b>Début</b></p>" becomes ["bjork", "s", "debut"].
+    """
+    text = unicodedata.normalize("NFKD", strip_tags(text or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return WORD_RE.findall(text.casefold())
+
+
+class Indexed:
+    """
+    Describes how to index one model.
+
+    get_queryset - Returns the QuerySet used to rebuild the index, and to
+                   fetch the objects for search results.
+    get_document - Passed an object, returns a tuple of (title, body) strings,
+                   or None if the object shouldn't be searchable.
+    get_kind_name - Passed an object, returns a name for the kind of thing it
+                    is, e.g. "Book" or "Venue".
+    """
+
+    def __init__(self, model_label, get_queryset, get_document, get_kind_name=None):
+        self.model_label = model_label
+        self.get_queryset = get_queryset
+        self.get_document = get_document
+        self.get_kind_name = get_kind_name or (
+            lambda obj: obj._meta.verbose_name.capitalize()
+        )
+
+
+def get_indexed_models():
+    """
+    Returns a dict of Indexed objects, keyed by lowercase model label,
+    for all the models in enabled apps.
+    """
+    indexed = [
+        Indexed(
+            "spectator_core.Creator",
+            lambda: apps.get_model("spectator_core.Creator").objects.all(),
+            lambda creator: (creator.name, ""),
+            lambda creator: creator.get_kind_display(),
+        ),
+    ]
+
+    if spectator_apps.is_enabled("events"):
+        indexed += [
+            Indexed(
+                "spectator_events.Event",
+                lambda: (
+                    apps.get_model("spectator_events.Event")
+                    .objects.select_related("venue")
+                    .prefetch_related("roles__creator", "work_selections__work")
+                ),
+                lambda event: (event.make_title(), f"{event.venue_name} {event.note}"),
+                lambda event: event.get_kind_display(),
+            ),
+            Indexed(
+                "spectator_events.Work",
+                lambda: apps.get_model("spectator_events.Work").objects.all(),
+                lambda work: (work.title, ""),
+                lambda work: work.get_kind_display(),
+            ),
+            Indexed(
+                "spectator_events.Venue",
+                lambda: apps.get_model("spectator_events.Venue").objects.all(),
+                lambda venue: (venue.name, venue.note),
+            ),
+        ]
+
+    if spectator_apps.is_enabled("reading"):
+        indexed += [
+            Indexed(
+                "spectator_reading.PublicationSeries",
+                lambda: apps.get_model(
+                    "spectator_reading.PublicationSeries"
+                ).objects.all(),
+                lambda series: (series.title, ""),
+                lambda series: "Series",
+            ),
+            Indexed(
+                "spectator_reading.Publication",
+                lambda: apps.get_model(
+                    "spectator_reading.Publication"
+                ).objects.select_related("series"),
+                lambda publication: (
+                    None
+                    if publication.is_removed
+                    else (
+                        publication.title,
+                        publication.series.title if publication.series else "",
+                    )
+                ),
+                lambda publication: publication.get_kind_display(),
+            ),
+        ]
+
+    return {i.model_label.lower(): i for i in indexed}
+
+
+def get_object_type(obj):
+    "e.g. 'spectator_events.event'."
+    return obj._meta.label_lower
+
+
+def make_entry(obj, indexed=None):
+    """
+    Returns an unsaved SearchEntry for obj, or None if it shouldn't be
+    searchable.
+    """
+    if indexed is None:
+        indexed = get_indexed_models()[get_object_type(obj)]
+
+    document = indexed.get_document(obj)
+    if document is None:
+        return None
+
+    title, body = document
+    return SearchEntry(
+        object_type=get_object_type(obj),
+        object_id=obj.pk,
+        title=title[:255],
+        title_text=" ".join(normalize(title)),
+        body_text=" ".join(normalize(body)),
+    )
+
+
+def index_object(obj):
+    """
+    Creates, updates or deletes obj's SearchEntry.
+    Does nothing if obj isn't of an indexed model.
+    """
+    indexed = get_indexed_models().get(get_object_type(obj))
+    if indexed is None:
+        return
+
+    entry = make_entry(obj, indexed)
+    if entry is None:
+        unindex_object(obj)
+        return
+
+    # A single INSERT ... ON CONFLICT DO UPDATE query:
+    SearchEntry.objects.bulk_create(
+        [entry],
+        update_conflicts=True,
+        unique_fields=["object_type", "object_id"],
+        update_fields=["title", "title_text", "body_text", "time_modified"],
+    )
+
+
+def index_objects(model, pks, batch_size=500):
+    """
+    Creates or updates the SearchEntries of many objects of one model, e.g.
+    after creating them with bulk_create(), which sends no signals.
+    Objects that shouldn't be searchable are unindexed.
+
+    model -- An indexed model, e.g. Creator.
+    pks -- The pks of the objects to index.
+
+    Returns the number of entries created or updated.
+    """
+    indexed = get_indexed_models()[model._meta.label_lower]
+    object_type = model._meta.label_lower
+    pks = list(pks)
+    count = 0
+
+    for start in range(0, len(pks), batch_size):
+        batch = pks[start : start + batch_size]
+        entries = []
+        unindexed = []
+        for obj in indexed.get_queryset().filter(pk__in=batch):
+            entry = make_entry(obj, indexed)
+            if entry is None:
+                unindexed.append(obj.pk)
+            else:
+                entries.append(entry)
+
+        SearchEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=["object_type", "object_id"],
+            update_fields=["title", "title_text", "body_text", "time_modified"],
+        )
+        SearchEntry.objects.filter(
+            object_type=object_type, object_id__in=unindexed
+        ).delete()
+        count += len(entries)
+
+    bump_cache_version(object_type)
+    return count
+
+
+def unindex_object(obj):
+    "Deletes obj's SearchEntry, if any."
+    unindex(get_object_type(obj), obj.pk)
+
+
+def unindex(object_type, object_id):
+    SearchEntry.objects.filter(object_type=object_type, object_id=object_id).delete()
+
+
+class _PendingIndex:
+    """
+    An on_commit() callback that updates one object's SearchEntry.
+    obj is None if the entry should be deleted.
+    """
+
+    def __init__(self, key, obj):
+        self.key = key
+        self.obj = obj
+        self.called = False
+
+    def __call__(self):
+        self.called = True
+        # (obj has no pk if it was deleted later in the transaction.)
+        if self.obj is None or self.obj.pk is None:
+            unindex(*self.key)
+        else:
+            index_object(self.obj)
+        bump_cache_version(self.key[0])
+
+
+def schedule_index_object(obj):
+    """
+    Update obj's SearchEntry once the current transaction is committed.
+
+    Objects are often saved several times in one transaction (e.g. an Event
+    is saved again to set its slug, and each time one of its roles is saved)
+    so this only indexes each object once, in its final state.
+    """
+    _schedule((get_object_type(obj), obj.pk), obj)
+
+
+def schedule_unindex_object(obj):
+    "Delete obj's SearchEntry once the current transaction is committed."
+    _schedule((get_object_type(obj), obj.pk), None)
+
+
+def _schedule(key, obj):
+    # The object's changed, so cached data about its type is out of date.
+    # (The version is changed again after the commit, in case anything was
+    # cached in between.)
+    bump_cache_version(key[0])
+
+    conn = transaction.get_connection()
+    if conn.in_atomic_block:
+        # If this object is already waiting to be indexed, from the same
+        # savepoint, update that callback instead of adding another. The
+        # callbacks are kept by Django, so if a savepoint or the transaction
+        # is rolled back, those added within it are discarded too. If there
+        # are callbacks from different savepoints, they're called in order,
+        # so the last one still wins. (None is for atomic(savepoint=False).)
+        savepoint_ids = set(conn.savepoint_ids) - {None}
+        for callback_savepoint_ids, func, _ in conn.run_on_commit:
+            if (
+                isinstance(func, _PendingIndex)
+                and not func.called
+                and func.key == key
+                and callback_savepoint_ids - {None} == savepoint_ids
+            ):
+                func.obj = obj
+                return
+
+    transaction.on_commit(_PendingIndex(key, obj))
+
+
+def rebuild_index(batch_size=500):
+    """
+    Deletes all SearchEntries and recreates them from the indexed models.
+    Returns the number of entries created.
+    """
+    count = 0
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        for indexed in get_indexed_models().values():
+            entries = []
+            queryset = indexed.get_queryset().order_by("pk")
+            for obj in queryset.iterator(chunk_size=batch_size):
+                entry = make_entry(obj, indexed)
+                if entry is not None:
+                    entries.append(entry)
+                if len(entries) >= batch_size:
+                    SearchEntry.objects.bulk_create(entries)
+                    count += len(entries)
+                    entries = []
+            SearchEntry.objects.bulk_create(entries)
+            count += len(entries)
+
+    for object_type in get_indexed_models():
+        bump_cache_version(object_type)
+    return count
+
+
+class SearchResults(Sequence):
+    """
+    A lazy, sliceable sequence of ranked SearchEntries, suitable for
+    passing to a Paginator.
+
+    Only the IDs of the matching entries are held in memory. When sliced, the
+    entries and their objects are fetched from the database. Each entry has
+    these extra attributes:
+
+    * object - e.g. the Creator, Event, or Publication
+    * kind_name - e.g. "Individual", "Gig", or "Book"
+    """
+
+    def __init__(self, entry_ids):
+        self.entry_ids = list(entry_ids)
+
+    def __len__(self):
+        return len(self.entry_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._fetch(self.entry_ids[index])
+        return self._fetch([self.entry_ids[index]])[0]
+
+    def _fetch(self, entry_ids):
+        entries = SearchEntry.objects.in_bulk(entry_ids)
+        indexed_models = get_indexed_models()
+
+        object_ids = {}
+        for entry in entries.values():
+            object_ids.setdefault(entry.object_type, []).append(entry.object_id)
+
+        objects = {}
+        for object_type, ids in object_ids.items():
+            if object_type in indexed_models:
+                queryset = indexed_models[object_type].get_queryset()
+                objects[object_type] = queryset.in_bulk(ids)
+
+        results = []
+        for entry_id in entry_ids:
+            entry = entries.get(entry_id)
+            if entry is None:
+                continue
+            obj = objects.get(entry.object_type, {}).get(entry.object_id)
+            if obj is None:
+                # The entry is stale; leave it out:
+                continue
+            entry.object = obj
+            entry.kind_name = indexed_models[entry.object_type].get_kind_name(obj)
+            results.append(entry)
+        return results
+
+
+class BaseBackend:
+    "Backends should implement search_ids()."
+
+    def search(self, query):
+        "Returns a SearchResults for the query string."
+        words = normalize(query)
+        if len(words) == 0:
+            return SearchResults([])
+        return SearchResults(self.search_ids(words))
+
+    def search_ids(self, words, object_type=None, limit=None):
+        """
+        Passed a list of normalized words, returns a list of the IDs of
+        SearchEntries that match all of them, best match first.
+
+        object_type - Only match entries of this type,
+                      e.g. "spectator_core.creator".
+        limit - The maximum number of IDs to return.
+        """
+        raise NotImplementedError
+
+    def search_object_ids(self, words, object_type, limit=None):
+        """
+        Like search_ids() but returns the IDs of the matching objects,
+        rather than of their SearchEntries.
+        """
+        entry_ids = self.search_ids(words, object_type=object_type, limit=limit)
+        object_ids = dict(
+            SearchEntry.objects.filter(pk__in=entry_ids).values_list("pk", "object_id")
+        )
+        return [object_ids[pk] for pk in entry_ids if pk in object_ids]
+
+
+class SQLiteBackend(BaseBackend):
+    "Uses the FTS5 table created by migrations."
+
+    def search_ids(self, words, object_type=None, limit=None):
+        # Match entries containing all the words, or words starting with them:
+        match = " ".join(f'"{word}"*' for word in words)
+        params = [match]
+
+        sql = f"SELECT fts.rowid FROM {SQLITE_TABLE} AS fts"
+        if object_type is not None:
+            sql += " JOIN spectator_core_searchentry AS e ON e.id = fts.rowid"
+        sql += f" WHERE {SQLITE_TABLE} MATCH %s"
+        if object_type is not None:
+            sql += " AND e.object_type = %s"
+            params.append(object_type)
+        sql += f" ORDER BY bm25({SQLITE_TABLE}, %s, 1.0), fts.rowid"
+        params.append(TITLE_WEIGHT)
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgreSQLBackend(BaseBackend):
+    """
+    Uses PostgreSQL's full text search. The vector used for matching is the
+    same as the one in the GIN index created by migrations.
+    """
+
+    def search_ids(self, words, object_type=None, limit=None):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        query = SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            search_type="raw",
+            config="simple",
+        )
+        weighted_vector = SearchVector(
+            "title_text", weight="A", config="simple"
+        ) + SearchVector("body_text", weight="B", config="simple")
+
+        queryset = SearchEntry.objects.annotate(
+            vector=search_vector(), rank=SearchRank(weighted_vector, query)
+        ).filter(vector=query)
+        if object_type is not None:
+            queryset = queryset.filter(object_type=object_type)
+        queryset = queryset.order_by("-rank", "pk").values_list("pk", flat=True)
+
+        return list(queryset[:limit])
+
+
+def search_vector():
+    "The PostgreSQL vector that's indexed, and which queries must match."
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector("title_text", "body_text", config="simple")
+
+
+class PythonBackend(BaseBackend):
+    """
+    For databases without full text search. Finds SearchEntries containing
+    all the words using LIKE, then ranks them in Python.
+    """
+
+    def search_ids(self, words, object_type=None, limit=None):
+        queryset = SearchEntry.objects.all()
+        if object_type is not None:
+            queryset = queryset.filter(object_type=object_type)
+        for word in words:
+            queryset = queryset.filter(
+                Q(title_text__contains=word) | Q(body_text__contains=word)
+            )
+
+        scored = []
+        for pk, title, title_text, body_text in queryset.values_list(
+            "pk", "title", "title_text", "body_text"
+        ).iterator():
+            title_words = title_text.split()
+            body_words = body_text.split()
+            # Only count words that start with the search words, as the other
+            # backends do:
+            if not all(
+                any(w.startswith(word) for w in title_words + body_words)
+                for word in words
+            ):
+                continue
+            score = sum(
+                TITLE_WEIGHT * sum(w.startswith(word) for w in title_words)
+                + sum(w.startswith(word) for w in body_words)
+                for word in words
+            )
+            scored.append((-score, title.lower(), pk))
+
+        return [pk for _, _, pk in sorted(scored)][:limit]
+
+
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "postgresql": PostgreSQLBackend,
+    "python": PythonBackend,
+}
+
+
+def sqlite_table_exists():
+    "Whether the migration was able to create the FTS5 table."
+    return SQLITE_TABLE in connection.introspection.table_names()
+
+
+def get_backend(name=None):
+    """
+    Returns an instance of the named backend.
+    By default uses the SPECTATOR_SEARCH_BACKEND setting. If that is "auto",
+    picks the best backend for the database.
+    """
+    name = name or app_settings.SEARCH_BACKEND
+
+    if name == "auto":
+        if connection.vendor == "postgresql":
+            name = "postgresql"
+        elif connection.vendor == "sqlite" and sqlite_table_exists():
+            name = "sqlite"
+        else:
+            name = "python"
+
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        msg = f"'{name}' is not a valid search backend."
+        raise ValueError(msg) from None
+
+
+def search(query, backend=None):
+    """
+    Returns a SearchResults of everything matching the query string,
+    best match first.
+    """
+    return get_backend(backend).search(query)
+
+
+def prefix_filter(field_name, prefix):
+    """
+    Returns a Q object matching values of field_name that start with prefix,
+    in a way that can use the field's index.
+    """
+    if connection.vendor == "sqlite":
+        # SQLite's LIKE is case-insensitive, so can't use a normal index.
+        # But a range can, as the column uses binary collation:
+        return Q(
+            **{f"{field_name}__gte": prefix, f"{field_name}__lt": prefix + "\U0010ffff"}
+        )
+    # Other databases can use an index for LIKE 'prefix%'
+    # (PostgreSQL using the "_like" index Django creates):
+    return Q(**{f"{field_name}__startswith": prefix})
+
+
+def autocomplete(queryset, sort_field, term, *, offset=0, limit=20, backend=None):
+    """
+    For choosing an object by typing part of its name or title.
+
+    Returns a tuple of (list of pks, more), where `more` is True if there are
+    more results after these.
+
+    queryset - The objects to choose from, e.g. Creator.objects.all().
+    sort_field - An indexed field containing a lowercase version of the
+                 object's name or title, e.g. "name_sort".
+    term - What's been typed so far.
+
+    Objects whose sort_field starts with the term come first, alphabetically.
+    Then those whose SearchEntries contain words starting with each word in
+    the term, best match first. e.g. "adams, d" and "douglas ad" both
+    find Douglas Adams, whose name_sort is "adams, douglas".
+    """
+    prefix = " ".join(term.lower().split())
+    # Get one extra so we can tell if there are more:
+    end = offset + limit + 1
+
+    ids = list(
+        queryset.filter(prefix_filter(sort_field, prefix))
+        .order_by(sort_field, "pk")
+        .values_list("pk", flat=True)[:end]
+    )
+
+    words = normalize(term)
+    if len(ids) < end and len(words) > 0:
+        object_ids = get_backend(backend).search_object_ids(
+            words,
+            object_type=queryset.model._meta.label_lower,
+            limit=end + len(ids),
+        )
+        # Only include those in queryset, and not already found:
+        allowed = set(
+            queryset.filter(pk__in=object_ids).values_list("pk", flat=True)
+        ).difference(ids)
+        ids += [pk for pk in object_ids if pk in allowed]
+
+    ids = ids[offset:end]
+    return ids[:limit], len(ids) > limit
+
+
+def get_cache_version(object_type):
+    """
+    Returns a value that changes whenever objects of this type are changed.
+    Use it in cache keys for data about those objects, so that the cached
+    data isn't used after they've changed.
+    """
+    key = f"spectator:search:version:{object_type}"
+    version = cache.get(key)
+    if version is None:
+        # Start with a new value, in case an old one was evicted:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(object_type):
+    cache.set(f"spectator:search:version:{object_type}", time.time_ns(), None)
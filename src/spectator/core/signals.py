@@ -0,0 +1,92 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .apps import spectator_apps
+from .models import Creator
+from .search import schedule_index_object, schedule_unindex_object
+
+# Keep each object's SearchEntry up to date.
+# Some objects' entries include text from other objects (e.g. an Event's
+# title can include its Works' titles), so those are updated too.
+
+
+def object_saved(sender, instance, **kwargs):
+    "Update a saved object's search entry."
+    schedule_index_object(instance)
+
+
+def object_deleted(sender, instance, **kwargs):
+    "Remove a deleted object's search entry."
+    schedule_unindex_object(instance)
+
+
+def connect_search_signals(model):
+    name = model._meta.model_name
+    post_save.connect(
+        object_saved, sender=model, dispatch_uid=f"spectator.search.save.{name}"
+    )
+    post_delete.connect(
+        object_deleted, sender=model, dispatch_uid=f"spectator.search.delete.{name}"
+    )
+
+
+connect_search_signals(Creator)
+
+
+@receiver(
+    post_save, sender=Creator, dispatch_uid="spectator.search.save.creator_events"
+)
+def creator_saved(sender, instance, **kwargs):
+    "An Event's title might include the names of its Creators."
+    if spectator_apps.is_enabled("events"):
+        for event in instance.get_events():
+            schedule_index_object(event)
+
+
+if spectator_apps.is_enabled("events"):
+    from spectator.events.models import Event, Venue, Work, WorkSelection
+
+    for model in (Event, Venue, Work):
+        connect_search_signals(model)
+
+    @receiver(post_save, sender=Work, dispatch_uid="spectator.search.save.work_events")
+    def work_saved(sender, instance, **kwargs):
+        "An Event's title might include the titles of its Works."
+        for event in Event.objects.filter(works=instance).distinct():
+            schedule_index_object(event)
+
+    @receiver(
+        post_delete,
+        sender=WorkSelection,
+        dispatch_uid="spectator.search.delete.work_selection",
+    )
+    @receiver(
+        post_save,
+        sender=WorkSelection,
+        dispatch_uid="spectator.search.save.work_selection",
+    )
+    def work_selection_changed(sender, instance, **kwargs):
+        "An Event's title might include the titles of its Works."
+        try:
+            event = Event.objects.get(pk=instance.event_id)
+        except Event.DoesNotExist:
+            # The Event is being deleted.
+            return
+        schedule_index_object(event)
+
+
+if spectator_apps.is_enabled("reading"):
+    from spectator.reading.models import Publication, PublicationSeries
+
+    for model in (Publication, PublicationSeries):
+        connect_search_signals(model)
+
+    @receiver(
+        post_save,
+        sender=PublicationSeries,
+        dispatch_uid="spectator.search.save.publication_series_publications",
+    )
+    def publication_series_saved(sender, instance, **kwargs):
+        "A Publication's search entry includes its series' title."
+        for publication in instance.publication_set.select_related("series"):
+            schedule_index_object(publication)
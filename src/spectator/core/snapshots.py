@@ -0,0 +1,328 @@
+"""
+Copying all of Spectator's data into a new, standalone SQLite file, to
+analyse offline without querying the live database.
+
+The tables have the same names and columns as in Spectator's own database.
+They're created without indexes, filled in batches with executemany(), and
+then indexed, which is quicker than updating every index for every row.
+Then views are added which join commonly-used tables together, along with
+the same reporting views as in Spectator's database (spectator.core.reports).
+
+Dates and times are stored as ISO 8601 text, which SQLite's date and time
+functions understand, and booleans as 0 or 1.
+"""
+
+import datetime
+import decimal
+import os
+import sqlite3
+from itertools import islice
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import UniqueConstraint
+
+from .apps import spectator_apps
+from .dumps import get_dump_models
+from .reports import get_report_views
+
+# SQLite column types for Django fields' internal types. Anything else is TEXT.
+COLUMN_TYPES = {
+    "AutoField": "INTEGER",
+    "BigAutoField": "INTEGER",
+    "BigIntegerField": "INTEGER",
+    "BooleanField": "INTEGER",
+    "DecimalField": "REAL",
+    "FloatField": "REAL",
+    "ForeignKey": "INTEGER",
+    "IntegerField": "INTEGER",
+    "PositiveBigIntegerField": "INTEGER",
+    "PositiveIntegerField": "INTEGER",
+    "PositiveSmallIntegerField": "INTEGER",
+    "SmallAutoField": "INTEGER",
+    "SmallIntegerField": "INTEGER",
+}
+
+# Views that join tables together, for each app. Table names in braces are
+# replaced with the model's table, e.g. {event} with spectator_events_event.
+# (Names are joined in order by grouping ordered subqueries.)
+VIEWS = {
+    "events": {
+        "tables": {
+            "creator": "spectator_core.Creator",
+            "event": "spectator_events.Event",
+            "eventrole": "spectator_events.EventRole",
+            "venue": "spectator_events.Venue",
+            "work": "spectator_events.Work",
+            "workselection": "spectator_events.WorkSelection",
+        },
+        # Each Event with its Venue, and the names of its Works and Creators.
+        # The title is the Event's own, or else its Works', or Creators'.
+        "sql": """
+            CREATE VIEW spectator_event_details AS
+            WITH
+                works AS (
+                    SELECT event_id, group_concat(title, ', ') AS titles
+                    FROM (
+                        SELECT ws.event_id, w.title
+                        FROM {workselection} ws
+                        JOIN {work} w ON w.id = ws.work_id
+                        ORDER BY ws.event_id, ws."order", ws.id
+                    )
+                    GROUP BY event_id
+                ),
+                creators AS (
+                    SELECT event_id, group_concat(name, ', ') AS names
+                    FROM (
+                        SELECT r.event_id, c.name
+                        FROM {eventrole} r
+                        JOIN {creator} c ON c.id = r.creator_id
+                        ORDER BY r.event_id, r.role_order, r.id
+                    )
+                    GROUP BY event_id
+                )
+            SELECT
+                e.id,
+                e.date,
+                e.kind,
+                COALESCE(NULLIF(e.title, ''), works.titles, creators.names, '')
+                    AS title,
+                works.titles AS works,
+                creators.names AS creators,
+                e.venue_id,
+                COALESCE(v.name, NULLIF(e.venue_name, '')) AS venue_name,
+                v.country AS venue_country,
+                v.latitude AS venue_latitude,
+                v.longitude AS venue_longitude,
+                e.note,
+                e.slug
+            FROM {event} e
+            LEFT JOIN {venue} v ON v.id = e.venue_id
+            LEFT JOIN works ON works.event_id = e.id
+            LEFT JOIN creators ON creators.event_id = e.id
+        """,
+    },
+    "reading": {
+        "tables": {
+            "creator": "spectator_core.Creator",
+            "publication": "spectator_reading.Publication",
+            "publicationrole": "spectator_reading.PublicationRole",
+            "publicationseries": "spectator_reading.PublicationSeries",
+            "reading": "spectator_reading.Reading",
+        },
+        # Each Reading with its Publication, series and authors' names.
+        "sql": """
+            CREATE VIEW spectator_reading_details AS
+            WITH authors AS (
+                SELECT publication_id, group_concat(name, ', ') AS names
+                FROM (
+                    SELECT r.publication_id, c.name
+                    FROM {publicationrole} r
+                    JOIN {creator} c ON c.id = r.creator_id
+                    ORDER BY r.publication_id, r.role_order, r.id
+                )
+                GROUP BY publication_id
+            )
+            SELECT
+                r.id,
+                r.start_date,
+                r.start_granularity,
+                r.end_date,
+                r.end_granularity,
+                r.is_finished,
+                r.publication_id,
+                p.title,
+                p.kind,
+                s.title AS series_title,
+                authors.names AS authors,
+                p.isbn_uk,
+                p.isbn_us,
+                p.is_removed
+            FROM {reading} r
+            JOIN {publication} p ON p.id = r.publication_id
+            LEFT JOIN {publicationseries} s ON s.id = p.series_id
+            LEFT JOIN authors ON authors.publication_id = p.id
+        """,
+    },
+}
+
+
+def quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def get_column_type(field):
+    return COLUMN_TYPES.get(field.get_internal_type(), "TEXT")
+
+
+def get_create_table_sql(model):
+    "SQL to create a table for model, with no indexes apart from the pk."
+    columns = []
+    for field in model._meta.concrete_fields:
+        column = f"{quote(field.column)} {get_column_type(field)}"
+        if field.primary_key:
+            column += " PRIMARY KEY"
+        columns.append(column)
+    return f"CREATE TABLE {quote(model._meta.db_table)} ({', '.join(columns)})"
+
+
+def get_indexes(model):
+    """
+    Returns a dict of index names to tuples of columns, for the indexes the
+    model has in Spectator's database: fields with db_index or unique, and
+    the model's Meta indexes and unique constraints. Conditions on partial
+    indexes are ignored, and indexes on expressions are skipped.
+    """
+    table = model._meta.db_table
+    indexes = {}
+
+    for field in model._meta.concrete_fields:
+        if not field.primary_key and (field.db_index or field.unique):
+            indexes[f"{table}_{field.column}"] = (field.column,)
+
+    for index in model._meta.indexes:
+        if index.fields:
+            indexes[index.name] = tuple(
+                model._meta.get_field(name.lstrip("-")).column for name in index.fields
+            )
+
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.fields:
+            indexes[constraint.name] = tuple(
+                model._meta.get_field(name).column for name in constraint.fields
+            )
+
+    # Only one index for each set of columns:
+    unique = {}
+    for name, columns in indexes.items():
+        unique.setdefault(columns, name)
+    return {name: columns for columns, name in unique.items()}
+
+
+def get_views(models):
+    """
+    The SQL to create the views, and the reporting views from
+    spectator.core.reports, for enabled apps whose models are all copied.
+    """
+    views = []
+    for app, view in VIEWS.items():
+        if not spectator_apps.is_enabled(app):
+            continue
+        view_models = {
+            name: apps.get_model(label) for name, label in view["tables"].items()
+        }
+        if all(model in models for model in view_models.values()):
+            tables = {
+                name: quote(model._meta.db_table) for name, model in view_models.items()
+            }
+            views.append(view["sql"].format(**tables))
+
+    # And the reporting views, as ordinary views:
+    for view in get_report_views():
+        if all(apps.get_model(label) in models for label in view.source_models):
+            views += view.get_create_sql(quote)
+    return views
+
+
+def adapt(value):
+    "Convert a value from Django into one the sqlite3 module can store."
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return value
+
+
+def copy_model(model, db, batch_size=2000):
+    """
+    Copy all of model's objects into its table in db, an sqlite3 Connection,
+    reading them in chunks and inserting them in batches.
+    Returns the number of rows.
+    """
+    fields = model._meta.concrete_fields
+    columns = ", ".join(quote(f.column) for f in fields)
+    placeholders = ", ".join("?" for f in fields)
+    sql = (
+        f"INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})"
+    )
+
+    rows = (
+        model._base_manager.order_by("pk")
+        .values_list(*[f.attname for f in fields])
+        .iterator(chunk_size=batch_size)
+    )
+    rows = (tuple(adapt(value) for value in row) for row in rows)
+
+    count = 0
+    while batch := list(islice(rows, batch_size)):
+        db.executemany(sql, batch)
+        count += len(batch)
+    return count
+
+
+def snapshot(path, models=None, batch_size=2000):
+    """
+    Create a new SQLite database at path containing all of models' data,
+    indexes and the views. If models is None, all the models that
+    spectator_dump includes are copied.
+
+    The file is written to a temporary path first, and only moved to path
+    once it's complete, replacing any existing file.
+
+    All the models are read in one transaction so that the snapshot is
+    consistent, even if data is changed while it's being copied. On
+    PostgreSQL, that transaction uses REPEATABLE READ, unless snapshot() is
+    called within an existing transaction, which is used as it is.
+
+    Returns a dict of the number of rows copied, keyed by table name.
+    """
+    if models is None:
+        models = get_dump_models()
+
+    # SET TRANSACTION must come before any other query in the transaction:
+    in_transaction = connection.in_atomic_block
+
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    counts = {}
+    db = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        # It's a new file, so if anything fails we start again:
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute("BEGIN")
+
+        with transaction.atomic():
+            if connection.vendor == "postgresql" and not in_transaction:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"
+                    )
+            for model in models:
+                db.execute(get_create_table_sql(model))
+                counts[model._meta.db_table] = copy_model(model, db, batch_size)
+
+        for model in models:
+            for name, columns in get_indexes(model).items():
+                db.execute(
+                    f"CREATE INDEX {quote(name)} ON {quote(model._meta.db_table)} "
+                    f"({', '.join(quote(c) for c in columns)})"
+                )
+
+        for sql in get_views(models):
+            db.execute(sql)
+
+        db.execute("COMMIT")
+        db.execute("ANALYZE")
+    except BaseException:
+        db.close()
+        os.remove(tmp_path)
+        raise
+    db.close()
+
+    os.replace(tmp_path, path)
+    return counts
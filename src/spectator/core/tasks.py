@@ -0,0 +1,226 @@
+"""
+A small background task queue, so that slow work, like generating
+thumbnails, doesn't happen during a request. It needs no other services:
+tasks are stored in the database, as Task objects.
+
+Register a function as a task:
+
+    @register("spectator.do_something", max_attempts=5)
+    def do_something(pk):
+        ...
+
+And queue it, with JSON-serializable keyword arguments:
+
+    enqueue("spectator.do_something", pk=obj.pk)
+
+Queued tasks are started once the current transaction commits. How they're
+run depends on the SPECTATOR_TASKS_MODE setting (see app_settings).
+
+A task that raises an exception is retried after a delay, which doubles
+each time, until it's been tried max_attempts times. Then it's marked as
+failed, with its traceback in last_error. Successful tasks are deleted.
+
+Tasks that haven't been run, e.g. because their process stopped, or because
+SPECTATOR_TASKS_MODE is "queue", are run by the `spectator_run_tasks`
+management command.
+"""
+
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import app_settings
+from .cachefiles import record_generated
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying a failed task. Doubled after each attempt.
+RETRY_DELAY = 30
+
+# A task that's been running for this long is assumed to have been
+# abandoned, e.g. because its process stopped, and can be started again:
+STALE_AFTER = timedelta(hours=1)
+
+# Maps each task's name to (function, max_attempts):
+_registry = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def register(name, *, max_attempts=3):
+    "Decorator that registers a function as the task called `name`."
+
+    def decorator(func):
+        _registry[name] = (func, max_attempts)
+        return func
+
+    return decorator
+
+
+def enqueue(name, /, **kwargs):
+    """
+    Queue the task called `name` to be run with kwargs once the current
+    transaction commits. Returns the new Task.
+    """
+    if name not in _registry:
+        msg = f"No task called '{name}' is registered"
+        raise ValueError(msg)
+
+    _, max_attempts = _registry[name]
+    task = Task.objects.create(name=name, kwargs=kwargs, max_attempts=max_attempts)
+    transaction.on_commit(lambda: start(task.pk))
+    return task
+
+
+def start(task_id, delay=0):
+    """
+    Run the Task now, or in a worker thread after `delay` seconds, depending
+    on the SPECTATOR_TASKS_MODE setting.
+    """
+    mode = app_settings.TASKS_MODE
+
+    if mode == "sync":
+        # Retry straight away, rather than blocking for the delay:
+        while run_task(task_id) is not None:
+            pass
+    elif mode == "thread":
+        if delay:
+            timer = threading.Timer(delay, start, args=[task_id])
+            timer.daemon = True
+            timer.start()
+        else:
+            get_executor().submit(_run_in_thread, task_id)
+    elif mode != "queue":
+        msg = f"Invalid SPECTATOR_TASKS_MODE: '{mode}'"
+        raise ValueError(msg)
+
+
+def get_executor():
+    "The pool of worker threads used in 'thread' mode."
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app_settings.TASKS_WORKERS,
+                thread_name_prefix="spectator-tasks",
+            )
+    return _executor
+
+
+def _run_in_thread(task_id):
+    try:
+        delay = run_task(task_id)
+    except Exception:
+        logger.exception("Couldn't run task %s", task_id)
+        delay = None
+    finally:
+        # Each thread has its own database connections, which won't be
+        # closed at the end of a request:
+        connections.close_all()
+
+    if delay is not None:
+        start(task_id, delay=delay)
+
+
+def run_task(task_id):
+    """
+    Make one attempt at running a Task, if it's waiting to be run.
+
+    Returns the number of seconds to wait before it should be retried, or
+    None if it shouldn't be: because it succeeded, has failed too many
+    times, or was already being run elsewhere.
+    """
+    now = timezone.now()
+
+    # Claim the task, so that no other worker runs it at the same time:
+    claimed = Task.objects.filter(
+        Q(status=Task.Status.PENDING)
+        | Q(status=Task.Status.RUNNING, time_modified__lt=now - STALE_AFTER),
+        pk=task_id,
+    ).update(status=Task.Status.RUNNING, attempts=F("attempts") + 1, time_modified=now)
+    if not claimed:
+        return None
+
+    task = Task.objects.get(pk=task_id)
+
+    if task.name not in _registry:
+        task.status = Task.Status.FAILED
+        task.last_error = f"No task called '{task.name}' is registered"
+        task.save(update_fields=["status", "last_error", "time_modified"])
+        return None
+
+    func, _ = _registry[task.name]
+
+    try:
+        func(**task.kwargs)
+    except Exception:
+        logger.exception("Task %s failed on attempt %s", task, task.attempts)
+        task.last_error = traceback.format_exc()
+        delay = None
+        if task.attempts < task.max_attempts:
+            delay = RETRY_DELAY * 2 ** (task.attempts - 1)
+            task.status = Task.Status.PENDING
+            task.run_after = now + timedelta(seconds=delay)
+        else:
+            task.status = Task.Status.FAILED
+        task.save(update_fields=["status", "run_after", "last_error", "time_modified"])
+        return delay
+
+    task.delete()
+    return None
+
+
+def run_due_tasks():
+    """
+    Run every Task that's due, including abandoned ones, in the current
+    thread. Failed tasks will be retried by a later call.
+    Returns the number of tasks that were run.
+    """
+    now = timezone.now()
+    task_ids = list(
+        Task.objects.filter(
+            Q(status=Task.Status.PENDING, run_after__lte=now)
+            | Q(status=Task.Status.RUNNING, time_modified__lt=now - STALE_AFTER)
+        ).values_list("pk", flat=True)
+    )
+    for task_id in task_ids:
+        run_task(task_id)
+    return len(task_ids)
+
+
+@register("spectator.generate_thumbnails")
+def generate_thumbnails(model, pk, name):
+    """
+    Generate all the sizes of an object's newly-uploaded thumbnail, so that
+    they aren't generated while a page that shows them is being requested.
+
+    model is like "spectator_reading.publication", and name is the name of
+    the thumbnail file that was uploaded.
+    """
+    manager = apps.get_model(model)._base_manager
+    obj = manager.filter(pk=pk).first()
+
+    if obj is None or obj.thumbnail.name != name:
+        # The object's been deleted, or has had another thumbnail uploaded,
+        # which will have its own task.
+        return
+
+    files = [getattr(obj, spec_name) for spec_name in obj.thumbnail_spec_names]
+    for file in files:
+        file.generate()
+
+    if app_settings.THUMBNAIL_MANIFEST:
+        record_generated(name, [file.name for file in files])
+
+    # Not using save() so this doesn't start another task, or overwrite any
+    # changes made to the object in the meantime:
+    manager.filter(pk=pk, thumbnail=name).update(thumbnails_ready=True)
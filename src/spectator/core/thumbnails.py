@@ -0,0 +1,118 @@
+"""
+Working with the thumbnail files of models using ThumbnailModelMixin outside
+of requests, e.g. from management commands.
+
+These functions don't use the database, so they can be run in other
+threads or processes.
+"""
+
+from django.apps import apps
+from imagekit.cachefiles import ImageCacheFile
+from imagekit.registry import generator_registry
+
+from .exif import has_gps_data
+from .models import ThumbnailModelMixin
+
+
+def get_thumbnail_models():
+    "All the installed models that have thumbnails, e.g. Event and Publication."
+    return [
+        model for model in apps.get_models() if issubclass(model, ThumbnailModelMixin)
+    ]
+
+
+def generate_missing_thumbnails(model_label, pk, name, *, dry_run=False):
+    """
+    Generate any sizes of an object's thumbnail that aren't in storage yet.
+
+    Arguments:
+    model_label -- e.g. "spectator_reading.publication"
+    pk -- The object's pk.
+    name -- The name of the object's thumbnail file.
+    dry_run -- If True, only check which sizes are missing.
+
+    Returns a tuple of the number of sizes that were missing, and the
+    number of bytes written to generate them.
+    """
+    obj = apps.get_model(model_label)(pk=pk, thumbnail=name)
+
+    missing = 0
+    bytes_written = 0
+
+    for spec_name in obj.thumbnail_spec_names:
+        file = getattr(obj, spec_name)
+        if file.storage.exists(file.name):
+            continue
+        missing += 1
+        if not dry_run:
+            file.generate(force=True)
+            bytes_written += file.file.size
+
+    return missing, bytes_written
+
+
+def get_thumbnail_file_names(model_label, pk, name):
+    "The names of all the files generated from an object's thumbnail."
+    obj = apps.get_model(model_label)(pk=pk, thumbnail=name)
+    return [getattr(obj, spec_name).name for spec_name in obj.thumbnail_spec_names]
+
+
+def get_generator_file_names(model_label, pk, name):
+    """
+    The names of the files that the deprecated "spectator:*" generators in
+    spectator.core.imagegenerators make from an object's thumbnail, e.g.
+    using the {% generateimage %} template tag.
+    """
+    obj = apps.get_model(model_label)(pk=pk, thumbnail=name)
+    return [
+        ImageCacheFile(generator_registry.get(generator_id, source=obj.thumbnail)).name
+        for generator_id in generator_registry.get_ids()
+        if generator_id.startswith("spectator:")
+    ]
+
+
+def get_thumbnail_info(model_label, pk, name):
+    """
+    Read an object's stored thumbnail file to get its width, height, and
+    placeholder image, e.g. for thumbnails uploaded before those were saved.
+
+    Arguments:
+    model_label -- e.g. "spectator_reading.publication"
+    pk -- The object's pk.
+    name -- The name of the object's thumbnail file.
+
+    Returns a dict of the fields to update on the object.
+    """
+    obj = apps.get_model(model_label)(pk=pk, thumbnail=name)
+    obj.update_thumbnail_info()
+    return {
+        "thumbnail_width": obj.thumbnail_width,
+        "thumbnail_height": obj.thumbnail_height,
+        "thumbnail_placeholder": obj.thumbnail_placeholder,
+    }
+
+
+def sanitize_thumbnail(model_label, pk, name, *, dry_run=False):
+    """
+    Remove any GPS data from an object's stored thumbnail file.
+
+    Arguments:
+    model_label -- e.g. "spectator_reading.publication"
+    pk -- The object's pk.
+    name -- The name of the object's thumbnail file.
+    dry_run -- If True, only check whether it has GPS data.
+
+    Only the file's header is read, unless it has GPS data.
+
+    Returns a tuple of whether it had GPS data, and the name of the file
+    afterwards, which will only be different if the storage couldn't reuse
+    the same name.
+    """
+    obj = apps.get_model(model_label)(pk=pk, thumbnail=name)
+
+    if dry_run:
+        with obj.thumbnail.storage.open(name, mode="rb") as file:
+            return has_gps_data(file), name
+
+    changed = obj.sanitize_thumbnail_exif_data()
+    return changed, obj.thumbnail.name
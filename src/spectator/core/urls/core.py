@@ -2,11 +2,12 @@ from django.urls import path
 
 from spectator.core import views
 
-# Only the home page.
+# The home page and search.
 # This should be under the namespace 'spectator:core'.
 
 app_name = "core"
 
 urlpatterns = [
     path("", view=views.HomeView.as_view(), name="home"),
+    path("search/", view=views.SearchView.as_view(), name="search"),
 ]
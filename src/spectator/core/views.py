@@ -6,6 +6,7 @@ from django.views.generic import DetailView, ListView, TemplateView
 from .apps import spectator_apps
 from .models import Creator
 from .paginator import DiggPaginator
+from .search import search
 
 if spectator_apps.is_enabled("events"):
     from spectator.events.models import Event
@@ -105,7 +106,7 @@ class HomeView(TemplateView):
         context = {}
 
         context["in_progress_publication_list"] = (
-            Publication.in_progress_objects.select_related("series")
+            Publication.in_progress_objects.select_related("series", "current_reading")
             .prefetch_related("roles__creator")
             .all()
         )
@@ -138,3 +139,23 @@ class CreatorListView(PaginatedListView):
 
 class CreatorDetailView(DetailView):
     model = Creator
+
+
+class SearchView(PaginatedListView):
+    """
+    Search results for the `q` query string, across all kinds of objects,
+    best match first.
+    """
+
+    template_name = "spectator_core/search.html"
+    context_object_name = "result_list"
+    paginate_by = 20
+
+    def get_queryset(self):
+        self.query = self.request.GET.get("q", "").strip()
+        return search(self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.query
+        return context
@@ -1,33 +1,40 @@
 from django.contrib import admin
+from django.core.cache import cache
 from django.db.models import Count
 from django.templatetags.l10n import unlocalize
 from imagekit.admin import AdminThumbnail
 
 from spectator.core import app_settings
+from spectator.core.admin import (
+    IndexedAutocompleteAdminMixin,
+    IndexedAutocompleteFieldsMixin,
+    LargeListAdminMixin,
+)
+from spectator.core.search import get_cache_version
 
 from .models import Event, EventRole, Venue, Work, WorkRole, WorkSelection
 
 # INLINES
 
 
-class EventRoleInline(admin.TabularInline):
+class EventRoleInline(IndexedAutocompleteFieldsMixin, admin.TabularInline):
     model = EventRole
     fields = ("creator", "role_name", "role_order")
-    raw_id_fields = ("creator",)
+    autocomplete_fields = ("creator",)
     extra = 0
 
 
-class WorkRoleInline(admin.TabularInline):
+class WorkRoleInline(IndexedAutocompleteFieldsMixin, admin.TabularInline):
     model = WorkRole
     fields = ("creator", "role_name", "role_order")
-    raw_id_fields = ("creator",)
+    autocomplete_fields = ("creator",)
     extra = 0
 
 
-class WorkSelectionInline(admin.TabularInline):
+class WorkSelectionInline(IndexedAutocompleteFieldsMixin, admin.TabularInline):
     model = WorkSelection
     fields = ("work", "order")
-    raw_id_fields = ("work",)
+    autocomplete_fields = ("work",)
     extra = 0
 
 
@@ -35,8 +42,9 @@ class WorkSelectionInline(admin.TabularInline):
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(LargeListAdminMixin, IndexedAutocompleteFieldsMixin, admin.ModelAdmin):
     list_display = ("__str__", "date", "list_thumbnail", "kind_name", "venue")
+    list_select_related = ("venue",)
     list_filter = ("kind", "date")
     search_fields = ("title",)
 
@@ -64,7 +72,7 @@ class EventAdmin(admin.ModelAdmin):
         ),
     )
 
-    raw_id_fields = ("venue",)
+    autocomplete_fields = ("venue",)
     readonly_fields = (
         "title_sort",
         "slug",
@@ -83,6 +91,17 @@ class EventAdmin(admin.ModelAdmin):
         image_field="thumbnail", template="spectator_core/admin/list_thumbnail.html"
     )
 
+    def get_queryset(self, request):
+        """
+        Events without titles make them from their Works or Creators,
+        so fetch those for the whole list at once.
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .prefetch_related("work_selections__work", "roles__creator")
+        )
+
     def save_related(self, request, form, formsets, change):
         """
         When the Admin saves the Event, the related M2M things, like Movies,
@@ -98,7 +117,8 @@ class EventAdmin(admin.ModelAdmin):
 
 
 @admin.register(Work)
-class WorkAdmin(admin.ModelAdmin):
+class WorkAdmin(LargeListAdminMixin, IndexedAutocompleteAdminMixin, admin.ModelAdmin):
+    autocomplete_sort_field = "title_sort"
     list_display = ("title", "kind", "tidy_year")
     search_fields = ("title",)
     list_filter = ("kind", "year")
@@ -149,7 +169,20 @@ class CountryListFilter(admin.SimpleListFilter):
 
         One for each country that has at least one Venue.
         Sorted by the label names.
+
+        Cached until a Venue is next changed.
         """
+        key = "spectator:admin:venue_countries:{}".format(
+            get_cache_version("spectator_events.venue")
+        )
+        list_of_countries = cache.get(key)
+        if list_of_countries is None:
+            list_of_countries = self.get_countries()
+            cache.set(key, list_of_countries, None)
+        return list_of_countries
+
+    def get_countries(self):
+        "The uncached list of tuples for lookups()."
         list_of_countries = []
 
         # We don't need the country_count but we need to annotate them in order
@@ -179,7 +212,7 @@ class CountryListFilter(admin.SimpleListFilter):
 
 
 @admin.register(Venue)
-class VenueAdmin(admin.ModelAdmin):
+class VenueAdmin(LargeListAdminMixin, IndexedAutocompleteAdminMixin, admin.ModelAdmin):
     list_display = ("name", "address", "country")
     list_filter = (CountryListFilter,)
     search_fields = ("name",)
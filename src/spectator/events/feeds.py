@@ -0,0 +1,73 @@
+from django.urls import reverse
+
+from spectator.core import app_settings
+from spectator.core.feeds import AtomFeedMixin, CachedFeed
+
+from .models import Event
+
+
+class RecentEventsFeed(CachedFeed):
+    """
+    The most recent Events, of all kinds or, if there's a kind_slug, of one
+    kind, e.g. "gigs".
+    """
+
+    # Events' titles include their Works' and Creators' names. Changing
+    # those re-indexes the Events, which changes this version:
+    version_object_types = ("spectator_events.event",)
+
+    def get_object(self, request, kind_slug=None):
+        "Returns the kind of Event, e.g. 'gig', or None for all kinds."
+        if kind_slug is None:
+            return None
+        kinds = {slug: kind for kind, slug in Event.Kind.slugs().items()}
+        try:
+            return kinds[kind_slug]
+        except KeyError as e:
+            raise Event.DoesNotExist from e
+
+    def title(self, obj):
+        name = Event.get_kind_name_plural(obj) if obj else "Events"
+        return f"Recent {name}"
+
+    def description(self, obj):
+        return self.title(obj)
+
+    def link(self, obj):
+        if obj:
+            return reverse(
+                "spectator:events:event_list",
+                kwargs={"kind_slug": Event.Kind.slugs()[obj]},
+            )
+        return reverse("spectator:events:home")
+
+    def get_version_queryset(self, obj):
+        events = Event.objects.all()
+        if obj:
+            events = events.filter(kind=obj)
+        return events
+
+    def get_items(self, obj):
+        return (
+            self.get_version_queryset(obj)
+            .prefetch_related("roles__creator", "work_selections__work")
+            .order_by("-date", "-pk")
+        )
+
+    def item_title(self, item):
+        return item.make_title()
+
+    def item_description(self, item):
+        description = Event.get_kind_name(item.kind)
+        if item.date:
+            description += f" on {item.date.strftime(app_settings.DATE_FORMAT)}"
+        if item.venue_name:
+            description += f" at {item.venue_name}"
+        return description
+
+    def item_categories(self, item):
+        return (Event.get_kind_name(item.kind),)
+
+
+class RecentEventsAtomFeed(AtomFeedMixin, RecentEventsFeed):
+    pass
@@ -0,0 +1,203 @@
+"""
+Exporting Events as an iCalendar (.ics, RFC 5545) file, with one all-day
+VEVENT for each Event that has a date.
+
+The calendar is generated as an iterator of strings, which can be streamed
+to a response or written to a file, so all the Events are never held in
+memory at once. Events are fetched with their Venues in the same query, and
+their Works and Creators, for their titles, are prefetched for each chunk.
+"""
+
+import datetime
+from urllib.parse import urlsplit
+
+from django.utils import timezone
+
+from .models import Event, Venue
+
+PRODID = "-//Django Spectator//Events//EN"
+
+
+def escape_text(value):
+    "Escape a string for use in a TEXT property value."
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line):
+    """
+    Returns line ending with CRLF, split so that no line is longer than 75
+    octets, with each continuation line starting with a space.
+    """
+    lines = []
+    current = ""
+    size = 0
+    limit = 75
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            lines.append(current)
+            # The space at the start of continuation lines counts:
+            current = " "
+            size = 1
+        current += char
+        size += char_size
+    lines.append(current)
+    return "".join(f"{part}\r\n" for part in lines)
+
+
+def format_date(value):
+    return value.strftime("%Y%m%d")
+
+
+def format_datetime(value):
+    "A datetime as UTC, e.g. 20170215T193000Z."
+    return value.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def get_kind(kind):
+    """
+    Returns the Event kind, e.g. "gig", for either a kind or its slug, e.g.
+    "gigs". Raises ValueError if it's neither.
+    """
+    slugs = Event.Kind.slugs()
+    if kind in slugs:
+        return kind
+    kinds = {slug: kind for kind, slug in slugs.items()}
+    try:
+        return kinds[kind]
+    except KeyError as e:
+        msg = f"Unknown event kind: '{kind}'"
+        raise ValueError(msg) from e
+
+
+def get_filters(*, kind=None, venue=None, year=None):
+    """
+    Converts strings, e.g. from a query string or a command's options, into
+    the keyword arguments for get_events(): kind is an Event kind or its
+    slug, venue is a Venue's slug, and year is like "2017". Missing or empty
+    ones aren't included. Raises ValueError if any are invalid.
+    """
+    filters = {}
+    if kind:
+        filters["kind"] = get_kind(kind)
+    if venue:
+        try:
+            filters["venue"] = Venue.objects.get(slug=venue)
+        except Venue.DoesNotExist as e:
+            msg = f"Unknown venue: '{venue}'"
+            raise ValueError(msg) from e
+    if year:
+        if not (year.isascii() and year.isdigit() and len(year) == 4):
+            msg = f"Invalid year: '{year}'"
+            raise ValueError(msg)
+        filters["year"] = int(year)
+    return filters
+
+
+def get_events(*, kind=None, venue=None, year=None):
+    """
+    Returns a queryset of Events that have dates, in date order, optionally
+    only those of one kind (e.g. "gig"), at one Venue, or in one year.
+    Their Venues are selected, and the things used in their titles
+    prefetched.
+    """
+    events = Event.objects.filter(date__isnull=False)
+    if kind is not None:
+        events = events.filter(kind=kind)
+    if venue is not None:
+        events = events.filter(venue=venue)
+    if year is not None:
+        events = events.filter(date__year=year)
+    return (
+        events.select_related("venue")
+        .prefetch_related("roles__creator", "work_selections__work")
+        .order_by("date", "pk")
+    )
+
+
+def get_calendar_name(*, kind=None, venue=None, year=None):
+    "e.g. 'Gigs at The Venue in 2017'."
+    name = Event.get_kind_name_plural(kind) if kind else "Events"
+    if venue is not None:
+        name += f" at {venue.name}"
+    if year is not None:
+        name += f" in {year}"
+    return name
+
+
+def get_location(event):
+    "The Event's venue name, and its Venue's address and country."
+    parts = [event.venue_name or (event.venue.name if event.venue else "")]
+    if event.venue is not None:
+        parts += [event.venue.address, event.venue.country_name or ""]
+    return ", ".join(str(part) for part in parts if part)
+
+
+def make_vevent(event, *, dtstamp, base_url="", domain="spectator"):
+    """
+    Returns a list of the unfolded lines for one Event.
+    dtstamp is when the calendar was generated.
+    """
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:spectator-event-{event.pk}@{domain}",
+        f"DTSTAMP:{format_datetime(dtstamp)}",
+        f"LAST-MODIFIED:{format_datetime(event.time_modified)}",
+        f"DTSTART;VALUE=DATE:{format_date(event.date)}",
+        f"DTEND;VALUE=DATE:{format_date(event.date + datetime.timedelta(days=1))}",
+        f"SUMMARY:{escape_text(event.make_title())}",
+        f"CATEGORIES:{escape_text(Event.get_kind_name(event.kind))}",
+    ]
+    if location := get_location(event):
+        lines.append(f"LOCATION:{escape_text(location)}")
+    venue = event.venue
+    if venue is not None and venue.latitude is not None and venue.longitude is not None:
+        lines.append(f"GEO:{venue.latitude};{venue.longitude}")
+    if base_url:
+        lines.append(f"URL:{base_url}{event.get_absolute_url()}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def generate_calendar(events, *, name="Events", base_url="", chunk_size=500):
+    """
+    Yields the iCalendar file for the events queryset as strings: the
+    header, then each Event's VEVENT, then the footer.
+
+    base_url -- e.g. "https://example.com". If set, each VEVENT has the URL
+        of its Event's page, and the UIDs use its domain.
+    chunk_size -- How many Events to fetch, and prefetch for, at a time.
+    """
+    base_url = base_url.rstrip("/")
+    domain = urlsplit(base_url).hostname or "spectator"
+    # Every VEVENT's DTSTAMP is when this was generated:
+    dtstamp = timezone.now()
+
+    yield "".join(
+        fold_line(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{escape_text(name)}",
+        )
+    )
+
+    for event in events.iterator(chunk_size=chunk_size):
+        yield "".join(
+            fold_line(line)
+            for line in make_vevent(
+                event, dtstamp=dtstamp, base_url=base_url, domain=domain
+            )
+        )
+
+    yield fold_line("END:VCALENDAR")
@@ -0,0 +1,194 @@
+"""
+Importing many Events, with their Venues, Works and Creators, at once.
+See spectator.core.imports.
+
+Each row can have these keys (CSV columns, or JSON object keys):
+
+    date      Required. YYYY-MM-DD.
+    kind      Required. e.g. "gig" or "cinema".
+    title     Optional.
+    venue     Optional. The name of a Venue.
+    note      Optional.
+    works     Optional. Work titles. In JSON, each can instead be an object
+              with "title", and optional "kind" and "year".
+    work_kind Optional. The kind of the Works, if it isn't the usual kind
+              for the Event's kind, e.g. "movie" for "cinema".
+    creators  Optional. Creators' names, optionally followed by their role in
+              brackets, e.g. "Caryl Churchill (Writer)". In JSON, each can
+              instead be an object with "name", and optional "role" and "kind".
+
+In CSV, works and creators are separated by semicolons.
+"""
+
+from django.db import transaction
+
+from spectator.core.imports import (
+    CREATOR_SORT_VARIANTS,
+    ImportRowError,
+    Resolver,
+    check_database,
+    get_list,
+    get_value,
+    index_created,
+    parse_creator,
+    parse_date,
+    set_slugs,
+)
+from spectator.core.models import Creator
+
+from .models import Event, EventRole, Venue, Work, WorkSelection
+
+# The kind of Work usually seen at each kind of Event:
+WORK_KINDS = {
+    Event.Kind.CINEMA: Work.Kind.MOVIE,
+    Event.Kind.CONCERT: Work.Kind.CLASSICAL_WORK,
+    Event.Kind.DANCE: Work.Kind.DANCE_PIECE,
+    Event.Kind.MUSEUM: Work.Kind.EXHIBITION,
+    Event.Kind.THEATRE: Work.Kind.PLAY,
+}
+
+
+def parse_row(row_number, row):
+    "Returns a dict of the validated data from a row."
+    kind = get_value(row, "kind")
+    if kind not in Event.Kind.values:
+        raise ImportRowError(row_number, f"Unknown event kind: {kind!r}")
+
+    event_date, granularity = parse_date(
+        row_number, get_value(row, "date"), required=True
+    )
+    if granularity != "day":
+        raise ImportRowError(row_number, "An Event's date must be YYYY-MM-DD.")
+
+    default_work_kind = get_value(row, "work_kind") or WORK_KINDS.get(kind)
+    works = []
+    for value in get_list(row, "works"):
+        if isinstance(value, dict):
+            title = get_value(value, "title")
+            work_kind = get_value(value, "kind") or default_work_kind
+            year = value.get("year") or None
+        else:
+            title = str(value).strip()
+            work_kind = default_work_kind
+            year = None
+        if not title:
+            raise ImportRowError(row_number, "A work has no title.")
+        if work_kind not in Work.Kind.values:
+            raise ImportRowError(
+                row_number, f"Unknown or missing work kind for {title!r}"
+            )
+        works.append((title, work_kind, year))
+
+    return {
+        "kind": kind,
+        "date": event_date,
+        "title": get_value(row, "title"),
+        "venue": get_value(row, "venue"),
+        "note": get_value(row, "note"),
+        "works": works,
+        "creators": [parse_creator(row_number, c) for c in get_list(row, "creators")],
+    }
+
+
+def import_events(rows, batch_size=1000):
+    """
+    Validate all the rows, then create an Event for each one, in one
+    transaction, with any Venues, Works and Creators that don't exist yet.
+
+    rows -- A list of dicts.
+
+    Returns a dict of the number of each kind of object created, e.g.
+    {"creators": 3, "venues": 1, "works": 2, "events": 10}.
+    """
+    check_database()
+
+    parsed = [parse_row(number, row) for number, row in enumerate(rows, start=1)]
+
+    creators = Resolver(
+        Creator,
+        "name_sort",
+        ("name",),
+        batch_size=batch_size,
+        sort_variants=CREATOR_SORT_VARIANTS,
+    )
+    venues = Resolver(Venue, "name_sort", ("name",), batch_size=batch_size)
+    works = Resolver(Work, "title_sort", ("kind", "title"), batch_size=batch_size)
+
+    for data in parsed:
+        for name, _role_name, kind in data["creators"]:
+            creators.add((name,), {"name": name, "kind": kind})
+        if data["venue"]:
+            venues.add((data["venue"],), {"name": data["venue"]})
+        for title, kind, year in data["works"]:
+            works.add((kind, title), {"title": title, "kind": kind, "year": year})
+
+    with transaction.atomic():
+        for resolver in (creators, venues, works):
+            resolver.resolve()
+            set_slugs(resolver.created, batch_size)
+
+        events = []
+        for data in parsed:
+            event = Event(
+                kind=data["kind"],
+                date=data["date"],
+                title=data["title"],
+                note=data["note"],
+                venue=venues.get((data["venue"],)) if data["venue"] else None,
+            )
+            event.set_derived_fields()
+            events.append(event)
+        Event.objects.bulk_create(events, batch_size=batch_size)
+        set_slugs(events, batch_size)
+
+        selections = []
+        roles = []
+        for event, data in zip(events, parsed, strict=True):
+            for order, (title, kind, _year) in enumerate(data["works"], start=1):
+                selections.append(
+                    WorkSelection(
+                        event=event, work=works.get((kind, title)), order=order
+                    )
+                )
+            for order, (name, role_name, _kind) in enumerate(data["creators"], start=1):
+                roles.append(
+                    EventRole(
+                        event=event,
+                        creator=creators.get((name,)),
+                        role_name=role_name,
+                        role_order=order,
+                    )
+                )
+        WorkSelection.objects.bulk_create(selections, batch_size=batch_size)
+        EventRole.objects.bulk_create(roles, batch_size=batch_size)
+
+        update_title_sorts([event.pk for event in events], batch_size)
+
+        for objs in (creators.created, venues.created, works.created):
+            index_created(objs)
+        index_created(events)
+
+    return {
+        "creators": len(creators.created),
+        "venues": len(venues.created),
+        "works": len(works.created),
+        "events": len(events),
+    }
+
+
+def update_title_sorts(pks, batch_size=1000):
+    """
+    Set Events' title_sort, which can depend on their Works and Creators,
+    so can only be set after those are added. Usually the EventRole signal
+    does this by re-saving the Event.
+    """
+    field = Event._meta.get_field("title_sort")
+    for start in range(0, len(pks), batch_size):
+        events = list(
+            Event.objects.filter(pk__in=pks[start : start + batch_size])
+            .order_by()
+            .prefetch_related("roles__creator", "work_selections__work")
+        )
+        for event in events:
+            event.title_sort = field.pre_save(event, add=False)
+        Event.objects.bulk_update(events, ["title_sort"])
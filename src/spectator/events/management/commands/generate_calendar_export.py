@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from spectator.events import ics
+
+
+class Command(BaseCommand):
+    """
+    Generates an iCalendar (.ics) file of Events, optionally only those of
+    one kind, at one Venue, or in one year, suitable for importing into
+    calendar apps.
+
+    The file is written as it's generated, so the Events are never all held
+    in memory.
+    """
+
+    help = "Generates an iCalendar (.ics) file of events"
+
+    filename = "events.ics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=self.filename,
+            help=f"Path of the file to write, or - for stdout "
+            f"(default {self.filename}).",
+        )
+        parser.add_argument(
+            "--kind", help="Only include events of this kind, e.g. gig or gigs."
+        )
+        parser.add_argument(
+            "--venue", help="Only include events at the venue with this slug."
+        )
+        parser.add_argument("--year", help="Only include events in this year.")
+        parser.add_argument(
+            "--base-url",
+            default="",
+            help="e.g. https://example.com, to include links to events' pages.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="How many events to fetch at a time (default 500).",
+        )
+
+    def handle(self, *args, **options):
+        "This is called when the command is run."
+        if options["batch_size"] < 1:
+            msg = "--batch-size must be 1 or more."
+            raise CommandError(msg)
+
+        try:
+            filters = ics.get_filters(
+                kind=options["kind"], venue=options["venue"], year=options["year"]
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        events = ics.get_events(**filters)
+        count = events.count()
+        if count == 0:
+            msg = "No events were found."
+            raise CommandError(msg)
+
+        chunks = ics.generate_calendar(
+            events,
+            name=ics.get_calendar_name(**filters),
+            base_url=options["base_url"],
+            chunk_size=options["batch_size"],
+        )
+
+        output = options["output"]
+        if output == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            # Keep stdout for the calendar:
+            messages = self.stderr
+        else:
+            # The lines already end with CRLF:
+            with open(output, mode="w", newline="", encoding="utf-8") as file:
+                file.writelines(chunks)
+            messages = self.stdout
+
+        noun = "event" if count == 1 else "events"
+        messages.write(
+            self.style.SUCCESS(
+                f"Wrote {count} {noun} to {'stdout' if output == '-' else output}"
+            )
+        )
@@ -1,11 +1,10 @@
-import csv
+from django.db.models import Prefetch
 
-from django.core.management.base import BaseCommand, CommandError
+from spectator.core.management.base import CSVExportCommand
+from spectator.events.models import WorkRole, WorkSelection
 
-from spectator.events.models import Event
 
-
-class Command(BaseCommand):
+class Command(CSVExportCommand):
     """
     Generates a CSV file containing information about Works of kind
     "movie" that have been seen, suitable for importing into a
@@ -20,69 +19,65 @@ class Command(BaseCommand):
 
     filename = "watched_movies.csv"
 
-    def handle(self, *args, **options):
-        "This is called when the command is run."
-        rows = self.make_rows()
-
-        if len(rows) == 0:
-            msg = "No movies were found."
-            raise CommandError(msg)
+    fieldnames = ("imdbID", "Title", "Year", "Directors", "WatchedDate", "Rewatch")
 
-        self.write_csv_file(rows)
+    noun = "movie"
+    noun_plural = "movies"
 
-        plural = "movie" if len(rows) == 1 else "movies"
-        self.stdout.write(
-            self.style.SUCCESS(f"Wrote {len(rows)} {plural} to {self.filename}")
-        )
+    since_help = (
+        "Only include movies seen on or after this date (YYYY-MM-DD). "
+        "Earlier viewings are still used to tell which are rewatches."
+    )
 
-    def make_rows(self):
+    def make_rows(self, since=None):
         """
-        Returns a list of dicts, each one about a single viewing of
-        a movie.
-        """
-        rows = []
-        watched_work_ids = []
-
-        for event in Event.objects.filter(kind="cinema").order_by("date"):
-            for selection in event.get_movies():
-                work = selection.work
-                is_rewatch = work.id in watched_work_ids
-
-                directors = []
-                for role in work.roles.all():
-                    if role.role_name.lower() == "director":
-                        directors.append(role.creator.name)
-
-                rows.append(
-                    {
-                        "imdbID": work.imdb_id,
-                        "Title": work.title,
-                        "Year": work.year,
-                        "Directors": ", ".join(directors),
-                        "WatchedDate": event.date.strftime("%Y-%m-%d"),
-                        "Rewatch": str(is_rewatch).lower(),
-                    }
-                )
-
-                watched_work_ids.append(work.id)
-
-        return rows
+        Yields a dict about each single viewing of a movie, in the order they
+        were seen.
 
-    def write_csv_file(self, rows):
+        since -- If a date, only viewings on or after this date are included.
         """
-        Passed a list of dicts - each one being data about single
-        viewing of a movie - writes this out to a CSV file.
-        """
-        with open(self.filename, mode="w") as movies_file:
-            writer = csv.DictWriter(
-                movies_file,
-                fieldnames=rows[0].keys(),
-                delimiter=",",
-                quotechar='"',
-                quoting=csv.QUOTE_MINIMAL,
-            )
+        selections = WorkSelection.objects.filter(
+            event__kind="cinema", work__kind="movie"
+        )
 
-            writer.writeheader()
+        # The IDs of all the movies seen so far:
+        watched_work_ids = set()
+        if since is not None:
+            watched_work_ids.update(
+                selections.filter(event__date__lt=since)
+                .values_list("work_id", flat=True)
+                .distinct()
+            )
+            selections = selections.filter(event__date__gte=since)
+
+        selections = (
+            selections.select_related("event", "work")
+            .prefetch_related(
+                Prefetch(
+                    "work__roles",
+                    queryset=WorkRole.objects.filter(
+                        role_name__iexact="director"
+                    ).select_related("creator"),
+                    to_attr="director_roles",
+                )
+            )
+            .order_by("event__date", "event_id", "order")
+        )
 
-            for row in rows:
-                writer.writerow(row)
+        for selection in selections.iterator(chunk_size=500):
+            event = selection.event
+            work = selection.work
+
+            is_rewatch = work.id in watched_work_ids
+            watched_work_ids.add(work.id)
+
+            yield {
+                "imdbID": work.imdb_id,
+                "Title": work.title,
+                "Year": work.year,
+                "Directors": ", ".join(
+                    role.creator.name for role in work.director_roles
+                ),
+                "WatchedDate": event.date.strftime("%Y-%m-%d"),
+                "Rewatch": str(is_rewatch).lower(),
+            }
@@ -2,6 +2,24 @@ from django.db import models
 from django.db.models import Count
 
 
+class EventManager(models.Manager):
+    def on_this_day(self, month, day):
+        """
+        Gets Events that happened on a day of the year, in any year.
+        Most recent first.
+
+        e.g. to get all Events that happened on 25th December:
+
+            Event.objects.on_this_day(12, 25)
+
+        month - An integer, 1-12.
+        day - An integer, 1-31.
+        """
+        return (
+            self.get_queryset().filter(date_month=month, date_day=day).order_by("-date")
+        )
+
+
 class VenueManager(models.Manager):
     def by_visits(self, event_kind=None):
         """
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:21
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+
+def set_date_month_day(apps, schema_editor):
+    """
+    Set date_month and date_day for every Event already in the DB.
+    """
+    Event = apps.get_model("spectator_events", "Event")
+    Event.objects.filter(date__isnull=False).update(
+        date_month=ExtractMonth("date"), date_day=ExtractDay("date")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_core', '0004_auto_20180102_0959'),
+        ('spectator_events', '0046_alter_work_imdb_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='date_day',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Set when the event is saved.', null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='date_month',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Set when the event is saved.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date_month', 'date_day'], name='spectator_event_month_day'),
+        ),
+        migrations.RunPython(set_date_month_day, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_core', '0004_auto_20180102_0959'),
+        ('spectator_events', '0047_event_date_month_day'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='venue',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='spectator_events.venue'),
+        ),
+        migrations.AlterField(
+            model_name='eventrole',
+            name='creator',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='event_roles', to='spectator_core.creator'),
+        ),
+        migrations.AlterField(
+            model_name='workselection',
+            name='work',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='spectator_events.work'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date'], name='spectator_event_date'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['kind', 'date'], name='spectator_event_kind_date'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['venue', 'date'], name='spectator_event_venue_date'),
+        ),
+        migrations.AddIndex(
+            model_name='eventrole',
+            index=models.Index(fields=['creator', 'event'], name='spectator_eventrole_creator'),
+        ),
+        migrations.AddIndex(
+            model_name='workselection',
+            index=models.Index(fields=['work', 'event'], name='spectator_worksel_work_event'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:47
+
+from django.db import migrations, models
+
+
+def set_thumbnails_ready(apps, schema_editor):
+    """
+    Existing thumbnails' sizes are generated when they're first viewed, as
+    before, so there's no need to show placeholders for them.
+    """
+    Event = apps.get_model("spectator_events", "Event")
+    Event.objects.exclude(thumbnail="").update(thumbnails_ready=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_events', '0048_add_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='thumbnails_ready',
+            field=models.BooleanField(default=False, editable=False, help_text='Have all the sizes of the current thumbnail been generated?'),
+        ),
+        migrations.RunPython(set_thumbnails_ready, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The unmanaged reporting models. Their database views aren't created here
+# but by spectator.core.reports, after the migrate command has run, once this
+# migration has been applied.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_events', '0051_thumbnail_info'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventFact',
+            fields=[
+                ('event', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='+', serialize=False, to='spectator_events.event')),
+                ('kind', models.CharField(choices=[('cinema', 'Cinema'), ('concert', 'Concert'), ('comedy', 'Comedy'), ('dance', 'Dance'), ('museum', 'Gallery/Museum'), ('gig', 'Gig'), ('theatre', 'Theatre'), ('misc', 'Other')], max_length=20)),
+                ('date', models.DateField(null=True)),
+                ('date_month', models.PositiveSmallIntegerField(null=True)),
+                ('date_day', models.PositiveSmallIntegerField(null=True)),
+                ('title', models.CharField(max_length=255)),
+                ('title_sort', models.CharField(max_length=255)),
+                ('venue_name', models.CharField(max_length=255)),
+                ('venue_country', models.CharField(max_length=2)),
+                ('work_count', models.PositiveIntegerField()),
+                ('creator_count', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'spectator_events_eventfact',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='EventParticipation',
+            fields=[
+                ('pk', models.CompositePrimaryKey('creator_id', 'event_id', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('event_kind', models.CharField(choices=[('cinema', 'Cinema'), ('concert', 'Concert'), ('comedy', 'Comedy'), ('dance', 'Dance'), ('museum', 'Gallery/Museum'), ('gig', 'Gig'), ('theatre', 'Theatre'), ('misc', 'Other')], max_length=20)),
+                ('event_date', models.DateField(null=True)),
+                ('event_roles', models.PositiveIntegerField()),
+                ('work_roles', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'spectator_events_eventparticipation',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='VenueVisitSummary',
+            fields=[
+                ('venue', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='+', serialize=False, to='spectator_events.venue')),
+                ('name', models.CharField(max_length=255)),
+                ('country', models.CharField(max_length=2)),
+                ('event_count', models.PositiveIntegerField()),
+                ('first_date', models.DateField(null=True)),
+                ('last_date', models.DateField(null=True)),
+            ],
+            options={
+                'db_table': 'spectator_events_venuevisitsummary',
+                'managed': False,
+            },
+        ),
+    ]
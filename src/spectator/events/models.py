@@ -44,6 +44,8 @@ class EventRole(BaseRole):
         blank=False,
         on_delete=models.CASCADE,
         related_name="event_roles",
+        # Indexed by the "spectator_eventrole_creator" index instead:
+        db_index=False,
     )
 
     event = models.ForeignKey(
@@ -53,6 +55,12 @@ class EventRole(BaseRole):
     class Meta:
         verbose_name = "event role"
         ordering = ("role_order", "role_name")
+        indexes = [
+            # For getting a Creator's Events:
+            models.Index(
+                fields=["creator", "event"], name="spectator_eventrole_creator"
+            ),
+        ]
 
 
 class Event(
@@ -137,7 +145,12 @@ class Event(
     date = models.DateField(null=True, blank=False)
 
     venue = models.ForeignKey(
-        "spectator_events.Venue", null=True, blank=True, on_delete=models.CASCADE
+        "spectator_events.Venue",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        # Indexed by the "spectator_event_venue_date" index instead:
+        db_index=False,
     )
 
     venue_name = models.CharField(
@@ -181,15 +194,59 @@ class Event(
         null=False, blank=True, help_text="Set when the event is saved."
     )
 
+    # So that we can find Events on the same day in different years using
+    # an index:
+    date_month = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False, help_text="Set when the event is saved."
+    )
+    date_day = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False, help_text="Set when the event is saved."
+    )
+
+    objects = managers.EventManager()
+
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            models.Index(
+                fields=["date_month", "date_day"], name="spectator_event_month_day"
+            ),
+            # For the year archives:
+            models.Index(fields=["date"], name="spectator_event_date"),
+            # For lists of each kind of Event:
+            models.Index(fields=["kind", "date"], name="spectator_event_kind_date"),
+            # For lists of a Venue's Events:
+            models.Index(fields=["venue", "date"], name="spectator_event_venue_date"),
+        ]
 
     def __str__(self):
         return self.make_title()
 
     def save(self, *args, **kwargs):
+        self.set_derived_fields()
+
+        if (
+            update_fields := kwargs.get("update_fields")
+        ) is not None and "date" in update_fields:
+            kwargs["update_fields"] = {"date_month", "date_day"}.union(update_fields)
+
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse("spectator:events:event_detail", kwargs={"slug": self.slug})
+
+    def set_derived_fields(self):
+        """
+        Set the fields that are based on others: kind_slug, date_month,
+        date_day and venue_name. Called by save(), and before bulk_create().
+        """
         self.kind_slug = self.Kind.slugs()[self.kind]
 
+        # self.date might still be a string, e.g. "2017-02-15":
+        date = self._meta.get_field("date").to_python(self.date)
+        self.date_month = date.month if date else None
+        self.date_day = date.day if date else None
+
         if self.venue_name == "" and self.venue is not None:
             # Set the venue_name, if it's not already set and there's a Venue.
             self.venue_name = self.venue.name
@@ -197,11 +254,6 @@ class Event(
             # Looks like we've removed the Venue, so unset the venue_name.
             self.venue_name = ""
 
-        super().save(*args, **kwargs)
-
-    def get_absolute_url(self):
-        return reverse("spectator:events:event_detail", kwargs={"slug": self.slug})
-
     def make_title(self, *, html=False):
         if self.title != "":
             title = self.title
@@ -515,6 +567,8 @@ class WorkSelection(models.Model):
         blank=False,
         on_delete=models.CASCADE,
         related_name="events",
+        # Indexed by the "spectator_worksel_work_event" index instead:
+        db_index=False,
     )
 
     order = models.PositiveSmallIntegerField(
@@ -524,6 +578,10 @@ class WorkSelection(models.Model):
     class Meta:
         ordering = ("order",)
         verbose_name = "work selection"
+        indexes = [
+            # For getting a Work's Events:
+            models.Index(fields=["work", "event"], name="spectator_worksel_work_event"),
+        ]
 
     def __str__(self):
         return f"Event #{self.event.pk}: {self.work}"
@@ -886,3 +944,110 @@ class Venue(TimeStampedModelMixin, SluggedModelMixin, models.Model):
     @classmethod
     def get_country_name(cls, country_code):
         return cls.COUNTRIES.get(country_code, None)
+
+
+# Reporting models.
+#
+# These are read-only, unmanaged, models of database views whose SQL is in
+# spectator.core.reports, created after migrating. They join and count things
+# once, so that reports and dashboards don't each repeat the same queries. On
+# PostgreSQL they're materialized views, updated by the
+# spectator_refresh_reports command; elsewhere they're always up to date.
+
+
+class EventFact(models.Model):
+    "One row per Event, with its Venue's details and how many Works and Creators."
+
+    event = models.OneToOneField(
+        Event,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    kind = models.CharField(max_length=20, choices=Event.Kind.choices)
+    date = models.DateField(null=True)
+    date_month = models.PositiveSmallIntegerField(null=True)
+    date_day = models.PositiveSmallIntegerField(null=True)
+    # The Event's title, or else its Works' titles, or its Creators' names:
+    title = models.CharField(max_length=255)
+    title_sort = models.CharField(max_length=255)
+    venue = models.ForeignKey(
+        "Venue",
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    venue_name = models.CharField(max_length=255)
+    venue_country = models.CharField(max_length=2)
+    work_count = models.PositiveIntegerField()
+    creator_count = models.PositiveIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "spectator_events_eventfact"
+
+    def __str__(self):
+        return f"Event {self.event_id}"
+
+
+class EventParticipation(models.Model):
+    """
+    One row per Creator at each Event, whether they had a role at the Event
+    itself, or in one of its Works, or both.
+    """
+
+    pk = models.CompositePrimaryKey("creator_id", "event_id")
+    creator = models.ForeignKey(
+        "spectator_core.Creator",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    event = models.ForeignKey(
+        Event, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    event_kind = models.CharField(max_length=20, choices=Event.Kind.choices)
+    event_date = models.DateField(null=True)
+    venue = models.ForeignKey(
+        "Venue",
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    # How many EventRoles, and WorkRoles of the Event's Works, they had:
+    event_roles = models.PositiveIntegerField()
+    work_roles = models.PositiveIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "spectator_events_eventparticipation"
+
+    def __str__(self):
+        return f"Creator {self.creator_id} at Event {self.event_id}"
+
+
+class VenueVisitSummary(models.Model):
+    "One row per Venue that has Events: how many, and the first and last dates."
+
+    venue = models.OneToOneField(
+        Venue,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    name = models.CharField(max_length=255)
+    country = models.CharField(max_length=2)
+    event_count = models.PositiveIntegerField()
+    first_date = models.DateField(null=True)
+    last_date = models.DateField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = "spectator_events_venuevisitsummary"
+
+    def __str__(self):
+        return f"Visits to Venue {self.venue_id}"
@@ -1,6 +1,7 @@
 from django import template
 from django.db.models import Count
 from django.db.models.functions import TruncYear
+from django.utils import timezone
 from django.utils.html import format_html
 
 from spectator.core import app_settings
@@ -142,6 +143,38 @@ def day_events_card(date):
     }
 
 
+@register.simple_tag
+def on_this_day_events(date=None, num=10):
+    """
+    Returns a QuerySet of Events that happened on the same day and month as
+    `date`, in previous years. Most recent first.
+    `date` is a date object; defaults to today.
+    `num` is the maximum number returned.
+    """
+    if date is None:
+        date = timezone.localdate()
+
+    return (
+        Event.objects.on_this_day(date.month, date.day)
+        .filter(date__lt=date)
+        .select_related("venue")[:num]
+    )
+
+
+@register.inclusion_tag("spectator_events/includes/card_events.html")
+def on_this_day_events_card(date=None, num=10):
+    """
+    Displays Events that happened on the same day and month as `date`, in
+    previous years.
+    `date` is a date object; defaults to today.
+    `num` is the maximum number returned.
+    """
+    return {
+        "card_title": "On this day",
+        "event_list": on_this_day_events(date=date, num=num),
+    }
+
+
 @register.simple_tag
 def events_years():
     """
@@ -1,6 +1,6 @@
 from django.urls import path, re_path
 
-from . import views
+from . import feeds, views
 from .models import Event, Work
 
 app_name = "events"
@@ -13,11 +13,24 @@ work_kind_slugs = "|".join(Work.get_valid_kind_slugs())
 
 urlpatterns = [
     path("", view=views.EventListView.as_view(), name="home"),
+    path("feed/", view=feeds.RecentEventsFeed(), name="feed"),
+    path("feed/atom/", view=feeds.RecentEventsAtomFeed(), name="feed_atom"),
+    path("calendar.ics", view=views.EventCalendarView.as_view(), name="calendar"),
     re_path(
         rf"^types/(?P<kind_slug>{event_kind_slugs})/$",
         view=views.EventListView.as_view(),
         name="event_list",
     ),
+    re_path(
+        rf"^types/(?P<kind_slug>{event_kind_slugs})/feed/$",
+        view=feeds.RecentEventsFeed(),
+        name="event_list_feed",
+    ),
+    re_path(
+        rf"^types/(?P<kind_slug>{event_kind_slugs})/feed/atom/$",
+        view=feeds.RecentEventsAtomFeed(),
+        name="event_list_feed_atom",
+    ),
     path(
         "venues/",
         view=views.VenueListView.as_view(),
@@ -1,13 +1,14 @@
 from django.db.models import Min
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from django.utils.encoding import force_str
 from django.utils.translation import gettext as _
-from django.views.generic import DetailView, YearArchiveView
+from django.views.generic import DetailView, View, YearArchiveView
 from django.views.generic.detail import SingleObjectMixin
 
 from spectator.core import app_settings
 from spectator.core.views import PaginatedListView
 
+from . import ics
 from .models import Event, Venue, Work
 
 
@@ -277,3 +278,36 @@ class VenueDetailView(SingleObjectMixin, PaginatedListView):
 
     def get_queryset(self):
         return self.object.event_set.order_by("-date")
+
+
+class EventCalendarView(View):
+    """
+    An iCalendar file of all the Events that have dates, streamed as it's
+    generated. Use the `kind` (e.g. 'gigs'), `venue` (a Venue's slug) and
+    `year` GET parameters to only include some of them.
+    """
+
+    # How many Events to fetch from the database at a time:
+    chunk_size = 500
+
+    def get(self, request, *args, **kwargs):
+        try:
+            filters = ics.get_filters(
+                kind=request.GET.get("kind"),
+                venue=request.GET.get("venue"),
+                year=request.GET.get("year"),
+            )
+        except ValueError as e:
+            raise Http404(str(e)) from e
+
+        response = StreamingHttpResponse(
+            ics.generate_calendar(
+                ics.get_events(**filters),
+                name=ics.get_calendar_name(**filters),
+                base_url=request.build_absolute_uri("/"),
+                chunk_size=self.chunk_size,
+            ),
+            content_type="text/calendar; charset=utf-8",
+        )
+        response["Content-Disposition"] = 'inline; filename="events.ics"'
+        return response
@@ -1,10 +1,16 @@
 from django.contrib import admin
 from imagekit.admin import AdminThumbnail
 
+from spectator.core.admin import (
+    IndexedAutocompleteAdminMixin,
+    IndexedAutocompleteFieldsMixin,
+    LargeListAdminMixin,
+)
+
 from .models import Publication, PublicationRole, PublicationSeries, Reading
 
 
-class ReadingInline(admin.TabularInline):
+class ReadingInline(IndexedAutocompleteFieldsMixin, admin.TabularInline):
     model = Reading
     fields = (
         "publication",
@@ -14,19 +20,19 @@ class ReadingInline(admin.TabularInline):
         "start_granularity",
         "end_granularity",
     )
-    raw_id_fields = ("publication",)
+    autocomplete_fields = ("publication",)
     extra = 1
 
 
-class PublicationRoleInline(admin.TabularInline):
+class PublicationRoleInline(IndexedAutocompleteFieldsMixin, admin.TabularInline):
     model = PublicationRole
     fields = ("creator", "role_name", "role_order")
-    raw_id_fields = ("creator",)
+    autocomplete_fields = ("creator",)
     extra = 1
 
 
 @admin.register(PublicationSeries)
-class PublicationSeriesAdmin(admin.ModelAdmin):
+class PublicationSeriesAdmin(LargeListAdminMixin, admin.ModelAdmin):
     list_display = ("title",)
 
     fieldsets = (
@@ -49,20 +55,28 @@ class ReadingsListFilter(admin.SimpleListFilter):
     parameter_name = "readings"
 
     def lookups(self, request, model_admin):
-        return (("in-progress", ("In progress")), ("unread", ("Unread")))
+        return (
+            ("in-progress", ("In progress")),
+            ("unread", ("Unread")),
+            ("read", ("Read")),
+        )
 
     def queryset(self, request, queryset):
         if self.value() == "in-progress":
-            return queryset.filter(
-                reading__start_date__isnull=False, reading__end_date__isnull=True
-            )
+            return queryset.filter(reading_state=Publication.ReadingState.IN_PROGRESS)
 
         if self.value() == "unread":
-            return queryset.filter(reading__isnull=True)
+            return queryset.filter(reading_state=Publication.ReadingState.UNREAD)
+
+        if self.value() == "read":
+            return queryset.filter(reading_state=Publication.ReadingState.READ)
 
 
 @admin.register(Publication)
-class PublicationAdmin(admin.ModelAdmin):
+class PublicationAdmin(
+    LargeListAdminMixin, IndexedAutocompleteAdminMixin, admin.ModelAdmin
+):
+    autocomplete_sort_field = "title_sort"
     list_display = ("title", "list_thumbnail", "kind", "show_creators", "series")
     list_filter = (ReadingsListFilter, "kind", "is_removed", "series")
     search_fields = ("title",)
@@ -85,6 +99,7 @@ class PublicationAdmin(admin.ModelAdmin):
                     "official_url",
                     "notes_url",
                     "is_removed",
+                    "reading_state",
                 )
             },
         ),
@@ -105,10 +120,15 @@ class PublicationAdmin(admin.ModelAdmin):
         "time_created",
         "time_modified",
         "date_removed",
+        "reading_state",
     )
 
     inlines = [PublicationRoleInline, ReadingInline]
 
+    def get_queryset(self, request):
+        "So that show_creators() doesn't need a query for each Publication."
+        return super().get_queryset(request).prefetch_related("roles__creator")
+
     @admin.display(description="Creators")
     def show_creators(self, instance):
         names = [str(r.creator) for r in instance.roles.all()]
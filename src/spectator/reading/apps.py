@@ -8,3 +8,6 @@ class SpectatorReadingAppConfig(AppConfig):
 
     # Maintain pre Django 3.2 default behaviour:
     default_auto_field = "django.db.models.AutoField"
+
+    def ready(self):
+        import spectator.reading.signals  # noqa: F401
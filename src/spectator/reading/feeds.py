@@ -0,0 +1,72 @@
+from django.urls import reverse
+from django.utils.html import strip_tags
+
+from spectator.core.feeds import AtomFeedMixin, CachedFeed
+
+from .models import Reading
+from .templatetags.spectator_reading import reading_dates
+
+
+class FinishedReadingsFeed(CachedFeed):
+    "The most recently finished Readings of visible Publications."
+
+    title = "Recently finished reading"
+    description = title
+
+    # The items include Publications', series' and Creators' names:
+    version_object_types = (
+        "spectator_core.creator",
+        "spectator_reading.publication",
+        "spectator_reading.publicationseries",
+    )
+
+    def link(self):
+        return reverse("spectator:reading:home")
+
+    def get_version_queryset(self, obj):
+        return Reading.objects_desc.filter(
+            is_finished=True,
+            end_date__isnull=False,
+            publication__is_removed=False,
+        )
+
+    def get_items(self, obj):
+        return (
+            self.get_version_queryset(obj)
+            .select_related("publication__series")
+            .prefetch_related("publication__roles__creator")
+        )
+
+    def item_title(self, item):
+        publication = item.publication
+        title = publication.title
+        if publication.series:
+            title += f" ({publication.series.title})"
+        names = [role.creator.name for role in publication.roles.all()]
+        if names:
+            title += f" by {', '.join(names)}"
+        return title
+
+    def item_description(self, item):
+        # e.g. "Read 1–6 February 2017":
+        return f"Read {strip_tags(reading_dates(item))}"
+
+    def item_link(self, item):
+        return item.publication.get_absolute_url()
+
+    def item_guid(self, item):
+        # A Publication can be read more than once:
+        return f"{item.publication.get_absolute_url()}#reading-{item.pk}"
+
+    item_guid_is_permalink = False
+
+    def item_pubdate(self, item):
+        # A Reading is usually last changed when it's finished:
+        return item.time_modified
+
+    def item_categories(self, item):
+        return (item.publication.get_kind_display(),)
+
+
+class FinishedReadingsAtomFeed(AtomFeedMixin, FinishedReadingsFeed):
+    pass
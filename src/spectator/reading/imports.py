@@ -0,0 +1,207 @@
+"""
+Importing many Readings, with their Publications, PublicationSeries and
+Creators, at once. See spectator.core.imports.
+
+Each row can have these keys (CSV columns, or JSON object keys):
+
+    title       Required. The Publication's title.
+    kind        Optional. "book" (the default) or "periodical".
+    series      Optional. The title of a PublicationSeries.
+    isbn_uk     Optional.
+    isbn_us     Optional.
+    authors     Optional. Creators' names, optionally followed by their role in
+                brackets, e.g. "Jan Morris (Editor)". In JSON, each can instead
+                be an object with "name", and optional "role" and "kind".
+    start_date  Optional. YYYY-MM-DD, YYYY-MM or YYYY.
+    end_date    Optional. YYYY-MM-DD, YYYY-MM or YYYY.
+    is_finished Optional. "true" or "false". Defaults to true if there's an
+                end_date.
+
+In CSV, authors are separated by semicolons.
+
+A Publication with the same title and series as an existing one is used
+instead of creating a new one, and its authors aren't changed.
+"""
+
+from django.db import transaction
+
+from spectator.core.imports import (
+    CREATOR_SORT_VARIANTS,
+    ImportRowError,
+    Resolver,
+    check_database,
+    get_list,
+    get_value,
+    index_created,
+    parse_creator,
+    parse_date,
+    set_slugs,
+)
+from spectator.core.models import Creator
+
+from .models import Publication, PublicationRole, PublicationSeries, Reading
+
+GRANULARITIES = {
+    "day": Reading.DateGranularity.DAY,
+    "month": Reading.DateGranularity.MONTH,
+    "year": Reading.DateGranularity.YEAR,
+}
+
+BOOLEANS = {
+    "true": True,
+    "yes": True,
+    "1": True,
+    "false": False,
+    "no": False,
+    "0": False,
+}
+
+
+def parse_row(row_number, row):
+    "Returns a dict of the validated data from a row."
+    title = get_value(row, "title")
+    if not title:
+        raise ImportRowError(row_number, "A title is required.")
+
+    kind = get_value(row, "kind") or Publication.Kind.BOOK
+    if kind not in Publication.Kind.values:
+        raise ImportRowError(row_number, f"Unknown publication kind: {kind!r}")
+
+    start_date, start_granularity = parse_date(row_number, get_value(row, "start_date"))
+    end_date, end_granularity = parse_date(row_number, get_value(row, "end_date"))
+    if start_date and end_date and start_date > end_date:
+        raise ImportRowError(row_number, "The end date is before the start date.")
+
+    is_finished = get_value(row, "is_finished").lower()
+    if is_finished == "":
+        is_finished = end_date is not None
+    elif is_finished in BOOLEANS:
+        is_finished = BOOLEANS[is_finished]
+    else:
+        raise ImportRowError(row_number, f"Invalid is_finished: {is_finished!r}")
+
+    return {
+        "title": title,
+        "kind": kind,
+        "series": get_value(row, "series"),
+        "isbn_uk": get_value(row, "isbn_uk"),
+        "isbn_us": get_value(row, "isbn_us"),
+        "authors": [parse_creator(row_number, c) for c in get_list(row, "authors")],
+        "start_date": start_date,
+        "start_granularity": GRANULARITIES.get(
+            start_granularity, Reading.DateGranularity.DAY
+        ),
+        "end_date": end_date,
+        "end_granularity": GRANULARITIES.get(
+            end_granularity, Reading.DateGranularity.DAY
+        ),
+        "is_finished": is_finished,
+    }
+
+
+def import_readings(rows, batch_size=1000):
+    """
+    Validate all the rows, then create a Reading for each one, in one
+    transaction, with any Publications, PublicationSeries and Creators that
+    don't exist yet. Then update the Publications' reading states.
+
+    rows -- A list of dicts.
+
+    Returns a dict of the number of each kind of object created, e.g.
+    {"creators": 3, "series": 1, "publications": 2, "readings": 10}.
+    """
+    check_database()
+
+    parsed = [parse_row(number, row) for number, row in enumerate(rows, start=1)]
+
+    creators = Resolver(
+        Creator,
+        "name_sort",
+        ("name",),
+        batch_size=batch_size,
+        sort_variants=CREATOR_SORT_VARIANTS,
+    )
+    series = Resolver(
+        PublicationSeries, "title_sort", ("title",), batch_size=batch_size
+    )
+    publications = Resolver(
+        Publication, "title_sort", ("title", "series_id"), batch_size=batch_size
+    )
+
+    for data in parsed:
+        for name, _role_name, kind in data["authors"]:
+            creators.add((name,), {"name": name, "kind": kind})
+        if data["series"]:
+            series.add((data["series"],), {"title": data["series"]})
+
+    with transaction.atomic():
+        for resolver in (creators, series):
+            resolver.resolve()
+            set_slugs(resolver.created, batch_size)
+
+        # Publications are identified by their title and series:
+        keys = []
+        for data in parsed:
+            pub_series = series.get((data["series"],)) if data["series"] else None
+            key = (data["title"], pub_series.pk if pub_series else None)
+            publications.add(
+                key,
+                {
+                    "title": data["title"],
+                    "kind": data["kind"],
+                    "series": pub_series,
+                    "isbn_uk": data["isbn_uk"],
+                    "isbn_us": data["isbn_us"],
+                },
+            )
+            keys.append(key)
+        publications.resolve()
+        set_slugs(publications.created, batch_size)
+
+        # Only add authors to new Publications, from their first row:
+        created_pks = {pub.pk for pub in publications.created}
+        roles = []
+        for key, data in zip(keys, parsed, strict=True):
+            publication = publications.get(key)
+            if publication.pk not in created_pks:
+                continue
+            created_pks.discard(publication.pk)
+            for order, (name, role_name, _kind) in enumerate(data["authors"], start=1):
+                roles.append(
+                    PublicationRole(
+                        publication=publication,
+                        creator=creators.get((name,)),
+                        role_name=role_name,
+                        role_order=order,
+                    )
+                )
+        PublicationRole.objects.bulk_create(roles, batch_size=batch_size)
+
+        readings = []
+        for key, data in zip(keys, parsed, strict=True):
+            reading = Reading(
+                publication=publications.get(key),
+                start_date=data["start_date"],
+                start_granularity=data["start_granularity"],
+                end_date=data["end_date"],
+                end_granularity=data["end_granularity"],
+                is_finished=data["is_finished"],
+            )
+            reading.set_derived_fields()
+            readings.append(reading)
+        Reading.objects.bulk_create(readings, batch_size=batch_size)
+
+        # Usually done by a signal when each Reading is saved:
+        Publication.update_reading_states(
+            {reading.publication_id for reading in readings}, batch_size
+        )
+
+        for objs in (creators.created, series.created, publications.created):
+            index_created(objs)
+
+    return {
+        "creators": len(creators.created),
+        "series": len(series.created),
+        "publications": len(publications.created),
+        "readings": len(readings),
+    }
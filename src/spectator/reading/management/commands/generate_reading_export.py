@@ -0,0 +1,149 @@
+import re
+
+from django.db.models import Prefetch, Q
+
+from spectator.core.management.base import CSVExportCommand
+from spectator.reading.models import PublicationRole, Reading
+
+# Characters that can be in an ISBN, once hyphens and spaces are removed:
+ISBN_NON_DIGITS = re.compile(r"[^0-9Xx]")
+
+
+def format_date(value, granularity):
+    """
+    Returns a date in the YYYY/MM/DD format Goodreads uses, or "" if there's
+    no date.
+
+    If we only know the month or year, the first day of that is used, rather
+    than whatever day happens to be stored.
+    """
+    if value is None:
+        return ""
+    if granularity == Reading.DateGranularity.MONTH:
+        value = value.replace(day=1)
+    elif granularity == Reading.DateGranularity.YEAR:
+        value = value.replace(month=1, day=1)
+    return value.strftime("%Y/%m/%d")
+
+
+def get_isbns(publication):
+    """
+    Returns a tuple of a Publication's 10 digit ISBN and its 13 digit ISBN.
+    Either might be "". The US one is preferred if both are the same length.
+    """
+    isbn10 = isbn13 = ""
+    for isbn in (publication.isbn_us, publication.isbn_uk):
+        isbn = ISBN_NON_DIGITS.sub("", isbn).upper()
+        if len(isbn) == 10 and not isbn10:
+            isbn10 = isbn
+        elif len(isbn) == 13 and not isbn13:
+            isbn13 = isbn
+    return isbn10, isbn13
+
+
+class Command(CSVExportCommand):
+    """
+    Generates a CSV file containing a row for each Reading, in the format
+    of Goodreads' exports, suitable for importing into a Goodreads.com or
+    TheStoryGraph.com account.
+
+    Import docs: https://www.goodreads.com/review/import
+    and https://app.thestorygraph.com/import-goodreads
+
+    Readings are fetched in chunks, with their Publications, series and
+    creators, so memory use doesn't grow with the number of Readings.
+    """
+
+    help = (
+        "Generates a CSV file of Readings suitable for import into Goodreads.com "
+        "or TheStoryGraph.com"
+    )
+
+    filename = "reading_history.csv"
+
+    fieldnames = (
+        "Title",
+        "Author",
+        "Additional Authors",
+        "ISBN",
+        "ISBN13",
+        "Date Read",
+        "Date Added",
+        "Bookshelves",
+        "Exclusive Shelf",
+    )
+
+    noun = "reading"
+    noun_plural = "readings"
+
+    since_help = (
+        "Only include readings that ended on or after this date (YYYY-MM-DD), "
+        "and those still in progress."
+    )
+
+    def make_rows(self, since=None):
+        """
+        Yields a dict about each Reading, in order of when they ended, with
+        those still in progress last.
+
+        since -- If a date, only Readings that ended on or after this date,
+        or that haven't ended, are included.
+        """
+        readings = Reading.objects.select_related(
+            "publication__series"
+        ).prefetch_related(
+            Prefetch(
+                "publication__roles",
+                queryset=PublicationRole.objects.select_related("creator"),
+            )
+        )
+
+        if since is not None:
+            readings = readings.filter(
+                Q(end_date__gte=since) | Q(end_date__isnull=True)
+            )
+
+        # Reading.objects orders by end_date; this makes it repeatable:
+        readings = readings.order_by(*readings.query.order_by, "pk")
+
+        for reading in readings.iterator(chunk_size=2000):
+            yield self.make_row(reading)
+
+    def make_row(self, reading):
+        "Returns the dict of data about a single Reading."
+        publication = reading.publication
+
+        title = publication.title
+        if publication.series:
+            # Goodreads puts series like this, e.g. "Leviathan Wakes (The Expanse)":
+            title = f"{title} ({publication.series.title})"
+
+        roles = list(publication.roles.all())
+        # Roles with no name are assumed to be authors.
+        # If there are none, use everyone, e.g. the editor of a collection.
+        authors = [
+            role.creator.name
+            for role in roles
+            if role.role_name == "" or role.role_name.lower() == "author"
+        ] or [role.creator.name for role in roles]
+
+        isbn10, isbn13 = get_isbns(publication)
+
+        if reading.end_date is None:
+            shelf = "currently-reading"
+            shelves = ""
+        else:
+            shelf = "read"
+            shelves = "" if reading.is_finished else "did-not-finish"
+
+        return {
+            "Title": title,
+            "Author": authors[0] if authors else "",
+            "Additional Authors": ", ".join(authors[1:]),
+            "ISBN": isbn10,
+            "ISBN13": isbn13,
+            "Date Read": format_date(reading.end_date, reading.end_granularity),
+            "Date Added": format_date(reading.start_date, reading.start_granularity),
+            "Bookshelves": shelves,
+            "Exclusive Shelf": shelf,
+        }
@@ -1,8 +1,20 @@
+import heapq
 from collections import defaultdict
 from datetime import date
 
 from django.db import models
-from django.db.models import Case, Min, When
+from django.db.models import (
+    BooleanField,
+    Case,
+    Exists,
+    ExpressionWrapper,
+    F,
+    Min,
+    OuterRef,
+    Q,
+    When,
+    prefetch_related_objects,
+)
 from django.db.models.functions import TruncDate
 
 
@@ -14,18 +26,14 @@ class InProgressPublicationsManager(models.Manager):
     """
 
     def get_queryset(self):
-        from .models import Publication  # noqa: F401
-
         return (
             super()
             .get_queryset()
             .filter(
                 is_removed=False,
-                reading__start_date__isnull=False,
-                reading__end_date__isnull=True,
+                reading_state=self.model.ReadingState.IN_PROGRESS,
             )
-            .annotate(min_start_date=Min("reading__start_date"))
-            .order_by("min_start_date")
+            .order_by("current_reading__start_date")
         )
 
 
@@ -37,7 +45,9 @@ class UnreadPublicationsManager(models.Manager):
     def get_queryset(self):
         "All Publications that count as 'unread' right now"
         return (
-            super().get_queryset().filter(is_removed=False).filter(reading__isnull=True)
+            super()
+            .get_queryset()
+            .filter(is_removed=False, reading_state=self.model.ReadingState.UNREAD)
         )
 
     def get_counts_for_dates(self, dates):
@@ -170,28 +180,170 @@ class VisiblePublicationsManager(models.Manager):
         qs = super().get_queryset()
         return qs.filter(is_removed=False)
 
+    def being_read_on(self, date):
+        """
+        Returns a QuerySet of Publications that were being read on `date`.
+
+        A Publication was being read if any of its Readings started on or
+        before the date, and ended on or after it, or hasn't ended.
+
+        `date` is a date object.
+        """
+        from .models import Reading
+
+        readings = Reading.objects.filter(
+            Q(end_date__gte=date) | Q(end_date__isnull=True),
+            publication=OuterRef("pk"),
+            start_date__lte=date,
+        )
+
+        return self.get_queryset().filter(Exists(readings))
+
+    def being_read_on_dates(self, dates):
+        """
+        Get the Publications that were being read on each of a list of dates.
+        Useful for things like calendars, where using being_read_on() for
+        every day would be one query per day.
+
+        e.g.
+            from datetime import date
+
+            dates = [date(2026, 6, 1), date(2026, 6, 2), date(2026, 6, 3)]
+
+            pubs = Publication.visible_objects.being_read_on_dates(dates)
+
+        Returns a dict like:
+
+            {
+                date(2026, 6, 1): [<Publication>, <Publication>],
+                date(2026, 6, 2): [<Publication>],
+                date(2026, 6, 3): [],
+            }
+
+        Each list of Publications is in the default (title_sort) order.
+        Each Publication has its series and roles__creator already fetched.
+
+        Args:
+        - dates - a list of date objects.
+        """
+        from .models import Reading
+
+        if isinstance(dates, list) is False:
+            msg = "The dates argument should be a list"
+            raise TypeError(msg)
+
+        if len(dates) == 0:
+            return {}
+
+        if isinstance(dates[0], date) is False:
+            msg = f"""The dates argument should be a list of date
+                objects; the first item is of type {type(dates[0])}"""
+            raise TypeError(msg)
+
+        # One query for every Reading that overlaps any of the dates:
+        readings = (
+            Reading.objects.filter(
+                Q(end_date__gte=min(dates)) | Q(end_date__isnull=True),
+                start_date__lte=max(dates),
+                publication__is_removed=False,
+            )
+            .select_related("publication__series")
+            .order_by("start_date")
+        )
+        readings = list(readings)
+
+        publications = {r.publication_id: r.publication for r in readings}
+        prefetch_related_objects(list(publications.values()), "roles__creator")
+
+        # Now sweep through the dates in order. Readings are added to a heap,
+        # keyed on their end_date, once they've started, and removed from it
+        # once they've ended, so the heap only ever contains the Readings
+        # that were in progress on the current date.
+        results = {}
+        in_progress = []
+        reading_index = 0
+
+        for target_date in sorted(dates):
+            while (
+                reading_index < len(readings)
+                and readings[reading_index].start_date <= target_date
+            ):
+                reading = readings[reading_index]
+                end_date = reading.end_date or date.max
+                heapq.heappush(in_progress, (end_date, reading_index, reading))
+                reading_index += 1
+
+            while in_progress and in_progress[0][0] < target_date:
+                heapq.heappop(in_progress)
+
+            publication_ids = {r.publication_id for _, _, r in in_progress}
+
+            results[target_date] = sorted(
+                (publications[pk] for pk in publication_ids),
+                key=lambda p: (p.title_sort, p.pk),
+            )
 
-class EndDateAscendingReadingsManager(models.Manager):
+        return results
+
+
+def end_date_is_null():
     """
-    Returns Readings in descending end_date order, with Readings that have
-    no end_date first.
-    Via http://stackoverflow.com/a/15125261/250962
+    An expression that's True for Readings with no end_date.
+    Used for ordering Readings, and for indexing them in that order.
     """
+    return ExpressionWrapper(Q(end_date__isnull=True), output_field=BooleanField())
 
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.extra(select={"end_date_null": "end_date is null"})
-        return qs.extra(order_by=["end_date_null", "end_date"])
 
+class ReadingsManager(models.Manager):
+    def on_this_day(self, month, day):
+        """
+        Gets Readings that ended on a day of the year, in any year.
+        Most recent first.
+
+        Only includes Readings whose end_granularity is a day; we don't know
+        which day the others ended on.
+
+        e.g. to get all Readings that ended on 25th December:
 
-class EndDateDescendingReadingsManager(models.Manager):
+            Reading.objects.on_this_day(12, 25)
+
+        month - An integer, 1-12.
+        day - An integer, 1-31.
+        """
+        return (
+            self.get_queryset()
+            .filter(
+                end_date_month=month,
+                end_date_day=day,
+                end_granularity=self.model.DateGranularity.DAY,
+            )
+            .order_by("-end_date")
+        )
+
+
+class EndDateAscendingReadingsManager(ReadingsManager):
     """
     Returns Readings in ascending end_date order, with Readings that have
     no end_date last.
-    Via http://stackoverflow.com/a/15125261/250962
+
+    Orders by the same expressions as the Reading model's
+    "spectator_reading_end_date" index, so that the index can be used.
+    """
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        return qs.order_by(end_date_is_null(), "end_date")
+
+
+class EndDateDescendingReadingsManager(ReadingsManager):
+    """
+    Returns Readings in descending end_date order, with Readings that have
+    no end_date first.
+
+    Orders by the same expressions as the Reading model's
+    "spectator_reading_end_date" index, so that the index can be used.
     """
 
     def get_queryset(self):
         qs = super().get_queryset()
-        qs = qs.extra(select={"end_date_null": "end_date is null"})
-        return qs.extra(order_by=["-end_date_null", "-end_date"])
+        return qs.order_by(end_date_is_null().desc(), F("end_date").desc())
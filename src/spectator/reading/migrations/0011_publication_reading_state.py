@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_core', '0004_auto_20180102_0959'),
+        ('spectator_reading', '0010_remove_publication_removed_from_unread_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='current_reading',
+            field=models.ForeignKey(blank=True, editable=False, help_text="The earliest-started Reading that hasn't yet ended, if any.", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='spectator_reading.reading'),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='reading_state',
+            field=models.CharField(choices=[('unread', 'Unread'), ('in_progress', 'In progress'), ('read', 'Read')], default='unread', editable=False, help_text="Set automatically when the Publication's Readings change.", max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['reading_state', 'is_removed'], name='spectator_pub_reading_state'),
+        ),
+    ]
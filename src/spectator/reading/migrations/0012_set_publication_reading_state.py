@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:20
+
+from django.db import migrations
+
+
+def set_reading_state(apps, schema_editor):
+    """
+    Set reading_state and current_reading for each Publication already in
+    the DB. A copy of spectator.reading.models.Publication.update_reading_state()
+    """
+    Publication = apps.get_model("spectator_reading", "Publication")
+    Reading = apps.get_model("spectator_reading", "Reading")
+
+    # Publications with at least one Reading are 'read' unless they're in
+    # progress:
+    Publication.objects.filter(reading__isnull=False).update(reading_state="read")
+
+    in_progress = Reading.objects.filter(
+        start_date__isnull=False, end_date__isnull=True
+    ).order_by("publication_id", "-start_date", "-pk")
+
+    # Ordered so that the earliest-started Reading per Publication is last,
+    # and so is the one that remains in the dict:
+    current_readings = {r.publication_id: r.pk for r in in_progress}
+
+    for publication_id, reading_id in current_readings.items():
+        Publication.objects.filter(pk=publication_id).update(
+            reading_state="in_progress", current_reading_id=reading_id
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("spectator_reading", "0011_publication_reading_state"),
+    ]
+
+    operations = [
+        migrations.RunPython(set_reading_state, migrations.RunPython.noop),
+    ]
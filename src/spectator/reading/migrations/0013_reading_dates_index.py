@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_reading', '0012_set_publication_reading_state'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['start_date', 'end_date'], name='spectator_reading_dates'),
+        ),
+    ]
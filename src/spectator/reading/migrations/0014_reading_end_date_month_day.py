@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:21
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+
+def set_end_date_month_day(apps, schema_editor):
+    """
+    Set end_date_month and end_date_day for every Reading already in the DB.
+    """
+    Reading = apps.get_model("spectator_reading", "Reading")
+    Reading.objects.filter(end_date__isnull=False).update(
+        end_date_month=ExtractMonth("end_date"), end_date_day=ExtractDay("end_date")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_reading', '0013_reading_dates_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reading',
+            name='end_date_day',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Set when the reading is saved.', null=True),
+        ),
+        migrations.AddField(
+            model_name='reading',
+            name='end_date_month',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Set when the reading is saved.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['end_date_month', 'end_date_day'], name='spectator_reading_month_day'),
+        ),
+        migrations.RunPython(set_end_date_month_day, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_core', '0004_auto_20180102_0959'),
+        ('spectator_reading', '0014_reading_end_date_month_day'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(condition=models.Q(('is_removed', False)), fields=['kind', 'title_sort'], name='spectator_pub_kind_title'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(condition=models.Q(('is_removed', False)), fields=['series', 'title_sort'], name='spectator_pub_series_title'),
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['end_date'], name='spectator_reading_end'),
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(models.ExpressionWrapper(models.Q(('end_date__isnull', True)), output_field=models.BooleanField()), models.F('end_date'), name='spectator_reading_end_date'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:54
+
+import spectator.core.fields
+import spectator.core.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_reading', '0016_thumbnails_ready'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='publication',
+            name='thumbnail',
+            field=spectator.core.fields.ThumbnailField(blank=True, default='', upload_to=spectator.core.models.thumbnail_upload_path),
+        ),
+    ]
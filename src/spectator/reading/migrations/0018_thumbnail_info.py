@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_reading', '0017_thumbnail_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='thumbnail_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Height of the original thumbnail image, in pixels.', null=True),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='thumbnail_placeholder',
+            field=models.TextField(blank=True, default='', editable=False, help_text='A tiny version of the thumbnail, as a data URI.'),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='thumbnail_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Width of the original thumbnail image, in pixels.', null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The unmanaged reporting models. Their database views aren't created here
+# but by spectator.core.reports, after the migrate command has run, once this
+# migration has been applied.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spectator_reading', '0018_thumbnail_info'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingFact',
+            fields=[
+                ('reading', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='+', serialize=False, to='spectator_reading.reading')),
+                ('publication_title', models.CharField(max_length=255)),
+                ('publication_kind', models.CharField(choices=[('book', 'Book'), ('periodical', 'Periodical')], max_length=20)),
+                ('is_removed', models.BooleanField()),
+                ('series_title', models.CharField(max_length=255)),
+                ('start_date', models.DateField(null=True)),
+                ('start_granularity', models.PositiveSmallIntegerField(choices=[(3, 'Y-m-d'), (4, 'Y-m'), (6, 'Y')])),
+                ('end_date', models.DateField(null=True)),
+                ('end_granularity', models.PositiveSmallIntegerField(choices=[(3, 'Y-m-d'), (4, 'Y-m'), (6, 'Y')])),
+                ('end_date_month', models.PositiveSmallIntegerField(null=True)),
+                ('end_date_day', models.PositiveSmallIntegerField(null=True)),
+                ('is_finished', models.BooleanField()),
+                ('creator_count', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'spectator_reading_readingfact',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ReadingParticipation',
+            fields=[
+                ('pk', models.CompositePrimaryKey('creator_id', 'reading_id', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('publication_kind', models.CharField(choices=[('book', 'Book'), ('periodical', 'Periodical')], max_length=20)),
+                ('start_date', models.DateField(null=True)),
+                ('end_date', models.DateField(null=True)),
+                ('is_finished', models.BooleanField()),
+                ('roles', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'spectator_reading_readingparticipation',
+                'managed': False,
+            },
+        ),
+    ]
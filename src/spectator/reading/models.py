@@ -118,6 +118,11 @@ class Publication(ThumbnailModelMixin, TimeStampedModelMixin, SluggedModelMixin)
         BOOK = "book", "Book"
         PERIODICAL = "periodical", "Periodical"
 
+    class ReadingState(models.TextChoices):
+        UNREAD = "unread", "Unread"
+        IN_PROGRESS = "in_progress", "In progress"
+        READ = "read", "Read"
+
     title = models.CharField(
         null=False,
         blank=False,
@@ -191,6 +196,25 @@ class Publication(ThumbnailModelMixin, TimeStampedModelMixin, SluggedModelMixin)
         "spectator_core.Creator", through="PublicationRole", related_name="publications"
     )
 
+    # These two are set whenever one of the Publication's Readings is saved
+    # or deleted, so that we don't need to join to Reading to find them:
+    reading_state = models.CharField(
+        max_length=20,
+        choices=ReadingState.choices,
+        default=ReadingState.UNREAD,
+        editable=False,
+        help_text="Set automatically when the Publication's Readings change.",
+    )
+    current_reading = models.ForeignKey(
+        "spectator_reading.Reading",
+        blank=True,
+        null=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        help_text="The earliest-started Reading that hasn't yet ended, if any.",
+    )
+
     # Managers
 
     objects = models.Manager()
@@ -206,6 +230,24 @@ class Publication(ThumbnailModelMixin, TimeStampedModelMixin, SluggedModelMixin)
 
     class Meta:
         ordering = ("title_sort",)
+        indexes = [
+            models.Index(
+                fields=["reading_state", "is_removed"],
+                name="spectator_pub_reading_state",
+            ),
+            # For lists of visible books or periodicals:
+            models.Index(
+                fields=["kind", "title_sort"],
+                condition=models.Q(is_removed=False),
+                name="spectator_pub_kind_title",
+            ),
+            # For lists of a series' visible Publications:
+            models.Index(
+                fields=["series", "title_sort"],
+                condition=models.Q(is_removed=False),
+                name="spectator_pub_series_title",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -230,10 +272,84 @@ class Publication(ThumbnailModelMixin, TimeStampedModelMixin, SluggedModelMixin)
         )
 
     def get_current_reading(self):
-        try:
-            return self.reading_set.filter(end_date__isnull=True)[0]
-        except IndexError:
-            pass
+        return self.current_reading
+
+    def update_reading_state(self):
+        """
+        Set reading_state and current_reading based on this Publication's
+        Readings. Called whenever a Reading is saved or deleted.
+
+        * No Readings at all: unread.
+        * Any Reading with a start_date but no end_date: in progress, and the
+          earliest-started of those is the current_reading.
+        * Otherwise: read.
+
+        Uses update() so that saving a Reading doesn't change the
+        Publication's time_modified or re-run its save() method.
+        """
+        readings = Reading.objects.filter(publication_id=self.pk)
+
+        current_reading = (
+            readings.filter(start_date__isnull=False, end_date__isnull=True)
+            .order_by("start_date", "pk")
+            .first()
+        )
+
+        if current_reading is not None:
+            reading_state = self.ReadingState.IN_PROGRESS
+        elif readings.exists():
+            reading_state = self.ReadingState.READ
+        else:
+            reading_state = self.ReadingState.UNREAD
+
+        self.reading_state = reading_state
+        self.current_reading = current_reading
+
+        Publication.objects.filter(pk=self.pk).update(
+            reading_state=reading_state, current_reading=current_reading
+        )
+
+    @classmethod
+    def update_reading_states(cls, pks, batch_size=1000):
+        """
+        Like update_reading_state(), but for many Publications at once, e.g.
+        after creating Readings with bulk_create(), which sends no signals.
+
+        pks -- The pks of the Publications to update.
+
+        Uses one query to fetch each batch's Readings, and one to update them.
+        """
+        pks = list(pks)
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start : start + batch_size]
+
+            states = {pk: (cls.ReadingState.UNREAD, None) for pk in batch}
+            readings = (
+                Reading.objects.filter(publication_id__in=batch)
+                .order_by("start_date", "pk")
+                .values_list("pk", "publication_id", "start_date", "end_date")
+            )
+            for reading_pk, publication_id, start_date, end_date in readings:
+                state, current_reading_id = states[publication_id]
+                if state == cls.ReadingState.IN_PROGRESS:
+                    # Already found the earliest-started in progress Reading.
+                    continue
+                if start_date is not None and end_date is None:
+                    states[publication_id] = (cls.ReadingState.IN_PROGRESS, reading_pk)
+                else:
+                    states[publication_id] = (cls.ReadingState.READ, None)
+
+            cls.objects.bulk_update(
+                [
+                    cls(
+                        pk=pk,
+                        reading_state=state,
+                        current_reading_id=current_reading_id,
+                    )
+                    for pk, (state, current_reading_id) in states.items()
+                ],
+                ["reading_state", "current_reading"],
+            )
 
     @property
     def amazon_uk_url(self):
@@ -319,13 +435,160 @@ class Reading(TimeStampedModelMixin, models.Model):
         default=False, help_text="Did you finish the publication?"
     )
 
+    # So that we can find Readings that ended on the same day in different
+    # years using an index:
+    end_date_month = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Set when the reading is saved.",
+    )
+    end_date_day = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Set when the reading is saved.",
+    )
+
     objects = managers.EndDateAscendingReadingsManager()
     objects_desc = managers.EndDateDescendingReadingsManager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["start_date", "end_date"], name="spectator_reading_dates"
+            ),
+            models.Index(
+                fields=["end_date_month", "end_date_day"],
+                name="spectator_reading_month_day",
+            ),
+            # For the year archives:
+            models.Index(fields=["end_date"], name="spectator_reading_end"),
+            # Matches the ordering used by the Reading managers:
+            models.Index(
+                managers.end_date_is_null(),
+                "end_date",
+                name="spectator_reading_end_date",
+            ),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        """
+        Overridden so that we can save the original publication_id.
+        So that if the Reading is moved to a different Publication, the
+        signals can update the reading state of both Publications.
+        """
+        super().__init__(*args, **kwargs)
+        self.original_publication_id = self.publication_id
+
     def __str__(self):
         return f"{self.publication} ({self.start_date} to {self.end_date})"
 
+    def save(self, *args, **kwargs):
+        self.set_derived_fields()
+
+        if (
+            update_fields := kwargs.get("update_fields")
+        ) is not None and "end_date" in update_fields:
+            kwargs["update_fields"] = {"end_date_month", "end_date_day"}.union(
+                update_fields
+            )
+
+        return super().save(*args, **kwargs)
+
+    def set_derived_fields(self):
+        """
+        Set end_date_month and end_date_day from end_date.
+        Called by save(), and before bulk_create().
+        """
+        # self.end_date might still be a string, e.g. "2017-02-15":
+        end_date = self._meta.get_field("end_date").to_python(self.end_date)
+        self.end_date_month = end_date.month if end_date else None
+        self.end_date_day = end_date.day if end_date else None
+
     def clean(self):
         if self.start_date and self.end_date and self.start_date > self.end_date:
             msg = "A Reading's end date can't be before its start date."
             raise ValidationError(msg)
+
+
+# Reporting models.
+#
+# These are read-only, unmanaged, models of database views whose SQL is in
+# spectator.core.reports. See spectator.events.models.EventFact.
+
+
+class ReadingFact(models.Model):
+    "One row per Reading, with its Publication's and PublicationSeries' details."
+
+    reading = models.OneToOneField(
+        Reading,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    publication = models.ForeignKey(
+        Publication, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    publication_title = models.CharField(max_length=255)
+    publication_kind = models.CharField(max_length=20, choices=Publication.Kind.choices)
+    is_removed = models.BooleanField()
+    series = models.ForeignKey(
+        PublicationSeries,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    series_title = models.CharField(max_length=255)
+    start_date = models.DateField(null=True)
+    start_granularity = models.PositiveSmallIntegerField(
+        choices=Reading.DateGranularity.choices
+    )
+    end_date = models.DateField(null=True)
+    end_granularity = models.PositiveSmallIntegerField(
+        choices=Reading.DateGranularity.choices
+    )
+    end_date_month = models.PositiveSmallIntegerField(null=True)
+    end_date_day = models.PositiveSmallIntegerField(null=True)
+    is_finished = models.BooleanField()
+    creator_count = models.PositiveIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "spectator_reading_readingfact"
+
+    def __str__(self):
+        return f"Reading {self.reading_id}"
+
+
+class ReadingParticipation(models.Model):
+    "One row per Creator of each Reading's Publication."
+
+    pk = models.CompositePrimaryKey("creator_id", "reading_id")
+    creator = models.ForeignKey(
+        "spectator_core.Creator",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    reading = models.ForeignKey(
+        Reading, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    publication = models.ForeignKey(
+        Publication, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    publication_kind = models.CharField(max_length=20, choices=Publication.Kind.choices)
+    start_date = models.DateField(null=True)
+    end_date = models.DateField(null=True)
+    is_finished = models.BooleanField()
+    # How many PublicationRoles they have on the Publication:
+    roles = models.PositiveIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "spectator_reading_readingparticipation"
+
+    def __str__(self):
+        return f"Creator {self.creator_id} of Reading {self.reading_id}"
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Publication, Reading
+
+
+@receiver(post_delete, sender=Reading, dispatch_uid="spectator.delete.reading")
+@receiver(post_save, sender=Reading, dispatch_uid="spectator.save.reading")
+def reading_changed(sender, **kwargs):
+    """
+    When a Reading is saved or deleted we update its Publication's
+    reading_state and current_reading.
+
+    If the Reading was moved from one Publication to another, both are updated.
+    """
+    reading = kwargs["instance"]
+
+    publication_ids = {reading.publication_id, reading.original_publication_id}
+
+    for publication in Publication.objects.filter(pk__in=publication_ids):
+        if publication.pk == reading.publication_id and (
+            Reading.publication.is_cached(reading)
+        ):
+            # Update the Publication object the Reading already has, so that
+            # its fields are up to date for whoever saved the Reading.
+            publication = reading.publication
+        publication.update_reading_state()
+
+    reading.original_publication_id = reading.publication_id
@@ -1,8 +1,8 @@
 import datetime as dt
 
 from django import template
-from django.db.models import Q
 from django.template import TemplateSyntaxError
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 
 from spectator.core import app_settings
@@ -60,9 +60,9 @@ def in_progress_publications():
     """
     Returns a QuerySet of any Publications that are currently being read.
     """
-    return Publication.in_progress_objects.select_related("series").prefetch_related(
-        "roles__creator"
-    )
+    return Publication.in_progress_objects.select_related(
+        "series", "current_reading"
+    ).prefetch_related("roles__creator")
 
 
 @register.inclusion_tag("spectator_reading/includes/card_publications.html")
@@ -82,18 +82,23 @@ def day_publications(date):
     Returns a QuerySet of Publications that were being read on `date`.
     `date` is a date object.
     """
-    readings = Reading.objects.filter(start_date__lte=date).filter(
-        Q(end_date__gte=date) | Q(end_date__isnull=True)
+    return (
+        Publication.visible_objects.being_read_on(date)
+        .select_related("series")
+        .prefetch_related("roles__creator")
     )
-    if readings:
-        return (
-            Publication.visible_objects.filter(reading__in=readings)
-            .select_related("series")
-            .prefetch_related("roles__creator")
-            .distinct()
-        )
-    else:
-        return Publication.objects.none()
+
+
+@register.simple_tag
+def days_publications(dates):
+    """
+    Returns a dict of lists of Publications that were being read on each of
+    `dates`, keyed by date. e.g. for showing what was being read on each day
+    of a month in a calendar.
+
+    `dates` is a list of date objects.
+    """
+    return Publication.visible_objects.being_read_on_dates(list(dates))
 
 
 @register.inclusion_tag("spectator_reading/includes/card_publications.html")
@@ -110,6 +115,39 @@ def day_publications_card(date):
     }
 
 
+@register.simple_tag
+def on_this_day_readings(date=None, num=10):
+    """
+    Returns a QuerySet of Readings that ended on the same day and month as
+    `date`, in previous years. Most recent first.
+    `date` is a date object; defaults to today.
+    `num` is the maximum number returned.
+    """
+    if date is None:
+        date = timezone.localdate()
+
+    return (
+        Reading.objects.on_this_day(date.month, date.day)
+        .filter(end_date__lt=date, publication__is_removed=False)
+        .select_related("publication__series")
+        .prefetch_related("publication__roles__creator")[:num]
+    )
+
+
+@register.inclusion_tag("spectator_reading/includes/card_readings.html")
+def on_this_day_readings_card(date=None, num=10):
+    """
+    Displays Readings that ended on the same day and month as `date`, in
+    previous years.
+    `date` is a date object; defaults to today.
+    `num` is the maximum number returned.
+    """
+    return {
+        "card_title": "Finished on this day",
+        "reading_list": on_this_day_readings(date=date, num=num),
+    }
+
+
 @register.simple_tag
 def reading_years():
     """
@@ -1,11 +1,13 @@
 from django.urls import path, re_path
 
-from . import views
+from . import feeds, views
 
 app_name = "reading"
 
 urlpatterns = [
     path("", view=views.ReadingHomeView.as_view(), name="home"),
+    path("feed/", view=feeds.FinishedReadingsFeed(), name="feed"),
+    path("feed/atom/", view=feeds.FinishedReadingsAtomFeed(), name="feed_atom"),
     path(
         "series/",
         view=views.PublicationSeriesListView.as_view(),
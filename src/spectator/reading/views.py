@@ -23,7 +23,7 @@ class ReadingHomeView(ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["in_progress_publication_list"] = (
-            Publication.in_progress_objects.select_related("series")
+            Publication.in_progress_objects.select_related("series", "current_reading")
             .prefetch_related("roles__creator")
             .all()
         )
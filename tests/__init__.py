@@ -1,4 +1,7 @@
 import datetime as dt
+import tempfile
+
+from django.test import TestCase
 
 from spectator.core import app_settings
 
@@ -56,3 +59,14 @@ def override_app_settings(**test_settings):
         return __override_app_settings
 
     return _override_app_settings
+
+
+class MediaTestCase(TestCase):
+    "Uses an empty MEDIA_ROOT, so no thumbnails have been generated already."
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = self.settings(MEDIA_ROOT=media_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
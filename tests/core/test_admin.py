@@ -1,5 +1,14 @@
+from unittest import mock
+
 from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from spectator.core.admin import EstimatedCountPaginator
+from spectator.core.factories import IndividualCreatorFactory
+from spectator.core.models import Creator
 
 
 class AdminTestCase(TestCase):
@@ -7,3 +16,134 @@ class AdminTestCase(TestCase):
 
     def setUp(self):
         self.site = AdminSite()
+
+
+class IndexedAutocompleteJsonViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.adams = IndividualCreatorFactory(name="Douglas Adams")
+            self.ant = IndividualCreatorFactory(name="Adam Ant")
+            IndividualCreatorFactory(name="Bob Dylan")
+        self.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="test"
+        )
+        self.client.force_login(self.user)
+
+    def get_json(self, term, **kwargs):
+        params = {
+            "term": term,
+            "app_label": "spectator_events",
+            "model_name": "eventrole",
+            "field_name": "creator",
+        }
+        params.update(kwargs)
+        response = self.client.get(
+            reverse("admin:spectator_core_creator_autocomplete"), params
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_prefix_then_tokens(self):
+        "Matches on name_sort should come before matches on other words."
+        data = self.get_json("ada")
+        self.assertEqual(
+            data["results"],
+            [
+                {"id": str(self.adams.pk), "text": "Douglas Adams"},
+                {"id": str(self.ant.pk), "text": "Adam Ant"},
+            ],
+        )
+        self.assertFalse(data["pagination"]["more"])
+
+    def test_all_words(self):
+        data = self.get_json("douglas ad")
+        self.assertEqual(
+            data["results"], [{"id": str(self.adams.pk), "text": "Douglas Adams"}]
+        )
+
+    def test_no_term(self):
+        data = self.get_json("")
+        self.assertEqual(len(data["results"]), 3)
+
+    def test_pagination(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in range(25):
+                IndividualCreatorFactory(name=f"Person {n}")
+        data = self.get_json("person")
+        self.assertEqual(len(data["results"]), 20)
+        self.assertTrue(data["pagination"]["more"])
+
+        data = self.get_json("person", page=2)
+        self.assertEqual(len(data["results"]), 5)
+        self.assertFalse(data["pagination"]["more"])
+
+    def test_cached(self):
+        self.get_json("ada")
+        with self.assertNumQueries(3):  # Session, user, and fetching Creators
+            self.get_json("ada")
+
+    def test_cache_updated(self):
+        "Changing a Creator should mean cached results aren't used."
+        self.get_json("ada")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ant.name = "Stuart Goddard"
+            self.ant.save()
+        data = self.get_json("ada")
+        self.assertEqual(
+            data["results"], [{"id": str(self.adams.pk), "text": "Douglas Adams"}]
+        )
+
+    def test_permission_denied(self):
+        self.client.logout()
+        response = self.client.get(
+            reverse("admin:spectator_core_creator_autocomplete"),
+            {
+                "term": "ada",
+                "app_label": "spectator_events",
+                "model_name": "eventrole",
+                "field_name": "creator",
+            },
+        )
+        # Redirected to the login page:
+        self.assertEqual(response.status_code, 302)
+
+    def test_widget_url(self):
+        "The inlines' widgets should use the indexed autocomplete view."
+        response = self.client.get(reverse("admin:spectator_events_event_add"))
+        self.assertContains(
+            response,
+            f'data-ajax--url="{reverse("admin:spectator_core_creator_autocomplete")}"',
+        )
+        self.assertContains(
+            response,
+            f'data-ajax--url="{reverse("admin:spectator_events_venue_autocomplete")}"',
+        )
+        self.assertContains(
+            response,
+            f'data-ajax--url="{reverse("admin:spectator_events_work_autocomplete")}"',
+        )
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    def setUp(self):
+        IndividualCreatorFactory.create_batch(3)
+
+    def test_count(self):
+        paginator = EstimatedCountPaginator(Creator.objects.all(), 2)
+        self.assertEqual(paginator.count, 3)
+
+    def test_uses_large_estimate(self):
+        paginator = EstimatedCountPaginator(Creator.objects.all(), 2)
+        with mock.patch.object(paginator, "get_estimated_count", return_value=250_000):
+            self.assertEqual(paginator.count, 250_000)
+
+    def test_ignores_small_estimate(self):
+        "Small tables are cheap to count, so use the real number."
+        paginator = EstimatedCountPaginator(Creator.objects.all(), 2)
+        with mock.patch.object(paginator, "get_estimated_count", return_value=10):
+            self.assertEqual(paginator.count, 3)
+
+    def test_no_estimate_when_filtered(self):
+        paginator = EstimatedCountPaginator(Creator.objects.filter(kind="group"), 2)
+        self.assertIsNone(paginator.get_estimated_count())
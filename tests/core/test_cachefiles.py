@@ -0,0 +1,126 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from imagekit.cachefiles import ImageCacheFile
+
+from spectator.core.cachefiles import (
+    Manifest,
+    forget_generated,
+    get_generated_names,
+    record_generated,
+)
+from spectator.core.models import GeneratedThumbnail
+from spectator.core.tasks import generate_thumbnails
+from spectator.reading.factories import PublicationFactory
+from tests import MediaTestCase, override_app_settings
+
+
+class ManifestTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_get_generated_names(self):
+        record_generated("a.jpg", ["CACHE/a/1.jpg", "CACHE/a/2.jpg"])
+        record_generated("b.jpg", ["CACHE/b/1.jpg"])
+        self.assertEqual(
+            get_generated_names("a.jpg"), {"CACHE/a/1.jpg", "CACHE/a/2.jpg"}
+        )
+
+    def test_get_generated_names_cached(self):
+        record_generated("a.jpg", ["CACHE/a/1.jpg"])
+        get_generated_names("a.jpg")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_generated_names("a.jpg"), {"CACHE/a/1.jpg"})
+
+    def test_record_generated_again(self):
+        "It should ignore files that are already recorded, and update the cache."
+        record_generated("a.jpg", ["CACHE/a/1.jpg"])
+        get_generated_names("a.jpg")
+        record_generated("a.jpg", ["CACHE/a/1.jpg", "CACHE/a/2.jpg"])
+        self.assertEqual(GeneratedThumbnail.objects.count(), 2)
+        self.assertEqual(len(get_generated_names("a.jpg")), 2)
+
+    def test_forget_generated(self):
+        record_generated("a.jpg", ["CACHE/a/1.jpg", "CACHE/a/2.jpg"])
+        get_generated_names("a.jpg")
+        forget_generated(["CACHE/a/1.jpg"])
+        self.assertEqual(get_generated_names("a.jpg"), {"CACHE/a/2.jpg"})
+
+
+class ManifestStrategyTestCase(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.pub = PublicationFactory(thumbnail__filename="tester.jpg")
+
+    def get_file(self, spec_name="list_thumbnail"):
+        "Returns one of the pub's spec files, using the Manifest strategy."
+        generator = getattr(self.pub, spec_name).generator
+        return ImageCacheFile(generator, cachefile_strategy=Manifest())
+
+    def test_generates_and_records(self):
+        file = self.get_file()
+        url = file.url
+        self.assertTrue(default_storage.exists(file.name))
+        self.assertTrue(url.endswith(file.name))
+        self.assertEqual(get_generated_names(self.pub.thumbnail.name), {file.name})
+
+    def test_no_storage_access(self):
+        "Once a file's recorded, getting its URL shouldn't use the storage."
+        url = self.get_file().url
+        # The names are fetched from the database, and cached:
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_file().url, url)
+
+        with (
+            patch.object(FileSystemStorage, "exists") as mock_exists,
+            patch.object(FileSystemStorage, "_save") as mock_save,
+            self.assertNumQueries(0),
+        ):
+            self.assertEqual(self.get_file().url, url)
+        mock_exists.assert_not_called()
+        mock_save.assert_not_called()
+
+    def test_already_stored(self):
+        "A file that's stored but not recorded should be recorded, not regenerated."
+        self.pub.list_thumbnail.generate()
+        with patch.object(FileSystemStorage, "_save") as mock_save:
+            file = self.get_file()
+            self.assertTrue(file)
+        mock_save.assert_not_called()
+        self.assertIn(file.name, get_generated_names(self.pub.thumbnail.name))
+
+    @override_app_settings(THUMBNAIL_MANIFEST=True)
+    def test_task_records(self):
+        generate_thumbnails(
+            model="spectator_reading.publication",
+            pk=self.pub.pk,
+            name=self.pub.thumbnail.name,
+        )
+        self.assertEqual(
+            len(get_generated_names(self.pub.thumbnail.name)),
+            len(self.pub.thumbnail_spec_names),
+        )
+
+    @override_app_settings(THUMBNAIL_MANIFEST=True)
+    def test_command_records(self):
+        call_command(
+            "spectator_generate_thumbnails", "--workers", "1", stdout=StringIO()
+        )
+        self.assertEqual(
+            get_generated_names(self.pub.thumbnail.name),
+            {
+                getattr(self.pub, spec_name).name
+                for spec_name in self.pub.thumbnail_spec_names
+            },
+        )
+
+    def test_not_recorded_by_default(self):
+        call_command(
+            "spectator_generate_thumbnails", "--workers", "1", stdout=StringIO()
+        )
+        self.assertFalse(GeneratedThumbnail.objects.exists())
@@ -0,0 +1,276 @@
+import gzip
+import io
+import os
+import tarfile
+import tempfile
+from io import StringIO
+
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from spectator.core.dumps import (
+    dump_model,
+    dump_thumbnails,
+    get_dump_models,
+    restore,
+    restore_thumbnails,
+)
+from spectator.core.factories import GroupCreatorFactory, IndividualCreatorFactory
+from spectator.core.models import Creator, SearchEntry
+from spectator.events.factories import (
+    CinemaEventFactory,
+    EventRoleFactory,
+    GigEventFactory,
+    MovieFactory,
+    WorkRoleFactory,
+    WorkSelectionFactory,
+)
+from spectator.events.models import Event
+from spectator.reading.factories import (
+    PublicationFactory,
+    PublicationRoleFactory,
+    ReadingFactory,
+)
+from spectator.reading.models import Publication
+from tests import MediaTestCase, make_date
+
+
+def get_data():
+    "All the dumped models' data, to compare before and after."
+    return {
+        model._meta.label: list(model._base_manager.order_by("pk").values())
+        for model in get_dump_models()
+    }
+
+
+def delete_data():
+    for model in reversed(get_dump_models()):
+        model._base_manager.all().delete()
+
+
+def dump():
+    out = StringIO()
+    call_command("spectator_dump", stdout=out, stderr=StringIO())
+    return out.getvalue()
+
+
+class DumpRestoreTestCase(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        director = IndividualCreatorFactory(name="Agnès Varda")
+        movie = MovieFactory(title="Cléo from 5 to 7", year=1962)
+        WorkRoleFactory(work=movie, creator=director, role_name="Director")
+        cinema = CinemaEventFactory(date=make_date("2020-01-02"), title="")
+        WorkSelectionFactory(event=cinema, work=movie)
+        # Its title_sort comes from its Creators:
+        gig = GigEventFactory(title="")
+        EventRoleFactory(event=gig, creator=GroupCreatorFactory(name="The Band"))
+
+        self.pub = PublicationFactory(title="The Book")
+        PublicationRoleFactory(publication=self.pub, creator=director)
+        ReadingFactory(
+            publication=self.pub,
+            start_date=make_date("2020-01-01"),
+            end_date=make_date("2020-02-01"),
+            is_finished=True,
+        )
+        ReadingFactory(publication=self.pub, start_date=make_date("2021-01-01"))
+        self.pub.refresh_from_db()
+
+    def test_dump_lines(self):
+        lines = dump().splitlines()
+        self.assertEqual(len(lines), sum(len(v) for v in get_data().values()))
+        self.assertTrue(lines[0].startswith('{"model": "spectator_core.creator"'))
+        # Not escaped:
+        self.assertIn("Agnès Varda", lines[0])
+
+    def test_round_trip(self):
+        "Restoring should recreate everything exactly, even slugs and times."
+        before = get_data()
+        data = dump()
+        delete_data()
+
+        counts = restore(data.splitlines(), get_dump_models())
+
+        self.assertEqual(get_data(), before)
+        self.assertEqual(counts["spectator_core.creator"], 2)
+        self.assertEqual(counts["spectator_events.event"], 2)
+
+    def test_deferred_current_reading(self):
+        current_reading_id = self.pub.current_reading_id
+        self.assertIsNotNone(current_reading_id)
+        data = dump()
+        delete_data()
+
+        restore(data.splitlines(), get_dump_models())
+
+        pub = Publication.objects.get(pk=self.pub.pk)
+        self.assertEqual(pub.current_reading_id, current_reading_id)
+        self.assertEqual(pub.reading_state, Publication.ReadingState.IN_PROGRESS)
+
+    def test_event_title_sort(self):
+        "It should keep Events' title_sort, which depends on Works and Creators."
+        title_sorts = list(Event.objects.order_by("pk").values_list("title_sort"))
+        data = dump()
+        delete_data()
+
+        restore(data.splitlines(), get_dump_models())
+
+        self.assertEqual(
+            list(Event.objects.order_by("pk").values_list("title_sort")),
+            title_sorts,
+        )
+        self.assertEqual(title_sorts[1], ("band, the",))
+
+    def test_missing_slug(self):
+        "Slugs are generated if they're not in the dump."
+        creator = Creator.objects.first()
+        slug = creator.slug
+        out = StringIO()
+        dump_model(Creator, out)
+        Creator.objects.all().delete()
+
+        data = out.getvalue().replace(f'"slug": "{slug}"', '"slug": ""')
+        restore(data.splitlines(), [Creator])
+
+        self.assertEqual(Creator.objects.get(pk=creator.pk).slug, slug)
+
+    def test_batches(self):
+        "The number of queries should depend on the batches, not the objects."
+        data = dump()
+        delete_data()
+        with CaptureQueriesContext(connection) as queries:
+            restore(data.splitlines(), get_dump_models(), batch_size=1000)
+        few = len(queries)
+
+        IndividualCreatorFactory.create_batch(20)
+        data = dump()
+        delete_data()
+        with CaptureQueriesContext(connection) as queries:
+            restore(data.splitlines(), get_dump_models(), batch_size=1000)
+        self.assertEqual(len(queries), few)
+
+    def test_restore_command(self):
+        before = get_data()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spectator.jsonl.gz")
+            call_command("spectator_dump", "--output", path, stdout=StringIO())
+            with gzip.open(path, "rt") as f:
+                self.assertIn("spectator_core.creator", f.readline())
+            delete_data()
+
+            out = StringIO()
+            call_command("spectator_restore", path, stdout=out)
+
+        self.assertEqual(get_data(), before)
+        self.assertIn("Restored", out.getvalue())
+        # The search index is rebuilt:
+        self.assertTrue(
+            SearchEntry.objects.filter(object_type="spectator_core.creator")
+        )
+
+    def test_restore_command_not_empty(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spectator.jsonl")
+            call_command("spectator_dump", "--output", path, stdout=StringIO())
+            with self.assertRaisesRegex(CommandError, "empty"):
+                call_command("spectator_restore", path, stdout=StringIO())
+
+    def test_restore_invalid(self):
+        delete_data()
+        with self.assertRaisesRegex(ValueError, "Invalid line"):
+            restore(["not json"], get_dump_models())
+        with self.assertRaisesRegex(ValueError, "Unknown"):
+            restore(['{"model": "auth.user", "pk": 1, "fields": {}}'], [Creator])
+
+    def test_restore_invalid_rolls_back(self):
+        data = dump().splitlines()
+        delete_data()
+        with self.assertRaises(ValueError):
+            restore([*data, "not json"], get_dump_models())
+        self.assertFalse(Creator.objects.exists())
+
+    def test_loaddata(self):
+        "The dump should also be a fixture that loaddata can load."
+        before = get_data()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spectator.jsonl")
+            call_command("spectator_dump", "--output", path, stdout=StringIO())
+            delete_data()
+            call_command("loaddata", path, stdout=StringIO())
+        self.assertEqual(
+            get_data()["spectator_core.Creator"], before["spectator_core.Creator"]
+        )
+
+
+class DumpThumbnailsTestCase(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pub = PublicationFactory(thumbnail__filename="tester.jpg")
+        self.event = CinemaEventFactory(thumbnail__filename="tester.jpg")
+        self.names = [self.pub.thumbnail.name, self.event.thumbnail.name]
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "thumbnails.tar.gz")
+            self.assertEqual(dump_thumbnails(get_dump_models(), path), (2, 0))
+
+            contents = {name: default_storage.open(name).read() for name in self.names}
+            for name in self.names:
+                default_storage.delete(name)
+
+            self.assertEqual(restore_thumbnails(get_dump_models(), path), (2, 0))
+
+        for name in self.names:
+            self.assertEqual(default_storage.open(name).read(), contents[name])
+
+    def test_missing(self):
+        default_storage.delete(self.names[0])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "thumbnails.tar")
+            self.assertEqual(dump_thumbnails(get_dump_models(), path), (1, 1))
+
+    def test_skips(self):
+        "Existing files, and those outside the thumbnail directories, are skipped."
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "thumbnails.tar")
+            with tarfile.open(path, "w") as tar:
+                for name in (self.names[0], "other/file.txt"):
+                    info = tarfile.TarInfo(name)
+                    info.size = 1
+                    tar.addfile(info, io.BytesIO(b"x"))
+
+            self.assertEqual(restore_thumbnails(get_dump_models(), path), (0, 2))
+
+        self.assertFalse(default_storage.exists("other/file.txt"))
+        self.assertNotEqual(default_storage.open(self.names[0]).read(), b"x")
+
+    def test_commands(self):
+        with tempfile.TemporaryDirectory() as directory:
+            data_path = os.path.join(directory, "spectator.jsonl")
+            path = os.path.join(directory, "thumbnails.tar")
+            out = StringIO()
+            call_command(
+                "spectator_dump",
+                "--output",
+                data_path,
+                "--thumbnails",
+                path,
+                stdout=out,
+            )
+            self.assertIn("Archived 2 thumbnail files", out.getvalue())
+
+            delete_data()
+            for name in self.names:
+                default_storage.delete(name)
+
+            out = StringIO()
+            call_command(
+                "spectator_restore", data_path, "--thumbnails", path, stdout=out
+            )
+            self.assertIn("Saved 2 thumbnail files", out.getvalue())
+
+        for name in self.names:
+            self.assertTrue(default_storage.exists(name))
@@ -0,0 +1,86 @@
+import io
+
+import piexif
+from django.core.files.base import ContentFile, File
+from django.test import TestCase
+from PIL import Image
+
+from spectator.core.exif import get_exif_dict, get_jpeg_exif_segment, remove_gps_data
+
+# An image that has GPS data:
+GPS_PATH = "tests/core/fixtures/images/tester_exif_gps.jpg"
+
+
+class CountingFile(io.BytesIO):
+    "Records how many bytes have been read."
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def make_image(image_format="JPEG", exif_dict=None):
+    "Returns the bytes of a new image, with exif_dict as its EXIF data."
+    output = io.BytesIO()
+    kwargs = {"exif": piexif.dump(exif_dict)} if exif_dict else {}
+    Image.new("RGB", (400, 400), "blue").save(output, image_format, **kwargs)
+    return output.getvalue()
+
+
+class GetJpegExifSegmentTestCase(TestCase):
+    def test_gps(self):
+        with open(GPS_PATH, "rb") as f:
+            segment = get_jpeg_exif_segment(f)
+        self.assertTrue(segment.startswith(b"Exif\x00\x00"))
+        self.assertEqual(len(piexif.load(segment)["GPS"]), 15)
+
+    def test_no_exif(self):
+        self.assertIsNone(get_jpeg_exif_segment(io.BytesIO(make_image())))
+
+    def test_not_jpeg(self):
+        self.assertIsNone(get_jpeg_exif_segment(io.BytesIO(make_image("PNG"))))
+
+    def test_only_reads_header(self):
+        file = CountingFile(make_image(exif_dict={"0th": {piexif.ImageIFD.Make: "X"}}))
+        self.assertIsNotNone(get_jpeg_exif_segment(file))
+        self.assertLess(file.bytes_read, 200)
+
+
+class GetExifDictTestCase(TestCase):
+    def test_jpeg(self):
+        image = make_image(exif_dict={"0th": {piexif.ImageIFD.Make: "Acme"}})
+        exif_dict = get_exif_dict(io.BytesIO(image))
+        self.assertEqual(exif_dict["0th"][piexif.ImageIFD.Make], b"Acme")
+
+    def test_webp(self):
+        image = make_image("WEBP", exif_dict={"0th": {piexif.ImageIFD.Make: "Acme"}})
+        exif_dict = get_exif_dict(io.BytesIO(image))
+        self.assertEqual(exif_dict["0th"][piexif.ImageIFD.Make], b"Acme")
+
+    def test_png(self):
+        self.assertIsNone(get_exif_dict(io.BytesIO(make_image("PNG"))))
+
+
+class RemoveGpsDataTestCase(TestCase):
+    def test_removes_gps(self):
+        with open(GPS_PATH, "rb") as f:
+            sanitized = remove_gps_data(File(f, name="tester_exif_gps.jpg"))
+            self.assertIsInstance(sanitized, ContentFile)
+            self.assertEqual(sanitized.name, "tester_exif_gps.jpg")
+            self.assertEqual(piexif.load(sanitized.read())["GPS"], {})
+
+    def test_unchanged_without_gps(self):
+        "The same file should be returned, having only read its header."
+        file = CountingFile(
+            make_image(exif_dict={"0th": {piexif.ImageIFD.Make: "Acme"}})
+        )
+        self.assertIs(remove_gps_data(file), file)
+        self.assertLess(file.bytes_read, 200)
+        self.assertEqual(file.tell(), 0)
+
+    def test_unchanged_without_exif(self):
+        file = io.BytesIO(make_image())
+        self.assertIs(remove_gps_data(file), file)
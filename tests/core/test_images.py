@@ -0,0 +1,59 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from imagekit.processors import ResizeToFit
+from PIL import ExifTags, Image
+
+from spectator.core.images import get_image_info, get_resized_dimensions
+
+
+def make_image_file(width, height, image_format="JPEG"):
+    file = BytesIO()
+    Image.new("RGB", (width, height), "blue").save(file, format=image_format)
+    return file
+
+
+class GetImageInfoTestCase(SimpleTestCase):
+    def test_jpeg(self):
+        file = make_image_file(400, 300)
+        width, height, placeholder = get_image_info(file)
+        self.assertEqual((width, height), (400, 300))
+        self.assertTrue(placeholder.startswith("data:image/"))
+        self.assertLess(len(placeholder), 400)
+
+    def test_exif_orientation(self):
+        "It should return the size of the image once it's rotated to be upright."
+        file = BytesIO()
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = 6
+        Image.new("RGB", (400, 300), "blue").save(file, format="JPEG", exif=exif)
+        width, height, _ = get_image_info(file)
+        self.assertEqual((width, height), (300, 400))
+
+    def test_png(self):
+        width, height, _ = get_image_info(make_image_file(30, 60, "PNG"))
+        self.assertEqual((width, height), (30, 60))
+
+    def test_rewinds_file(self):
+        "It should leave the file ready to be read again."
+        file = make_image_file(40, 40)
+        get_image_info(file)
+        self.assertEqual(file.tell(), 0)
+
+    def test_not_an_image(self):
+        with self.assertRaises(OSError):
+            get_image_info(BytesIO(b"Not an image"))
+
+
+class GetResizedDimensionsTestCase(SimpleTestCase):
+    def test_same_as_processor(self):
+        "It should match the size of images resized by imagekit's ResizeToFit."
+        for size, max_size in (
+            ((400, 300), (80, 160)),
+            ((300, 400), (320, 320)),
+            ((50, 75), (640, 640)),
+            ((333, 777), (160, 320)),
+        ):
+            with self.subTest(size=size, max_size=max_size):
+                image = ResizeToFit(*max_size).process(Image.new("RGB", size))
+                self.assertEqual(get_resized_dimensions(*size, *max_size), image.size)
@@ -0,0 +1,160 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from spectator.core.factories import GroupCreatorFactory, IndividualCreatorFactory
+from spectator.core.imports import (
+    CREATOR_SORT_VARIANTS,
+    ImportRowError,
+    Resolver,
+    get_list,
+    parse_creator,
+    parse_date,
+    read_rows,
+)
+from spectator.core.models import Creator
+from spectator.events.models import Event
+from spectator.reading.models import Reading
+from tests import make_date
+
+
+class ParseTestCase(TestCase):
+    def test_read_rows_csv(self):
+        rows = read_rows(StringIO("title,authors\nThe Book,A; B\n"), "csv")
+        self.assertEqual(rows, [{"title": "The Book", "authors": "A; B"}])
+
+    def test_read_rows_json(self):
+        rows = read_rows(StringIO('[{"title": "The Book"}]'), "json")
+        self.assertEqual(rows, [{"title": "The Book"}])
+
+    def test_read_rows_json_invalid(self):
+        with self.assertRaisesRegex(ValueError, "list of objects"):
+            read_rows(StringIO('{"title": "The Book"}'), "json")
+
+    def test_get_list(self):
+        self.assertEqual(get_list({"a": " A ; ;B"}, "a"), ["A", "B"])
+        self.assertEqual(get_list({"a": ["A", "B"]}, "a"), ["A", "B"])
+        self.assertEqual(get_list({"a": ""}, "a"), [])
+        self.assertEqual(get_list({}, "a"), [])
+
+    def test_parse_creator(self):
+        self.assertEqual(
+            parse_creator(1, "Caryl Churchill (Writer)"),
+            ("Caryl Churchill", "Writer", "individual"),
+        )
+        self.assertEqual(parse_creator(1, "Bob"), ("Bob", "", "individual"))
+        self.assertEqual(
+            parse_creator(1, {"name": "The Band", "kind": "group"}),
+            ("The Band", "", "group"),
+        )
+
+    def test_parse_creator_invalid(self):
+        with self.assertRaisesRegex(ImportRowError, "Row 3: A creator has no name"):
+            parse_creator(3, " (Writer)")
+        with self.assertRaisesRegex(ImportRowError, "Unknown creator kind"):
+            parse_creator(3, {"name": "Bob", "kind": "robot"})
+
+    def test_parse_date(self):
+        self.assertEqual(parse_date(1, "2017-02-15"), (make_date("2017-02-15"), "day"))
+        self.assertEqual(parse_date(1, "2017-02"), (make_date("2017-02-01"), "month"))
+        self.assertEqual(parse_date(1, "2017"), (make_date("2017-01-01"), "year"))
+        self.assertEqual(parse_date(1, ""), (None, None))
+
+    def test_parse_date_invalid(self):
+        for value in ("2017-13", "15/02/2017", "2017-02-30"):
+            with self.subTest(value=value), self.assertRaises(ImportRowError):
+                parse_date(1, value)
+        with self.assertRaisesRegex(ImportRowError, "A date is required"):
+            parse_date(1, "", required=True)
+
+
+class ResolverTestCase(TestCase):
+    def test_finds_and_creates(self):
+        existing = IndividualCreatorFactory(name="Caryl Churchill")
+        resolver = Resolver(Creator, "name_sort", ("name",))
+        resolver.add(("Caryl Churchill",), {"name": "Caryl Churchill"})
+        resolver.add(("Jan Morris",), {"name": "Jan Morris"})
+
+        with self.assertNumQueries(2):
+            resolver.resolve()
+
+        self.assertEqual(resolver.get(("Caryl Churchill",)), existing)
+        self.assertEqual(resolver.created, [resolver.get(("Jan Morris",))])
+        self.assertIsNotNone(resolver.get(("Jan Morris",)).pk)
+        self.assertEqual(Creator.objects.count(), 2)
+
+    def test_exact_match(self):
+        "Objects with the same sort key but a different name are different."
+        IndividualCreatorFactory(name="the band")
+        resolver = Resolver(Creator, "name_sort", ("name",))
+        resolver.add(("The Band",), {"name": "The Band"})
+        resolver.resolve()
+        self.assertEqual(len(resolver.created), 1)
+
+    def test_sort_variants(self):
+        "Objects whose sort key depends on their kind should be found."
+        group = GroupCreatorFactory(name="The Long Blondes")
+        resolver = Resolver(
+            Creator, "name_sort", ("name",), sort_variants=CREATOR_SORT_VARIANTS
+        )
+        resolver.add(("The Long Blondes",), {"name": "The Long Blondes"})
+        resolver.resolve()
+        self.assertEqual(resolver.get(("The Long Blondes",)), group)
+        self.assertEqual(resolver.created, [])
+
+    def test_lowest_pk(self):
+        first = IndividualCreatorFactory(name="Bob")
+        IndividualCreatorFactory(name="Bob")
+        resolver = Resolver(Creator, "name_sort", ("name",))
+        resolver.add(("Bob",), {"name": "Bob"})
+        resolver.resolve()
+        self.assertEqual(resolver.get(("Bob",)), first)
+
+
+class ImportCommandTestCase(TestCase):
+    def call_command(self, kind, filename, content, *args):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, filename)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            out = StringIO()
+            call_command("spectator_import", kind, path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_events_csv(self):
+        output = self.call_command(
+            "events",
+            "events.csv",
+            "date,kind,venue,works\n2017-02-15,cinema,Cinema,Cléo from 5 to 7\n",
+        )
+        self.assertIn("Imported 1 rows", output)
+        self.assertIn("1 venues, 1 works, 1 events", output)
+        self.assertEqual(Event.objects.get().make_title(), "Cléo from 5 to 7")
+
+    def test_readings_json(self):
+        output = self.call_command(
+            "readings",
+            "readings.txt",
+            json.dumps([{"title": "The Book", "start_date": "2017"}]),
+            "--format",
+            "json",
+        )
+        self.assertIn("1 readings", output)
+        self.assertEqual(Reading.objects.get().publication.title, "The Book")
+
+    def test_unknown_format(self):
+        with self.assertRaisesRegex(CommandError, "--format"):
+            self.call_command("events", "events.txt", "")
+
+    def test_invalid_row(self):
+        with self.assertRaisesRegex(CommandError, "Row 2: Unknown event kind"):
+            self.call_command(
+                "events",
+                "events.csv",
+                "date,kind\n2017-02-15,gig\n2017-02-16,party\n",
+            )
+        self.assertFalse(Event.objects.exists())
@@ -1,7 +1,7 @@
 from django.test import TestCase
 
 from spectator.core.factories import GroupCreatorFactory, IndividualCreatorFactory
-from spectator.core.models import Creator
+from spectator.core.models import Creator, get_thumbnail_formats
 from spectator.events.factories import (
     ClassicalWorkFactory,
     DancePieceFactory,
@@ -206,3 +206,14 @@ class CreatorTestCase(TestCase):
         plays = bob.get_plays()
         self.assertEqual(len(plays), 1)
         self.assertEqual(plays[0], p)
+
+
+class GetThumbnailFormatsTestCase(TestCase):
+    @override_app_settings(THUMBNAIL_FORMATS=("nope", "webp"))
+    def test_unknown_format(self):
+        "Formats Pillow doesn't know about should be ignored."
+        self.assertEqual(get_thumbnail_formats(), ("webp",))
+
+    @override_app_settings(THUMBNAIL_FORMATS=())
+    def test_none(self):
+        self.assertEqual(get_thumbnail_formats(), ())
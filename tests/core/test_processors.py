@@ -0,0 +1,122 @@
+import sys
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from imagekit.processors import ResizeToFit as ImagekitResizeToFit
+from PIL import ExifTags, Image
+
+from spectator.core.management.commands.spectator_benchmark_thumbnails import (
+    _peak_memory_bytes,
+)
+from spectator.core.processors import ResizeToFit
+
+
+def open_image(width, height, image_format="JPEG", orientation=None, mode="RGB"):
+    "Returns a new, unloaded, image of the given size, opened from a file."
+    image = Image.new(mode, (width, height))
+    # Left half red, right half blue:
+    image.paste("red" if mode == "RGB" else 1, (0, 0, width // 2, height))
+    file = BytesIO()
+    kwargs = {}
+    if orientation:
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = orientation
+        kwargs["exif"] = exif
+    image.save(file, format=image_format, **kwargs)
+    file.seek(0)
+    return Image.open(file)
+
+
+class ResizeToFitTestCase(SimpleTestCase):
+    def test_same_size_as_imagekit(self):
+        "It should make images the same size as imagekit's ResizeToFit."
+        for size, max_size in (
+            ((2000, 1500), (80, 160)),
+            ((1500, 2000), (320, 320)),
+            ((333, 777), (160, 320)),
+            ((50, 75), (640, 640)),
+        ):
+            with self.subTest(size=size, max_size=max_size):
+                expected = ImagekitResizeToFit(*max_size).process(open_image(*size))
+                image = ResizeToFit(*max_size).process(open_image(*size))
+                self.assertEqual(image.size, expected.size)
+
+    def test_decodes_jpeg_at_reduced_size(self):
+        img = open_image(2000, 1500)
+        image = ResizeToFit(80, 160).process(img)
+        self.assertEqual(image.size, (80, 60))
+        # Decoded at 1/8 size, which is still at least twice (80, 60):
+        self.assertEqual(img.size, (250, 188))
+
+    def test_png(self):
+        image = ResizeToFit(80, 160).process(open_image(400, 200, "PNG"))
+        self.assertEqual(image.size, (80, 40))
+
+    def test_palette(self):
+        image = ResizeToFit(80, 160).process(open_image(400, 200, "PNG", mode="P"))
+        self.assertEqual(image.mode, "RGB")
+        self.assertEqual(image.size, (80, 40))
+
+    def test_exif_orientation(self):
+        "It should rotate the image to be upright first."
+        # Orientation 6 means the image should be rotated 90 degrees clockwise:
+        img = open_image(800, 400, orientation=6)
+        image = ResizeToFit(320, 320).process(img)
+        self.assertEqual(image.size, (160, 320))
+        # The left half was red, so now the top half is:
+        red, green, blue = image.getpixel((80, 40))
+        self.assertGreater(red, 200)
+        self.assertLess(blue, 50)
+        red, green, blue = image.getpixel((80, 280))
+        self.assertLess(red, 50)
+
+    def test_no_upscale(self):
+        image = ResizeToFit(320, 320, upscale=False).process(open_image(50, 75))
+        self.assertEqual(image.size, (50, 75))
+
+    def test_no_upscale_orientation(self):
+        image = ResizeToFit(320, 320, upscale=False).process(
+            open_image(50, 75, orientation=8)
+        )
+        self.assertEqual(image.size, (75, 50))
+
+
+class BenchmarkThumbnailsCommandTestCase(SimpleTestCase):
+    def call_command(self, *args):
+        out = StringIO()
+        call_command("spectator_benchmark_thumbnails", *args, stdout=out)
+        return out.getvalue()
+
+    def test_generated_image(self):
+        output = self.call_command("--size", "400x300", "--repeat", "1")
+        self.assertIn("Generated 400x300 JPEG (0.1 megapixels):", output)
+        self.assertIn("  imagekit ", output)
+        self.assertIn("  spectator ", output)
+        self.assertIn("MB peak memory", output)
+        self.assertIn("spectator is ", output)
+
+    def test_peak_memory(self):
+        self.assertGreater(_peak_memory_bytes(), 0)
+
+    def test_peak_memory_unavailable(self):
+        "Without /proc or the resource module, e.g. on Windows, it's unknown."
+        with (
+            mock.patch("builtins.open", side_effect=OSError),
+            mock.patch.dict(sys.modules, {"resource": None}),
+        ):
+            self.assertIsNone(_peak_memory_bytes())
+
+    def test_path(self):
+        path = "tests/core/fixtures/images/tester_exif_gps.jpg"
+        output = self.call_command(path, "--repeat", "1")
+        self.assertIn(f"{path} (", output)
+
+    def test_invalid_size(self):
+        with self.assertRaises(CommandError):
+            self.call_command("--size", "big")
+
+    def test_invalid_repeat(self):
+        with self.assertRaises(CommandError):
+            self.call_command("--repeat", "0")
@@ -0,0 +1,139 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.sql import (
+    emit_post_migrate_signal,
+    emit_pre_migrate_signal,
+)
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+from django.test import TestCase, TransactionTestCase
+
+from spectator.core import reports
+from spectator.events.factories import GigEventFactory
+from spectator.events.models import Event, EventFact
+from spectator.reading.factories import ReadingFactory
+from spectator.reading.models import Reading, ReadingFact
+from tests import make_date
+
+
+class ReportsTestCase(TestCase):
+    def test_get_report_models(self):
+        models = reports.get_report_models()
+        self.assertEqual(len(models), 5)
+        self.assertIn(EventFact, models)
+        self.assertIn(ReadingFact, models)
+
+    def test_get_report_views_applied(self):
+        "Only views whose apps' migrations have been applied are included."
+        applied = {("spectator_events", "0052_report_views"): None}
+        with mock.patch.object(
+            MigrationRecorder, "applied_migrations", return_value=applied
+        ):
+            views = reports.get_report_views("default")
+        self.assertEqual(
+            [view.name for view in views],
+            [view.name for view in reports.REPORT_VIEWS["events"]],
+        )
+        self.assertEqual(len(reports.get_report_views()), 5)
+
+    def test_create_sql(self):
+        view = reports.REPORT_VIEWS["events"][0]
+        quote_name = connection.ops.quote_name
+        self.assertEqual(
+            view.get_create_sql(quote_name),
+            [f'CREATE VIEW "spectator_events_eventfact" AS {view.get_sql()}'],
+        )
+        statements = view.get_create_sql(
+            quote_name, materialized=True, vendor="postgresql"
+        )
+        self.assertEqual(
+            statements[0],
+            'CREATE MATERIALIZED VIEW "spectator_events_eventfact" AS '
+            f"{view.get_sql('postgresql')}",
+        )
+        self.assertEqual(
+            statements[1],
+            'CREATE UNIQUE INDEX "spectator_events_eventfact_0" '
+            'ON "spectator_events_eventfact" ("event_id")',
+        )
+        self.assertEqual(len(statements), 1 + len(view.indexes))
+
+    def test_string_agg(self):
+        view = reports.REPORT_VIEWS["events"][0]
+        self.assertIn("group_concat(value, ', ')", view.get_sql("sqlite"))
+        self.assertIn(
+            "string_agg(value, ', ' ORDER BY position, item_id)",
+            view.get_sql("postgresql"),
+        )
+        self.assertNotIn("{", view.get_sql())
+
+    def test_refresh_not_materialized(self):
+        self.assertEqual(reports.refresh_reports(), [])
+
+    def test_refresh_materialized(self):
+        applied = MigrationRecorder(connection).applied_migrations()
+        with (
+            mock.patch.object(reports, "is_materialized", return_value=True),
+            mock.patch.object(
+                MigrationRecorder, "applied_migrations", return_value=applied
+            ),
+            mock.patch("django.db.backends.utils.CursorWrapper.execute") as execute,
+        ):
+            refreshed = reports.refresh_reports()
+
+        self.assertEqual(refreshed, reports.get_report_models())
+        execute.assert_any_call(
+            'REFRESH MATERIALIZED VIEW CONCURRENTLY "spectator_events_eventfact"'
+        )
+
+    def test_command(self):
+        out = StringIO()
+        call_command("spectator_refresh_reports", stdout=out)
+        self.assertIn("aren't materialized", out.getvalue())
+
+
+class MigrateTestCase(TransactionTestCase):
+    """
+    The views are dropped before migrating, and created afterwards, so that
+    migrations can alter the tables they use.
+    """
+
+    def alter_field(self, model, name, **kwargs):
+        "Alter a field in the database. Returns the new field."
+        old_field = model._meta.get_field(name)
+        new_field = old_field.clone()
+        for key, value in kwargs.items():
+            setattr(new_field, key, value)
+        new_field.set_attributes_from_name(name)
+        new_field.model = model
+        with connection.schema_editor() as schema_editor:
+            schema_editor.alter_field(model, old_field, new_field)
+        return old_field, new_field
+
+    def test_alter_tables(self):
+        emit_pre_migrate_signal(verbosity=0, interactive=False, db="default")
+        altered = [
+            self.alter_field(Event, "note", null=True),
+            self.alter_field(Reading, "end_date", db_index=True),
+        ]
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+
+        try:
+            event = GigEventFactory(date=make_date("2017-02-15"))
+            reading = ReadingFactory(end_date=make_date("2017-02-20"))
+            self.assertEqual(EventFact.objects.get().event_id, event.pk)
+            self.assertEqual(ReadingFact.objects.get().reading_id, reading.pk)
+        finally:
+            emit_pre_migrate_signal(verbosity=0, interactive=False, db="default")
+            with connection.schema_editor() as schema_editor:
+                for old_field, new_field in altered:
+                    schema_editor.alter_field(new_field.model, new_field, old_field)
+            emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+
+    def test_migrate_command(self):
+        "The views still exist after the migrate command."
+        call_command("migrate", verbosity=0)
+        GigEventFactory()
+        self.assertEqual(EventFact.objects.count(), 1)
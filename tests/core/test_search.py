@@ -0,0 +1,384 @@
+import contextlib
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from spectator.core import search
+from spectator.core.factories import GroupCreatorFactory, IndividualCreatorFactory
+from spectator.core.models import Creator, SearchEntry
+from spectator.events.factories import (
+    CinemaEventFactory,
+    EventRoleFactory,
+    GigEventFactory,
+    MovieFactory,
+    VenueFactory,
+    WorkSelectionFactory,
+)
+from spectator.reading.factories import BookFactory, PublicationSeriesFactory
+from spectator.reading.models import Publication
+
+# The backends that can run on the current database:
+BACKENDS = [("python",)]
+if connection.vendor == "sqlite":
+    BACKENDS.append(("sqlite",))
+elif connection.vendor == "postgresql":
+    BACKENDS.append(("postgresql",))
+
+
+class NormalizeTestCase(TestCase):
+    def test_lowercase(self):
+        self.assertEqual(
+            search.normalize("The Long BLONDES"), ["the", "long", "blondes"]
+        )
+
+    def test_accents(self):
+        self.assertEqual(search.normalize("Björk Début"), ["bjork", "debut"])
+
+    def test_html(self):
+        self.assertEqual(
+            search.normalize("<p>Hello <b>there</b></p>"), ["hello", "there"]
+        )
+
+    def test_punctuation(self):
+        self.assertEqual(
+            search.normalize("Don't stop_me, now!"), ["don", "t", "stop", "me", "now"]
+        )
+
+    def test_none(self):
+        self.assertEqual(search.normalize(None), [])
+
+
+class SignalsTestCase(TestCase):
+    """
+    Entries are updated when the transaction is committed, so changes are
+    made within captureOnCommitCallbacks().
+    """
+
+    def get_entry(self, obj):
+        return SearchEntry.objects.get(
+            object_type=obj._meta.label_lower, object_id=obj.pk
+        )
+
+    def test_creator(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            creator = IndividualCreatorFactory(name="Douglas Adams")
+        entry = self.get_entry(creator)
+        self.assertEqual(entry.title, "Douglas Adams")
+        self.assertEqual(entry.title_text, "douglas adams")
+
+    def test_not_until_commit(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            IndividualCreatorFactory()
+        self.assertEqual(SearchEntry.objects.count(), 0)
+
+    def test_indexed_once_per_transaction(self):
+        with (
+            mock.patch.object(search, "index_object") as index_object,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            creator = IndividualCreatorFactory(name="Douglas Adams")
+            creator.name = "Douglas Noel Adams"
+            creator.save()
+        index_object.assert_called_once_with(creator)
+
+    def test_rolled_back_savepoint(self):
+        "Changes in a rolled back savepoint aren't indexed."
+        with self.captureOnCommitCallbacks(execute=True):
+            creator = IndividualCreatorFactory(name="Douglas Adams")
+            with contextlib.suppress(IntegrityError), transaction.atomic():
+                other = Creator.objects.get(pk=creator.pk)
+                other.name = "Someone Else"
+                other.save()
+                msg = "Roll back"
+                raise IntegrityError(msg)
+        self.assertEqual(self.get_entry(creator).title, "Douglas Adams")
+
+    def test_deleted_in_savepoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            creator = IndividualCreatorFactory()
+            with transaction.atomic():
+                creator.delete()
+        self.assertEqual(SearchEntry.objects.count(), 0)
+
+    def test_rolled_back_transaction(self):
+        "Nothing is kept waiting after a transaction is rolled back."
+        with contextlib.suppress(IntegrityError), transaction.atomic():
+            IndividualCreatorFactory()
+            msg = "Roll back"
+            raise IntegrityError(msg)
+        self.assertFalse(
+            any(
+                isinstance(func, search._PendingIndex)
+                for _, func, _ in connection.run_on_commit
+            )
+        )
+
+    def test_updates_on_save(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            creator = IndividualCreatorFactory(name="Douglas Adams")
+        with self.captureOnCommitCallbacks(execute=True):
+            creator.name = "Douglas Noel Adams"
+            creator.save()
+        self.assertEqual(self.get_entry(creator).title_text, "douglas noel adams")
+
+    def test_deletes_on_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            creator = IndividualCreatorFactory()
+        with self.captureOnCommitCallbacks(execute=True):
+            creator.delete()
+        self.assertEqual(SearchEntry.objects.count(), 0)
+
+    def test_saved_and_deleted(self):
+        "Nothing should be indexed if the object is deleted in the same transaction."
+        with self.captureOnCommitCallbacks(execute=True):
+            IndividualCreatorFactory().delete()
+        self.assertEqual(SearchEntry.objects.count(), 0)
+
+    def test_event_note_and_venue(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            venue = VenueFactory(name="The Lexington", note="<p>A pub</p>")
+            event = GigEventFactory(
+                title="Indietracks", venue=venue, note="<p>Great</p>"
+            )
+        entry = self.get_entry(event)
+        self.assertEqual(entry.title_text, "indietracks")
+        self.assertEqual(entry.body_text, "the lexington great")
+        self.assertEqual(self.get_entry(venue).body_text, "a pub")
+
+    def test_event_title_from_creators(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            event = GigEventFactory(title="")
+            creator = IndividualCreatorFactory(name="Bob")
+            EventRoleFactory(event=event, creator=creator)
+        self.assertEqual(self.get_entry(event).title_text, "bob")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            creator.name = "Alice"
+            creator.save()
+        self.assertEqual(self.get_entry(event).title_text, "alice")
+
+    def test_event_title_from_works(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            movie = MovieFactory(title="Jaws")
+            event = CinemaEventFactory(title="")
+            WorkSelectionFactory(event=event, work=movie)
+        self.assertEqual(self.get_entry(event).title_text, "jaws")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            movie.title = "Jaws 2"
+            movie.save()
+        self.assertEqual(self.get_entry(event).title_text, "jaws 2")
+
+    def test_publication_series(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            series = PublicationSeriesFactory(title="Hitchhiker's Guide")
+            book = BookFactory(title="Life, the Universe and Everything", series=series)
+        self.assertEqual(self.get_entry(book).body_text, "hitchhiker s guide")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            series.title = "Hitchhiker Trilogy"
+            series.save()
+        self.assertEqual(self.get_entry(book).body_text, "hitchhiker trilogy")
+
+    def test_removed_publication(self):
+        "Removed Publications shouldn't be searchable."
+        with self.captureOnCommitCallbacks(execute=True):
+            book = BookFactory()
+        with self.captureOnCommitCallbacks(execute=True):
+            book.is_removed = True
+            book.save()
+        self.assertFalse(
+            SearchEntry.objects.filter(
+                object_type="spectator_reading.publication", object_id=book.pk
+            ).exists()
+        )
+
+
+class RebuildIndexTestCase(TestCase):
+    def test_rebuild(self):
+        IndividualCreatorFactory(name="Douglas Adams")
+        BookFactory(title="Dirk Gently", series=None)
+
+        self.assertEqual(search.rebuild_index(), 2)
+        self.assertEqual(
+            sorted(SearchEntry.objects.values_list("title", flat=True)),
+            ["Dirk Gently", "Douglas Adams"],
+        )
+
+    def test_command(self):
+        IndividualCreatorFactory()
+
+        out = StringIO()
+        call_command("spectator_rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 1 search entry", out.getvalue())
+        self.assertEqual(SearchEntry.objects.count(), 1)
+
+
+class IndexObjectsTestCase(TestCase):
+    def test_creates_and_updates(self):
+        creators = IndividualCreatorFactory.create_batch(3)
+        Creator.objects.filter(pk=creators[0].pk).update(name="Renamed")
+
+        count = search.index_objects(Creator, [c.pk for c in creators], batch_size=2)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            SearchEntry.objects.get(object_id=creators[0].pk).title, "Renamed"
+        )
+        self.assertEqual(SearchEntry.objects.count(), 3)
+
+    def test_unindexes(self):
+        "Objects that shouldn't be searchable have their entries deleted."
+        with self.captureOnCommitCallbacks(execute=True):
+            book = BookFactory(series=None)
+        Publication.objects.filter(pk=book.pk).update(is_removed=True)
+
+        self.assertEqual(search.index_objects(Publication, [book.pk]), 0)
+        self.assertFalse(SearchEntry.objects.exists())
+
+
+class SearchTestCase(ParametrizedTestCase, TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.creator = IndividualCreatorFactory(name="Douglas Adams")
+            self.book = BookFactory(title="The Salmon of Doubt", series=None)
+            self.venue = VenueFactory(name="Adams Hall", note="Near the river")
+            self.event = GigEventFactory(
+                title="Salmon Festival", venue=None, note="<p>Fish by the river</p>"
+            )
+
+    def search_objects(self, query, backend):
+        return [result.object for result in search.search(query, backend=backend)]
+
+    @parametrize("backend", BACKENDS)
+    def test_matches_all_words(self, backend):
+        self.assertEqual(self.search_objects("douglas adams", backend), [self.creator])
+
+    @parametrize("backend", BACKENDS)
+    def test_prefix(self, backend):
+        self.assertEqual(self.search_objects("salm doub", backend), [self.book])
+
+    @parametrize("backend", BACKENDS)
+    def test_accents_and_case(self, backend):
+        self.assertEqual(self.search_objects("DÓUGLAS", backend), [self.creator])
+
+    @parametrize("backend", BACKENDS)
+    def test_title_ranked_above_body(self, backend):
+        "A match in a title should rank above a match in a note."
+        with self.captureOnCommitCallbacks(execute=True):
+            IndividualCreatorFactory(name="River Phoenix")
+        results = self.search_objects("river", backend)
+        self.assertEqual(results[0].name, "River Phoenix")
+        self.assertEqual(len(results), 3)
+
+    @parametrize("backend", BACKENDS)
+    def test_across_types(self, backend):
+        results = self.search_objects("salmon", backend)
+        self.assertEqual(set(results), {self.book, self.event})
+
+    @parametrize("backend", BACKENDS)
+    def test_no_matches(self, backend):
+        self.assertEqual(self.search_objects("zebra", backend), [])
+
+    @parametrize("backend", BACKENDS)
+    def test_empty_query(self, backend):
+        self.assertEqual(self.search_objects("  ", backend), [])
+
+    def test_kind_name(self):
+        results = search.search("salmon")
+        self.assertEqual({r.kind_name for r in results}, {"Book", "Gig"})
+
+    def test_slicing(self):
+        results = search.search("adams")
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(results[:1]), 1)
+        self.assertEqual(len(results[1:]), 1)
+
+    def test_stale_entry(self):
+        "An entry whose object has gone shouldn't be in results."
+        SearchEntry.objects.create(
+            object_type="spectator_core.creator",
+            object_id=9999,
+            title="Adams Ghost",
+            title_text="adams ghost",
+        )
+        self.assertEqual(len(search.search("ghost")[:]), 0)
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            search.get_backend("elasticsearch")
+
+    def test_auto_backend(self):
+        backend = search.get_backend("auto")
+        if connection.vendor == "sqlite":
+            self.assertIsInstance(backend, search.SQLiteBackend)
+        elif connection.vendor == "postgresql":
+            self.assertIsInstance(backend, search.PostgreSQLBackend)
+
+
+class AutocompleteTestCase(ParametrizedTestCase, TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.adams = IndividualCreatorFactory(name="Douglas Adams")
+            self.ant = IndividualCreatorFactory(name="Adam Ant")
+            self.blondes = GroupCreatorFactory(name="The Long Blondes")
+
+    def autocomplete(self, term, backend, **kwargs):
+        return search.autocomplete(
+            Creator.objects.all(), "name_sort", term, backend=backend, **kwargs
+        )
+
+    @parametrize("backend", BACKENDS)
+    def test_prefix_first(self, backend):
+        self.assertEqual(
+            self.autocomplete("ada", backend), ([self.adams.pk, self.ant.pk], False)
+        )
+
+    @parametrize("backend", BACKENDS)
+    def test_sort_field_prefix(self, backend):
+        self.assertEqual(
+            self.autocomplete("long blondes, t", backend), ([self.blondes.pk], False)
+        )
+
+    @parametrize("backend", BACKENDS)
+    def test_words(self, backend):
+        self.assertEqual(
+            self.autocomplete("THE LONG", backend), ([self.blondes.pk], False)
+        )
+
+    @parametrize("backend", BACKENDS)
+    def test_no_match(self, backend):
+        self.assertEqual(self.autocomplete("zebra", backend), ([], False))
+
+    def test_empty_term(self):
+        "All objects, ordered by the sort field."
+        self.assertEqual(
+            self.autocomplete("", None),
+            ([self.adams.pk, self.ant.pk, self.blondes.pk], False),
+        )
+
+    def test_pagination(self):
+        self.assertEqual(self.autocomplete("a", None, limit=1), ([self.adams.pk], True))
+        self.assertEqual(
+            self.autocomplete("a", None, offset=1, limit=1), ([self.ant.pk], False)
+        )
+
+    def test_queryset(self):
+        "Only objects in the queryset should be returned."
+        ids, _ = search.autocomplete(
+            Creator.objects.filter(kind="group"), "name_sort", "ant", backend=None
+        )
+        self.assertEqual(ids, [])
+
+
+class CacheVersionTestCase(TestCase):
+    def test_changes(self):
+        version = search.get_cache_version("spectator_core.creator")
+        self.assertEqual(version, search.get_cache_version("spectator_core.creator"))
+        with self.captureOnCommitCallbacks(execute=True):
+            IndividualCreatorFactory()
+        self.assertNotEqual(version, search.get_cache_version("spectator_core.creator"))
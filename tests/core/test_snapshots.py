@@ -0,0 +1,202 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from spectator.core import snapshots
+from spectator.core.dumps import get_dump_models
+from spectator.core.factories import GroupCreatorFactory, IndividualCreatorFactory
+from spectator.core.models import Creator
+from spectator.core.snapshots import get_indexes, snapshot
+from spectator.events.factories import (
+    EventRoleFactory,
+    GigEventFactory,
+    MovieFactory,
+    TheatreEventFactory,
+    VenueFactory,
+    WorkSelectionFactory,
+)
+from spectator.events.models import Event
+from spectator.reading.factories import (
+    PublicationFactory,
+    PublicationRoleFactory,
+    PublicationSeriesFactory,
+    ReadingFactory,
+)
+from tests import make_date
+
+
+class SnapshotTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "snapshot.sqlite3")
+
+        venue = VenueFactory(name="The Venue", latitude="51.5", longitude="-0.1")
+        self.gig = GigEventFactory(
+            title="", venue=venue, date=make_date("2017-02-15"), note="Loud."
+        )
+        EventRoleFactory(
+            event=self.gig, creator=GroupCreatorFactory(name="Band 1"), role_order=2
+        )
+        EventRoleFactory(
+            event=self.gig, creator=GroupCreatorFactory(name="Band 2"), role_order=1
+        )
+        self.play = TheatreEventFactory(title="My Title", venue=None)
+        WorkSelectionFactory(event=self.play, work=MovieFactory(title="A Play"))
+
+        author = IndividualCreatorFactory(name="Jan Morris")
+        self.pub = PublicationFactory(
+            title="The Book", series=PublicationSeriesFactory(title="Series")
+        )
+        PublicationRoleFactory(publication=self.pub, creator=author)
+        self.reading = ReadingFactory(
+            publication=self.pub,
+            start_date=make_date("2017-02-01"),
+            end_date=make_date("2017-02-28"),
+            is_finished=True,
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def query(self, sql):
+        with closing(sqlite3.connect(self.path)) as db:
+            db.row_factory = sqlite3.Row
+            return [dict(row) for row in db.execute(sql)]
+
+    def test_tables(self):
+        counts = snapshot(self.path)
+
+        self.assertEqual(counts["spectator_core_creator"], 3)
+        self.assertEqual(counts["spectator_events_event"], 2)
+        self.assertEqual(len(counts), len(get_dump_models()))
+
+        creator = self.query(
+            "SELECT * FROM spectator_core_creator WHERE name = 'Jan Morris'"
+        )[0]
+        original = Creator.objects.get(name="Jan Morris")
+        self.assertEqual(creator["id"], original.pk)
+        self.assertEqual(creator["slug"], original.slug)
+        self.assertEqual(creator["name_sort"], original.name_sort)
+
+        reading = self.query("SELECT * FROM spectator_reading_reading")[0]
+        self.assertEqual(reading["end_date"], "2017-02-28")
+        self.assertEqual(reading["is_finished"], 1)
+        # Times can be used with SQLite's date and time functions:
+        rows = self.query(
+            "SELECT date(time_created) AS d FROM spectator_reading_reading"
+        )
+        self.assertEqual(rows[0]["d"], self.reading.time_created.date().isoformat())
+
+    def test_indexes(self):
+        snapshot(self.path)
+        names = {
+            row["name"]
+            for row in self.query(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'spectator_events_event'"
+            )
+        }
+        self.assertTrue(set(get_indexes(Event)) <= names)
+        self.assertIn("spectator_event_kind_date", names)
+        self.assertIn("spectator_events_event_title_sort", names)
+
+    def test_event_details(self):
+        snapshot(self.path)
+        rows = {
+            row["id"]: row
+            for row in self.query("SELECT * FROM spectator_event_details")
+        }
+
+        gig = rows[self.gig.pk]
+        self.assertEqual(gig["title"], "Band 2, Band 1")
+        self.assertEqual(gig["creators"], "Band 2, Band 1")
+        self.assertIsNone(gig["works"])
+        self.assertEqual(gig["venue_name"], "The Venue")
+        self.assertEqual(gig["venue_latitude"], 51.5)
+        self.assertEqual(gig["date"], "2017-02-15")
+        self.assertEqual(gig["note"], "Loud.")
+
+        play = rows[self.play.pk]
+        self.assertEqual(play["title"], "My Title")
+        self.assertEqual(play["works"], "A Play")
+        self.assertIsNone(play["venue_name"])
+
+    def test_reading_details(self):
+        snapshot(self.path)
+        rows = self.query("SELECT * FROM spectator_reading_details")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["title"], "The Book")
+        self.assertEqual(rows[0]["series_title"], "Series")
+        self.assertEqual(rows[0]["authors"], "Jan Morris")
+        self.assertEqual(rows[0]["start_date"], "2017-02-01")
+
+    def test_report_views(self):
+        snapshot(self.path)
+        rows = self.query("SELECT * FROM spectator_events_eventfact")
+        self.assertEqual(
+            {row["event_id"]: row["creator_count"] for row in rows},
+            {self.gig.pk: 2, self.play.pk: 0},
+        )
+        rows = self.query("SELECT * FROM spectator_reading_readingfact")
+        self.assertEqual(rows[0]["series_title"], "Series")
+
+    def test_batches(self):
+        "Each table should be read with one query, however many batches."
+        IndividualCreatorFactory.create_batch(5)
+        models = get_dump_models()
+        # Plus creating and releasing the transaction's savepoint:
+        with self.assertNumQueries(len(models) + 2):
+            counts = snapshot(self.path, batch_size=2)
+        self.assertEqual(counts["spectator_core_creator"], 8)
+
+    def test_some_models(self):
+        "Views aren't created unless all their tables are."
+        snapshot(self.path, models=[Creator])
+        self.assertEqual(
+            self.query(
+                "SELECT type, name FROM sqlite_master "
+                "WHERE type != 'index' AND name NOT LIKE 'sqlite_%'"
+            ),
+            [{"type": "table", "name": "spectator_core_creator"}],
+        )
+
+    def test_command(self):
+        out = StringIO()
+        call_command("spectator_snapshot", self.path, stdout=out)
+        self.assertIn("Copied", out.getvalue())
+        self.assertIn(self.path, out.getvalue())
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+        with self.assertRaisesRegex(CommandError, "--force"):
+            call_command("spectator_snapshot", self.path, stdout=StringIO())
+
+        Creator.objects.all().delete()
+        call_command("spectator_snapshot", self.path, "--force", stdout=StringIO())
+        self.assertEqual(self.query("SELECT * FROM spectator_core_creator"), [])
+
+
+class SnapshotTransactionTestCase(TransactionTestCase):
+    def test_one_transaction(self):
+        "All the models should be read in the same transaction."
+        in_atomic_block = []
+        copy_model = snapshots.copy_model
+
+        def mock_copy_model(*args, **kwargs):
+            in_atomic_block.append(connection.in_atomic_block)
+            return copy_model(*args, **kwargs)
+
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            mock.patch.object(snapshots, "copy_model", side_effect=mock_copy_model),
+        ):
+            snapshot(os.path.join(directory, "snapshot.sqlite3"))
+
+        self.assertEqual(in_atomic_block, [True] * len(get_dump_models()))
+        self.assertFalse(connection.in_atomic_block)
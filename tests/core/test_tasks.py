@@ -0,0 +1,193 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from spectator.core import tasks
+from spectator.core.models import Task
+from spectator.reading.factories import PublicationFactory
+from spectator.reading.models import Publication
+from tests import override_app_settings
+
+# Records the arguments each test task is called with:
+calls = []
+
+
+@tasks.register("tests.succeed")
+def succeed(**kwargs):
+    calls.append(kwargs)
+
+
+@tasks.register("tests.fail", max_attempts=2)
+def fail(**kwargs):
+    calls.append(kwargs)
+    msg = "Oops"
+    raise ValueError(msg)
+
+
+class TasksTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_unknown(self):
+        with self.assertRaises(ValueError):
+            tasks.enqueue("tests.nope")
+
+    @override_app_settings(TASKS_MODE="sync")
+    def test_runs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks.enqueue("tests.succeed", pk=1, name="Bob")
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [{"pk": 1, "name": "Bob"}])
+
+    @override_app_settings(TASKS_MODE="sync")
+    def test_deleted_when_done(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks.enqueue("tests.succeed")
+        self.assertEqual(Task.objects.count(), 0)
+
+    @override_app_settings(TASKS_MODE="sync")
+    def test_retries_then_fails(self):
+        with (
+            self.assertLogs("spectator.core.tasks", "ERROR") as logs,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            task = tasks.enqueue("tests.fail")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(logs.records), 2)
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.FAILED)
+        self.assertEqual(task.attempts, 2)
+        self.assertIn("ValueError: Oops", task.last_error)
+
+    def test_run_task_delay(self):
+        "After a failure it should return the delay before a retry."
+        task = tasks.enqueue("tests.fail")
+        with self.assertLogs("spectator.core.tasks", "ERROR"):
+            self.assertEqual(tasks.run_task(task.pk), tasks.RETRY_DELAY)
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.PENDING)
+        self.assertGreater(task.run_after, timezone.now())
+
+    def test_run_task_running(self):
+        "It shouldn't run a task that's already running elsewhere."
+        task = tasks.enqueue("tests.succeed")
+        Task.objects.filter(pk=task.pk).update(status=Task.Status.RUNNING)
+        self.assertIsNone(tasks.run_task(task.pk))
+        self.assertEqual(calls, [])
+
+    def test_run_task_abandoned(self):
+        "It should run a task that's been running for too long."
+        task = tasks.enqueue("tests.succeed")
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.Status.RUNNING,
+            time_modified=timezone.now() - timedelta(hours=2),
+        )
+        tasks.run_task(task.pk)
+        self.assertEqual(len(calls), 1)
+
+    def test_run_task_unregistered(self):
+        task = Task.objects.create(name="tests.gone")
+        self.assertIsNone(tasks.run_task(task.pk))
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.FAILED)
+
+    @override_app_settings(TASKS_MODE="queue")
+    def test_queue_mode(self):
+        "It should only run tasks when asked to."
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks.enqueue("tests.succeed")
+        self.assertEqual(calls, [])
+        self.assertEqual(tasks.run_due_tasks(), 1)
+        self.assertEqual(len(calls), 1)
+
+    @override_app_settings(TASKS_MODE="queue")
+    def test_run_due_tasks_not_due(self):
+        task = tasks.enqueue("tests.succeed")
+        Task.objects.filter(pk=task.pk).update(
+            run_after=timezone.now() + timedelta(minutes=1)
+        )
+        self.assertEqual(tasks.run_due_tasks(), 0)
+
+    @override_app_settings(TASKS_MODE="thread")
+    def test_thread_mode(self):
+        with mock.patch.object(tasks, "get_executor") as get_executor:
+            tasks.start(123)
+        get_executor.return_value.submit.assert_called_once_with(
+            tasks._run_in_thread, 123
+        )
+
+    @override_app_settings(TASKS_MODE="thread")
+    def test_thread_mode_delay(self):
+        with mock.patch.object(tasks.threading, "Timer") as timer:
+            tasks.start(123, delay=30)
+        timer.assert_called_once_with(30, tasks.start, args=[123])
+        timer.return_value.start.assert_called_once_with()
+
+    @override_app_settings(TASKS_MODE="celery")
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            tasks.start(123)
+
+    @override_app_settings(TASKS_MODE="queue")
+    def test_command(self):
+        tasks.enqueue("tests.succeed")
+        out = StringIO()
+        call_command("spectator_run_tasks", stdout=out)
+        self.assertIn("Ran 1 task", out.getvalue())
+        self.assertEqual(len(calls), 1)
+
+
+class GenerateThumbnailsTestCase(TestCase):
+    @override_app_settings(TASKS_MODE="sync")
+    def test_generates_on_upload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            pub = PublicationFactory(thumbnail__filename="tester.jpg")
+        pub.refresh_from_db()
+
+        self.assertTrue(pub.thumbnails_ready)
+        for spec_name in pub.thumbnail_spec_names:
+            self.assertTrue(default_storage.exists(getattr(pub, spec_name).name))
+        self.assertEqual(Task.objects.count(), 0)
+
+        # Tidy up:
+        pub.thumbnail.delete()
+
+    def test_not_ready_until_generated(self):
+        pub = PublicationFactory(thumbnail__filename="tester.jpg")
+        pub.refresh_from_db()
+
+        self.assertFalse(pub.thumbnails_ready)
+        task = Task.objects.get()
+        self.assertEqual(task.name, "spectator.generate_thumbnails")
+        self.assertEqual(
+            task.kwargs,
+            {
+                "model": "spectator_reading.publication",
+                "pk": pub.pk,
+                "name": pub.thumbnail.name,
+            },
+        )
+
+        # Tidy up:
+        pub.thumbnail.delete()
+
+    def test_changed_thumbnail(self):
+        "If the thumbnail has changed since the task was queued it does nothing."
+        pub = PublicationFactory(thumbnail__filename="tester.jpg")
+        tasks.generate_thumbnails(
+            model="spectator_reading.publication", pk=pub.pk, name="old.jpg"
+        )
+        self.assertFalse(Publication.objects.get(pk=pub.pk).thumbnails_ready)
+
+        # Tidy up:
+        pub.thumbnail.delete()
+
+    def test_no_thumbnail(self):
+        "No task should be queued without a thumbnail."
+        PublicationFactory(thumbnail=None)
+        self.assertEqual(Task.objects.count(), 0)
@@ -1,6 +1,8 @@
 from unittest.mock import Mock, patch
 
+from django.core.files.storage import FileSystemStorage
 from django.http import QueryDict
+from django.template import Context, Template
 from django.test import TestCase
 
 from spectator.core.apps import Apps
@@ -15,6 +17,7 @@ from spectator.core.templatetags.spectator_core import (
     most_visited_venues,
     most_visited_venues_card,
     query_string,
+    thumbnail_picture,
 )
 from spectator.events.factories import MiscEventFactory, VenueFactory
 from spectator.reading.factories import (
@@ -22,6 +25,7 @@ from spectator.reading.factories import (
     PublicationRoleFactory,
     ReadingFactory,
 )
+from spectator.reading.models import Publication
 from tests import make_date
 
 
@@ -280,3 +284,88 @@ class MostVisitedVenuesCardTestCase(TestCase):
 
         self.assertIn("object_list", data)
         self.assertEqual(len(data["object_list"]), 3)
+
+
+class ThumbnailPictureTestCase(TestCase):
+    def setUp(self):
+        self.pub = PublicationFactory(
+            thumbnail__filename="tester_picture.jpg",
+            thumbnail__width=400,
+            thumbnail__height=200,
+        )
+        self.pub.thumbnails_ready = True
+
+    def tearDown(self):
+        self.pub.thumbnail.delete()
+
+    def test_img(self):
+        context = thumbnail_picture(self.pub, "list", alt_text="Cover", lazy=True)
+        self.assertEqual(context["src"], self.pub.list_thumbnail.url)
+        self.assertEqual(
+            context["srcset"],
+            f"{self.pub.list_thumbnail.url} 80w, {self.pub.list_thumbnail_2x.url} 160w",
+        )
+        self.assertEqual(context["sizes"], "80px")
+        self.assertEqual(context["width"], 80)
+        self.assertEqual(context["height"], 40)
+        self.assertEqual(context["placeholder"], self.pub.thumbnail_placeholder)
+        self.assertEqual(context["alt_text"], "Cover")
+        self.assertTrue(context["lazy"])
+
+    def test_sources(self):
+        context = thumbnail_picture(self.pub, "detail")
+        self.assertEqual(
+            [source["type"] for source in context["sources"]],
+            [f"image/{image_format}" for image_format in self.pub.thumbnail_formats],
+        )
+        self.assertIn(
+            {
+                "type": "image/webp",
+                "srcset": f"{self.pub.detail_thumbnail_webp.url} 320w, "
+                f"{self.pub.detail_thumbnail_2x_webp.url} 640w",
+            },
+            context["sources"],
+        )
+
+    @patch.object(Publication, "thumbnail_formats", ())
+    def test_no_sources(self):
+        self.assertEqual(thumbnail_picture(self.pub, "list")["sources"], [])
+
+    def test_html(self):
+        html = Template(
+            '{% load spectator_core %}{% thumbnail_picture pub "list" lazy=True %}'
+        ).render(Context({"pub": self.pub}))
+        self.assertIn("<picture>", html)
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertIn('width="80" height="40"', html)
+        self.assertIn("background: url(data:image/", html)
+
+    def test_no_files_opened(self):
+        "It shouldn't need to open any of the images to get their sizes."
+        for spec_name in self.pub.thumbnail_spec_names:
+            getattr(self.pub, spec_name).generate()
+        pub = Publication.objects.get(pk=self.pub.pk)
+        pub.thumbnails_ready = True
+
+        with patch.object(FileSystemStorage, "open") as mock_open:
+            context = thumbnail_picture(pub, "detail")
+        mock_open.assert_not_called()
+        self.assertEqual((context["width"], context["height"]), (320, 160))
+
+    def test_unknown_dimensions(self):
+        "For thumbnails uploaded before their sizes were saved, it reads the file."
+        self.pub.thumbnail_width = None
+        context = thumbnail_picture(self.pub, "list")
+        self.assertEqual((context["width"], context["height"]), (80, 40))
+
+    def test_not_ready(self):
+        "It should show a placeholder of the same size."
+        self.pub.thumbnails_ready = False
+        html = Template(
+            '{% load spectator_core %}{% thumbnail_picture pub "detail" %}'
+        ).render(Context({"pub": self.pub}))
+        self.assertIn("spectator-thumbnail-placeholder", html)
+        self.assertIn("width: 320px; height: 160px;", html)
+        self.assertIn("background: url(data:image/", html)
+        self.assertNotIn("<picture>", html)
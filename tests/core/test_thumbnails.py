@@ -0,0 +1,384 @@
+import json
+import os
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+import piexif
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import CommandError, call_command
+from imagekit import register
+from imagekit.cachefiles import ImageCacheFile
+from imagekit.registry import generator_registry
+from PIL import Image
+
+from spectator.core.cachefiles import get_generated_names, record_generated
+from spectator.core.fields import get_content_hash
+from spectator.core.imagegenerators import ListThumbnail
+from spectator.core.models import Task
+from spectator.core.thumbnails import (
+    generate_missing_thumbnails,
+    get_thumbnail_info,
+    get_thumbnail_models,
+    sanitize_thumbnail,
+)
+from spectator.events.factories import CinemaEventFactory
+from spectator.events.models import Event
+from spectator.reading.factories import PublicationFactory
+from spectator.reading.models import Publication
+from tests import MediaTestCase, override_app_settings
+
+# The number of sizes and formats of each thumbnail:
+NUM_SPECS = len(Publication.thumbnail_spec_names)
+
+
+class ThumbnailsTestCase(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        # Thumbnail tasks aren't run, because the transaction isn't committed:
+        self.pub = PublicationFactory(thumbnail__filename="tester.jpg")
+
+    def test_get_thumbnail_models(self):
+        self.assertEqual(set(get_thumbnail_models()), {Event, Publication})
+
+    def test_generate_missing_thumbnails(self):
+        missing, bytes_written = generate_missing_thumbnails(
+            "spectator_reading.publication", self.pub.pk, self.pub.thumbnail.name
+        )
+        self.assertEqual(missing, NUM_SPECS)
+        self.assertGreater(bytes_written, 0)
+        for spec_name in self.pub.thumbnail_spec_names:
+            self.assertTrue(default_storage.exists(getattr(self.pub, spec_name).name))
+
+        # They all exist now:
+        self.assertEqual(
+            generate_missing_thumbnails(
+                "spectator_reading.publication", self.pub.pk, self.pub.thumbnail.name
+            ),
+            (0, 0),
+        )
+
+    def test_dry_run(self):
+        self.assertEqual(
+            generate_missing_thumbnails(
+                "spectator_reading.publication",
+                self.pub.pk,
+                self.pub.thumbnail.name,
+                dry_run=True,
+            ),
+            (NUM_SPECS, 0),
+        )
+        self.assertFalse(default_storage.exists(self.pub.list_thumbnail.name))
+
+    def test_get_thumbnail_info(self):
+        info = get_thumbnail_info(
+            "spectator_reading.publication", self.pub.pk, self.pub.thumbnail.name
+        )
+        self.assertEqual(
+            info,
+            {
+                "thumbnail_width": self.pub.thumbnail_width,
+                "thumbnail_height": self.pub.thumbnail_height,
+                "thumbnail_placeholder": self.pub.thumbnail_placeholder,
+            },
+        )
+
+
+class GenerateThumbnailsCommandTestCase(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pub = PublicationFactory(thumbnail__filename="tester.jpg")
+        self.event = CinemaEventFactory(thumbnail__filename="tester.jpg")
+        # No thumbnail:
+        PublicationFactory(thumbnail=None)
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command("spectator_generate_thumbnails", *args, stdout=out)
+        return out.getvalue()
+
+    def test_generates(self):
+        output = self.call_command("--workers", "1")
+        self.assertIn(f"Generated {NUM_SPECS * 2} thumbnails for 2 objects", output)
+        self.assertIn("images/second", output)
+        self.assertTrue(default_storage.exists(self.event.detail_thumbnail.name))
+
+        self.pub.refresh_from_db()
+        self.assertTrue(self.pub.thumbnails_ready)
+
+    def test_saves_thumbnail_info(self):
+        "It should save the size and placeholder of older thumbnails."
+        width, placeholder = self.pub.thumbnail_width, self.pub.thumbnail_placeholder
+        Publication.objects.filter(pk=self.pub.pk).update(
+            thumbnail_width=None, thumbnail_height=None, thumbnail_placeholder=""
+        )
+        self.call_command("--workers", "1")
+        self.pub.refresh_from_db()
+        self.assertEqual(self.pub.thumbnail_width, width)
+        self.assertEqual(self.pub.thumbnail_placeholder, placeholder)
+
+    def test_only_missing(self):
+        self.call_command("--workers", "1")
+        self.assertIn(
+            "Generated 0 thumbnails for 2 objects", self.call_command("--workers", "1")
+        )
+
+    def test_process_pool(self):
+        output = self.call_command("--workers", "2", "--batch-size", "1")
+        self.assertIn(f"Generated {NUM_SPECS * 2} thumbnails for 2 objects", output)
+
+    def test_dry_run(self):
+        output = self.call_command("--workers", "1", "--dry-run")
+        self.assertIn(
+            f"Would generate {NUM_SPECS * 2} thumbnails for 2 objects", output
+        )
+        self.assertFalse(default_storage.exists(self.pub.list_thumbnail.name))
+        self.pub.refresh_from_db()
+        self.assertFalse(self.pub.thumbnails_ready)
+
+    def test_checkpoint(self):
+        "It should continue from the pks saved in the checkpoint file."
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "checkpoint.json")
+            with open(path, "w") as f:
+                json.dump({"spectator_reading.publication": self.pub.pk}, f)
+
+            output = self.call_command("--workers", "1", "--checkpoint", path)
+
+            self.assertIn(f"Generated {NUM_SPECS} thumbnails for 1 objects", output)
+            self.assertFalse(os.path.exists(path))
+        self.assertFalse(default_storage.exists(self.pub.list_thumbnail.name))
+
+    def test_invalid_workers(self):
+        with self.assertRaises(CommandError):
+            self.call_command("--workers", "0")
+
+
+class SanitizeExifCommandTestCase(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        # A file stored with GPS data, before it was removed from uploads:
+        with open("tests/core/fixtures/images/tester_exif_gps.jpg", "rb") as f:
+            name = default_storage.save("reading/publications/gps.jpg", File(f))
+        self.gps_pub = PublicationFactory(thumbnail=None)
+        Publication.objects.filter(pk=self.gps_pub.pk).update(thumbnail=name)
+        self.gps_pub.refresh_from_db()
+
+        self.pub = PublicationFactory(thumbnail__filename="tester.jpg")
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command("spectator_sanitize_exif", *args, stdout=out)
+        return out.getvalue()
+
+    def test_sanitize_thumbnail(self):
+        changed, name = sanitize_thumbnail(
+            "spectator_reading.publication",
+            self.gps_pub.pk,
+            self.gps_pub.thumbnail.name,
+        )
+        self.assertTrue(changed)
+        self.assertEqual(name, self.gps_pub.thumbnail.name)
+        self.assertEqual(piexif.load(self.gps_pub.thumbnail.path)["GPS"], {})
+
+    def test_sanitizes(self):
+        with mock.patch.object(
+            FileSystemStorage,
+            "_save",
+            autospec=True,
+            side_effect=FileSystemStorage._save,
+        ) as storage_save:
+            output = self.call_command("--workers", "2")
+
+        self.assertIn("Removed GPS data from 1 of 2 thumbnails", output)
+        # Only the file with GPS data was rewritten:
+        storage_save.assert_called_once()
+        self.assertEqual(piexif.load(self.gps_pub.thumbnail.path)["GPS"], {})
+
+    @override_app_settings(THUMBNAIL_CONTENT_ADDRESSED=True)
+    def test_content_addressed(self):
+        "The sanitized file should be stored under the hash of its contents."
+        old_name = self.gps_pub.thumbnail.name
+        self.call_command("--workers", "1")
+
+        self.gps_pub.refresh_from_db()
+        with self.gps_pub.thumbnail.open("rb") as file:
+            content_hash = get_content_hash(file)
+            self.assertEqual(piexif.load(file.read())["GPS"], {})
+        self.assertIn(content_hash, self.gps_pub.thumbnail.name)
+        self.assertFalse(default_storage.exists(old_name))
+        # Its sizes will be generated for the new name:
+        self.assertFalse(self.gps_pub.thumbnails_ready)
+        self.assertTrue(
+            Task.objects.filter(kwargs__name=self.gps_pub.thumbnail.name).exists()
+        )
+
+    @override_app_settings(THUMBNAIL_CONTENT_ADDRESSED=True)
+    def test_content_addressed_shared_file(self):
+        "A file that another object still uses shouldn't be deleted."
+        old_name = self.gps_pub.thumbnail.name
+        other_pub = PublicationFactory(thumbnail=None)
+        Publication.objects.filter(pk=other_pub.pk).update(thumbnail=old_name)
+
+        self.assertTrue(self.gps_pub.sanitize_thumbnail_exif_data())
+        self.assertNotEqual(self.gps_pub.thumbnail.name, old_name)
+        self.assertTrue(default_storage.exists(old_name))
+
+    def test_dry_run(self):
+        output = self.call_command("--workers", "1", "--dry-run")
+        self.assertIn("Found GPS data in 1 of 2 thumbnails", output)
+        self.assertEqual(len(piexif.load(self.gps_pub.thumbnail.path)["GPS"]), 15)
+
+    def test_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "checkpoint.json")
+            with open(path, "w") as f:
+                json.dump({"spectator_reading.publication": self.gps_pub.pk}, f)
+
+            output = self.call_command("--workers", "1", "--checkpoint", path)
+
+            self.assertIn("Removed GPS data from 0 of 1 thumbnails", output)
+            self.assertFalse(os.path.exists(path))
+
+
+class ContentAddressedThumbnailsTestCase(MediaTestCase):
+    def make_file(self, name="tester.jpg", color="blue"):
+        file = BytesIO()
+        Image.new("RGB", (100, 100), color).save(file, format="JPEG")
+        return ContentFile(file.getvalue(), name=name)
+
+    @override_app_settings(THUMBNAIL_CONTENT_ADDRESSED=True)
+    def test_named_by_hash(self):
+        file = self.make_file()
+        content_hash = get_content_hash(file)
+        pub = PublicationFactory(thumbnail=file)
+        self.assertEqual(
+            pub.thumbnail.name,
+            f"reading/publications/{content_hash[:2]}/{content_hash}.jpg",
+        )
+        self.assertEqual(len(content_hash), 32)
+
+    @override_app_settings(THUMBNAIL_CONTENT_ADDRESSED=True)
+    def test_identical_files_stored_once(self):
+        pub1 = PublicationFactory(thumbnail=self.make_file("one.jpg"))
+        with mock.patch.object(FileSystemStorage, "_save") as mock_save:
+            pub2 = PublicationFactory(thumbnail=self.make_file("two.JPG"))
+        mock_save.assert_not_called()
+        self.assertEqual(pub1.thumbnail.name, pub2.thumbnail.name)
+        self.assertTrue(pub2.thumbnail_width)
+
+        # And its sizes will still be generated:
+        self.assertFalse(pub2.thumbnails_ready)
+        self.assertEqual(
+            Task.objects.filter(kwargs__pk=pub2.pk).count(), 1, "No task queued"
+        )
+
+    @override_app_settings(THUMBNAIL_CONTENT_ADDRESSED=True)
+    def test_different_files(self):
+        pub1 = PublicationFactory(thumbnail=self.make_file(color="blue"))
+        pub2 = PublicationFactory(thumbnail=self.make_file(color="red"))
+        self.assertNotEqual(pub1.thumbnail.name, pub2.thumbnail.name)
+        self.assertNotEqual(pub1.list_thumbnail.url, pub2.list_thumbnail.url)
+
+    @override_app_settings(THUMBNAIL_CONTENT_ADDRESSED=True)
+    def test_hash_of_sanitized_file(self):
+        "The name should be the hash of the file after GPS data is removed."
+        path = "tests/core/fixtures/images/tester_exif_gps.jpg"
+        pub = PublicationFactory(thumbnail__from_path=path)
+        with pub.thumbnail.open("rb") as file:
+            content_hash = get_content_hash(file)
+        self.assertIn(content_hash, pub.thumbnail.name)
+
+    def test_off_by_default(self):
+        pub = PublicationFactory(thumbnail=self.make_file())
+        self.assertEqual(
+            pub.thumbnail.name, f"reading/publications/{pub.slug}/tester.jpg"
+        )
+
+
+class PruneMediaCommandTestCase(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pub = PublicationFactory(thumbnail__filename="tester.jpg")
+        self.pub.list_thumbnail.generate(force=True)
+        self.used = [self.pub.thumbnail.name, self.pub.list_thumbnail.name]
+
+        # From a thumbnail upload in a form that wasn't saved:
+        self.unused_upload = default_storage.save(
+            "reading/publications/abandoned/old.jpg", ContentFile(b"x" * 100)
+        )
+        # Generated from a thumbnail that's since been replaced:
+        self.unused_cache = default_storage.save(
+            "CACHE/images/reading/publications/wpgz9/old/abc.jpg",
+            ContentFile(b"x" * 50),
+        )
+        # Not Spectator's:
+        self.other = [
+            default_storage.save("other/file.jpg", ContentFile(b"x")),
+            default_storage.save("CACHE/images/other/file.jpg", ContentFile(b"x")),
+        ]
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command("spectator_prune_media", *args, stdout=out)
+        return out.getvalue()
+
+    def assert_exist(self, names, *, exist=True):
+        for name in names:
+            self.assertEqual(default_storage.exists(name), exist, name)
+
+    def test_prunes(self):
+        output = self.call_command("--min-age", "0")
+        self.assertIn("Deleted 2 of 4 files (0.0 MB, 150 bytes)", output)
+        self.assertIn("reading/publications: 2 files, 1 unused", output)
+        self.assert_exist([self.unused_upload, self.unused_cache], exist=False)
+        self.assert_exist(self.used + self.other)
+
+    def test_generators(self):
+        "Files made by the spectator:* image generators should be kept."
+
+        class LowQualityThumbnail(ListThumbnail):
+            options = {"quality": 50}
+
+        register.generator("spectator:test_thumbnail", LowQualityThumbnail)
+        self.addCleanup(generator_registry.unregister, "spectator:test_thumbnail")
+        file = ImageCacheFile(
+            generator_registry.get(
+                "spectator:test_thumbnail", source=self.pub.thumbnail
+            )
+        )
+        file.generate(force=True)
+        self.assertNotIn(file.name, self.used)
+
+        output = self.call_command("--min-age", "0")
+        self.assertIn("Deleted 2 of 5 files", output)
+        self.assert_exist([file.name])
+
+    def test_dry_run(self):
+        output = self.call_command("--min-age", "0", "--dry-run", "--verbosity", "2")
+        self.assertIn("Would delete 2 of 4 files", output)
+        self.assertIn(f"  {self.unused_upload} (100 bytes)", output)
+        self.assert_exist([self.unused_upload, self.unused_cache])
+
+    def test_min_age(self):
+        "It shouldn't delete files that were modified recently."
+        output = self.call_command()
+        self.assertIn("Deleted 0 of 4 files", output)
+        self.assert_exist([self.unused_upload, self.unused_cache])
+
+    def test_batches(self):
+        output = self.call_command("--min-age", "0", "--batch-size", "1")
+        self.assertIn("Deleted 2 of 4 files", output)
+
+    @override_app_settings(THUMBNAIL_MANIFEST=True)
+    def test_manifest(self):
+        "Deleted files should be removed from the manifest."
+        record_generated(self.pub.thumbnail.name, [self.unused_cache])
+        self.call_command("--min-age", "0")
+        self.assertEqual(get_generated_names(self.pub.thumbnail.name), set())
+
+    def test_invalid_workers(self):
+        with self.assertRaises(CommandError):
+            self.call_command("--workers", "0")
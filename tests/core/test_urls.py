@@ -16,6 +16,13 @@ class CoreUrlsTestCase(TestCase):
         "Should use the correct view."
         self.assertEqual(resolve("/").func.view_class, views.HomeView)
 
+    def test_search_url(self):
+        self.assertEqual(reverse("spectator:core:search"), "/search/")
+
+    def test_search_view(self):
+        "Should use the correct view."
+        self.assertEqual(resolve("/search/").func.view_class, views.SearchView)
+
     def test_creator_list_url(self):
         self.assertEqual(reverse("spectator:creators:creator_list"), "/creators/")
 
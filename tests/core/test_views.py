@@ -127,3 +127,52 @@ class CreatorDetailViewTestCase(ViewTestCase):
         self.assertEqual(
             response.template_name[0], "spectator_core/creator_detail.html"
         )
+
+
+class SearchViewTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.creator = IndividualCreatorFactory(name="Douglas Adams")
+
+    def get_response(self, query):
+        request = self.factory.get("/fake-path/", {"q": query})
+        return views.SearchView.as_view()(request)
+
+    def test_response_200(self):
+        "It should respond with 200."
+        response = views.SearchView.as_view()(self.request)
+        self.assertEqual(response.status_code, 200)
+
+    def test_templates(self):
+        response = views.SearchView.as_view()(self.request)
+        self.assertEqual(response.template_name[0], "spectator_core/search.html")
+
+    def test_context_query(self):
+        response = self.get_response(" adams ")
+        self.assertEqual(response.context_data["query"], "adams")
+
+    def test_context_results(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            IndividualCreatorFactory(name="Bob")
+        response = self.get_response("adams")
+        results = response.context_data["result_list"]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].object, self.creator)
+
+    def test_context_no_query(self):
+        response = views.SearchView.as_view()(self.request)
+        self.assertEqual(len(response.context_data["result_list"]), 0)
+
+    def test_paginated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in range(25):
+                IndividualCreatorFactory(name=f"Adams {n}")
+        response = self.get_response("adams")
+        self.assertEqual(response.context_data["paginator"].count, 26)
+        self.assertEqual(len(response.context_data["result_list"]), 20)
+
+    def test_renders(self):
+        response = self.get_response("adams")
+        response.render()
+        self.assertContains(response, self.creator.get_absolute_url())
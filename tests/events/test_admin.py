@@ -0,0 +1,87 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from spectator.core.factories import IndividualCreatorFactory
+from spectator.events.admin import CountryListFilter, VenueAdmin
+from spectator.events.factories import (
+    EventRoleFactory,
+    GigEventFactory,
+    MovieFactory,
+    VenueFactory,
+    WorkSelectionFactory,
+)
+from spectator.events.models import Venue
+from tests.core.test_admin import AdminTestCase
+
+
+class EventAdminTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="test"
+        )
+        self.client.force_login(self.user)
+
+    def make_events(self, num):
+        for _ in range(num):
+            event = GigEventFactory(title="")
+            EventRoleFactory(event=event, creator=IndividualCreatorFactory())
+            WorkSelectionFactory(event=event, work=MovieFactory())
+
+    def count_changelist_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("admin:spectator_events_event_changelist")
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_changelist_num_queries(self):
+        "The number of queries shouldn't depend on the number of Events."
+        self.make_events(2)
+        num_queries = self.count_changelist_queries()
+        self.make_events(3)
+        self.assertEqual(self.count_changelist_queries(), num_queries)
+
+    def test_changelist_titles(self):
+        "Events' titles should be made from their prefetched Works."
+        event = GigEventFactory(title="")
+        WorkSelectionFactory(event=event, work=MovieFactory(title="Jaws"))
+        response = self.client.get(reverse("admin:spectator_events_event_changelist"))
+        self.assertContains(response, "Jaws")
+
+
+class CountryListFilterTestCase(AdminTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        VenueFactory(country="GB")
+        VenueFactory(country="AU")
+        VenueFactory(country="")
+
+    def get_lookups(self):
+        request = RequestFactory().get("/")
+        list_filter = CountryListFilter(
+            request, {}, Venue, VenueAdmin(Venue, self.site)
+        )
+        return list_filter.lookups(request, VenueAdmin(Venue, self.site))
+
+    def test_lookups(self):
+        self.assertEqual(self.get_lookups(), [("AU", "Australia"), ("GB", "UK")])
+
+    def test_lookups_cached(self):
+        self.get_lookups()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_lookups(), [("AU", "Australia"), ("GB", "UK")])
+
+    def test_lookups_updated(self):
+        "Changing a Venue should mean the cached countries aren't used."
+        self.get_lookups()
+        VenueFactory(country="FR")
+        self.assertEqual(
+            self.get_lookups(),
+            [("AU", "Australia"), ("FR", "France"), ("GB", "UK")],
+        )
@@ -0,0 +1,210 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from spectator.core.factories import IndividualCreatorFactory
+from spectator.events.factories import (
+    CinemaEventFactory,
+    GigEventFactory,
+    MovieFactory,
+    PlayFactory,
+    TheatreEventFactory,
+    WorkRoleFactory,
+    WorkSelectionFactory,
+)
+from tests import make_date
+
+
+class GenerateLetterboxdExportTestCase(TestCase):
+    def setUp(self):
+        self.movie1 = MovieFactory(title="Movie 1", year=1999, imdb_id="tt0000001")
+        self.movie2 = MovieFactory(title="Movie, 2", year=2001, imdb_id="tt0000002")
+        WorkRoleFactory(
+            work=self.movie1,
+            creator=IndividualCreatorFactory(name="Ann Director"),
+            role_name="Director",
+            role_order=1,
+        )
+        WorkRoleFactory(
+            work=self.movie1,
+            creator=IndividualCreatorFactory(name="Bob Director"),
+            role_name="director",
+            role_order=2,
+        )
+        WorkRoleFactory(work=self.movie1, role_name="Actor")
+
+        self.add_viewing("2020-01-01", self.movie1)
+        # A double bill:
+        event = self.add_viewing("2020-02-01", self.movie2)
+        WorkSelectionFactory(event=event, work=self.movie1, order=2)
+        self.add_viewing("2020-03-01", self.movie2)
+
+        # Not movies:
+        WorkSelectionFactory(
+            event=TheatreEventFactory(date=make_date("2020-01-15")),
+            work=PlayFactory(),
+        )
+
+    def add_viewing(self, date_string, movie):
+        event = CinemaEventFactory(date=make_date(date_string))
+        WorkSelectionFactory(event=event, work=movie, order=1)
+        return event
+
+    def call_command(self, *args):
+        out = StringIO()
+        err = StringIO()
+        call_command(
+            "generate_letterboxd_export", "--output", "-", *args, stdout=out, stderr=err
+        )
+        return list(csv.DictReader(StringIO(out.getvalue()))), err.getvalue()
+
+    def test_rows(self):
+        rows, _ = self.call_command()
+        self.assertEqual(
+            rows[0],
+            {
+                "imdbID": "tt0000001",
+                "Title": "Movie 1",
+                "Year": "1999",
+                "Directors": "Ann Director, Bob Director",
+                "WatchedDate": "2020-01-01",
+                "Rewatch": "false",
+            },
+        )
+        self.assertEqual(
+            [(r["Title"], r["WatchedDate"], r["Rewatch"]) for r in rows],
+            [
+                ("Movie 1", "2020-01-01", "false"),
+                ("Movie, 2", "2020-02-01", "false"),
+                ("Movie 1", "2020-02-01", "true"),
+                ("Movie, 2", "2020-03-01", "true"),
+            ],
+        )
+        self.assertEqual(rows[1]["Directors"], "")
+
+    def test_queries(self):
+        "It shouldn't make more queries for more events."
+        with self.assertNumQueries(2):
+            self.call_command()
+        with self.assertNumQueries(3):
+            self.call_command("--since", "2020-02-01")
+
+    def test_since(self):
+        rows, _ = self.call_command("--since", "2020-02-01")
+        self.assertEqual(
+            [(r["Title"], r["WatchedDate"], r["Rewatch"]) for r in rows],
+            [
+                ("Movie, 2", "2020-02-01", "false"),
+                ("Movie 1", "2020-02-01", "true"),
+                ("Movie, 2", "2020-03-01", "true"),
+            ],
+        )
+
+    def test_invalid_since(self):
+        with self.assertRaises(CommandError):
+            self.call_command("--since", "yesterday")
+
+    def test_stdout_message(self):
+        "When writing CSV to stdout, the message should go to stderr."
+        _, err = self.call_command()
+        self.assertIn("Wrote 4 movies to stdout", err)
+
+    def test_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "movies.csv")
+            out = StringIO()
+            call_command("generate_letterboxd_export", "--output", path, stdout=out)
+
+            self.assertIn(f"Wrote 4 movies to {path}", out.getvalue())
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 4)
+            self.assertEqual(rows[1]["Title"], "Movie, 2")
+
+    def test_no_movies(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "movies.csv")
+            with self.assertRaises(CommandError):
+                call_command(
+                    "generate_letterboxd_export",
+                    "--output",
+                    path,
+                    "--since",
+                    "2021-01-01",
+                    stdout=StringIO(),
+                )
+            # It shouldn't have created an empty file:
+            self.assertFalse(os.path.exists(path))
+
+
+class GenerateCalendarExportTestCase(TestCase):
+    def setUp(self):
+        GigEventFactory(title="Gig 1", date=make_date("2017-02-15"))
+        GigEventFactory(title="Gig 2", date=make_date("2018-02-15"))
+        CinemaEventFactory(title="Film", date=make_date("2017-03-01"))
+
+    def test_stdout(self):
+        out = StringIO()
+        err = StringIO()
+        call_command(
+            "generate_calendar_export",
+            "--output",
+            "-",
+            "--kind",
+            "gig",
+            "--base-url",
+            "https://example.com",
+            stdout=out,
+            stderr=err,
+        )
+        self.assertEqual(out.getvalue().count("BEGIN:VEVENT"), 2)
+        self.assertIn("URL:https://example.com/events/", out.getvalue())
+        self.assertIn("Wrote 2 events to stdout", err.getvalue())
+
+    def test_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.ics")
+            out = StringIO()
+            call_command(
+                "generate_calendar_export",
+                "--output",
+                path,
+                "--year",
+                "2017",
+                stdout=out,
+            )
+
+            self.assertIn(f"Wrote 2 events to {path}", out.getvalue())
+            with open(path, "rb") as f:
+                content = f.read()
+            self.assertTrue(content.startswith(b"BEGIN:VCALENDAR\r\n"))
+            self.assertIn(b"SUMMARY:Film\r\n", content)
+
+    def test_invalid(self):
+        with self.assertRaisesRegex(CommandError, "Unknown event kind"):
+            call_command("generate_calendar_export", "--kind", "party")
+
+    def test_invalid_batch_size(self):
+        with (
+            self.assertNumQueries(0),
+            self.assertRaisesRegex(CommandError, "--batch-size must be 1 or more"),
+        ):
+            call_command("generate_calendar_export", "--batch-size", "0")
+
+    def test_no_events(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.ics")
+            with self.assertRaisesRegex(CommandError, "No events"):
+                call_command(
+                    "generate_calendar_export",
+                    "--output",
+                    path,
+                    "--year",
+                    "2000",
+                    stdout=StringIO(),
+                )
+            self.assertFalse(os.path.exists(path))
@@ -0,0 +1,132 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from spectator.core.factories import GroupCreatorFactory
+from spectator.events.factories import (
+    CinemaEventFactory,
+    EventRoleFactory,
+    GigEventFactory,
+    MovieFactory,
+    WorkSelectionFactory,
+)
+from tests import make_date
+
+
+class RecentEventsFeedTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.gig = GigEventFactory(
+            title="", date=make_date("2017-02-15"), venue__name="The Hall"
+        )
+        EventRoleFactory(event=self.gig, creator=GroupCreatorFactory(name="Band"))
+        self.cinema = CinemaEventFactory(title="", date=make_date("2017-02-16"))
+        WorkSelectionFactory(event=self.cinema, work=MovieFactory(title="Cléo"))
+
+    def test_feed(self):
+        response = self.client.get(reverse("spectator:events:feed"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/rss+xml; charset=utf-8")
+        content = response.content.decode()
+        self.assertIn("<title>Recent Events</title>", content)
+        # Most recent first:
+        self.assertLess(content.index("<title>Cléo</title>"), content.index("Band"))
+        self.assertIn("Gig on 15 Feb 2017 at The Hall", content)
+
+    def test_kind_feed(self):
+        url = reverse("spectator:events:event_list_feed", kwargs={"kind_slug": "gigs"})
+        response = self.client.get(url)
+        content = response.content.decode()
+        self.assertIn("<title>Recent Gigs</title>", content)
+        self.assertIn("<title>Band</title>", content)
+        self.assertNotIn("Cléo", content)
+
+    def test_atom_feed(self):
+        response = self.client.get(reverse("spectator:events:feed_atom"))
+        self.assertEqual(
+            response["Content-Type"], "application/atom+xml; charset=utf-8"
+        )
+        self.assertIn("<subtitle>Recent Events</subtitle>", response.content.decode())
+
+    def test_queries(self):
+        "Items' titles shouldn't need a query each."
+        GigEventFactory.create_batch(5)
+        # The version, the Events, and their EventRoles, Creators,
+        # WorkSelections and Works:
+        with self.assertNumQueries(6):
+            self.client.get(reverse("spectator:events:feed"))
+
+    def test_cached(self):
+        "The cached XML is used, until an Event changes."
+        url = reverse("spectator:events:feed")
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertIn("Cléo", response.content.decode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cinema.title = "New title"
+            self.cinema.save()
+        self.assertIn("New title", self.client.get(url).content.decode())
+
+    def test_cached_work_changed(self):
+        "Changing the title of a Work should change the feed."
+        url = reverse("spectator:events:feed")
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            work = self.cinema.work_selections.get().work
+            work.title = "Vagabond"
+            work.save()
+        self.assertIn("Vagabond", self.client.get(url).content.decode())
+
+    def test_conditional(self):
+        url = reverse("spectator:events:feed")
+        response = self.client.get(url)
+        self.assertEqual(response["Last-Modified"][-3:], "GMT")
+
+        response = self.client.get(url, headers={"if-none-match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get(
+            url,
+            headers={"if-modified-since": self.client.get(url)["Last-Modified"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_last_modified_related_changed(self):
+        "Changing a Work, but not its Events, should change Last-Modified."
+        url = reverse("spectator:events:feed")
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        later = time.time_ns() + 10_000_000_000
+        with (
+            mock.patch("spectator.core.search.time.time_ns", return_value=later),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            work = self.cinema.work_selections.get().work
+            work.title = "Vagabond"
+            work.save()
+
+        response = self.client.get(url, headers={"if-modified-since": last_modified})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Vagabond", response.content.decode())
+        self.assertEqual(response["Last-Modified"], http_date(later // 1_000_000_000))
+
+    def test_etag_changes(self):
+        url = reverse("spectator:events:feed")
+        etag = self.client.get(url)["ETag"]
+        GigEventFactory()
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_empty(self):
+        url = reverse("spectator:events:event_list_feed", kwargs={"kind_slug": "dance"})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Last-Modified", response)
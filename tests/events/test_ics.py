@@ -0,0 +1,202 @@
+from datetime import datetime, timezone
+
+import time_machine
+from django.test import TestCase
+from django.urls import reverse
+
+from spectator.core.factories import GroupCreatorFactory
+from spectator.events import ics
+from spectator.events.factories import (
+    CinemaEventFactory,
+    EventRoleFactory,
+    GigEventFactory,
+    MovieFactory,
+    VenueFactory,
+    WorkSelectionFactory,
+)
+from spectator.events.models import Event
+from tests import make_date
+
+
+class FormatTestCase(TestCase):
+    def test_escape_text(self):
+        self.assertEqual(ics.escape_text("A, B; C\\D\nE"), r"A\, B\; C\\D\nE")
+
+    def test_fold_line_short(self):
+        self.assertEqual(ics.fold_line("SUMMARY:Hello"), "SUMMARY:Hello\r\n")
+
+    def test_fold_line_long(self):
+        folded = ics.fold_line("SUMMARY:" + "é" * 100)
+        lines = folded.split("\r\n")[:-1]
+        self.assertEqual(len(lines), 3)
+        for line in lines:
+            self.assertLessEqual(len(line.encode("utf-8")), 75)
+        for line in lines[1:]:
+            self.assertTrue(line.startswith(" "))
+        self.assertEqual(
+            "".join(line.removeprefix(" ") for line in lines), "SUMMARY:" + "é" * 100
+        )
+
+
+class GetFiltersTestCase(TestCase):
+    def test_filters(self):
+        venue = VenueFactory()
+        self.assertEqual(
+            ics.get_filters(kind="gigs", venue=venue.slug, year="2017"),
+            {"kind": "gig", "venue": venue, "year": 2017},
+        )
+        self.assertEqual(ics.get_filters(kind="gig"), {"kind": "gig"})
+        self.assertEqual(ics.get_filters(kind="", venue=None), {})
+
+    def test_invalid(self):
+        for kwargs, message in (
+            ({"kind": "parties"}, "Unknown event kind"),
+            ({"venue": "nope"}, "Unknown venue"),
+            ({"year": "17"}, "Invalid year"),
+            ({"year": "２０１７"}, "Invalid year"),
+        ):
+            with (
+                self.subTest(kwargs=kwargs),
+                self.assertRaisesRegex(ValueError, message),
+            ):
+                ics.get_filters(**kwargs)
+
+    def test_calendar_name(self):
+        venue = VenueFactory(name="The Hall")
+        self.assertEqual(ics.get_calendar_name(), "Events")
+        self.assertEqual(
+            ics.get_calendar_name(kind="gig", venue=venue, year=2017),
+            "Gigs at The Hall in 2017",
+        )
+
+
+class GenerateCalendarTestCase(TestCase):
+    def setUp(self):
+        self.venue = VenueFactory(
+            name="The Hall",
+            address="1 High Street, London",
+            country="GB",
+            latitude="51.5",
+            longitude="-0.1",
+        )
+        self.gig = GigEventFactory(
+            title="", date=make_date("2017-02-15"), venue=self.venue
+        )
+        EventRoleFactory(event=self.gig, creator=GroupCreatorFactory(name="Band"))
+        self.cinema = CinemaEventFactory(
+            title="", date=make_date("2017-01-10"), venue=None
+        )
+        WorkSelectionFactory(event=self.cinema, work=MovieFactory(title="Cléo"))
+
+    def generate(self, **kwargs):
+        return "".join(ics.generate_calendar(ics.get_events(), **kwargs))
+
+    def test_calendar(self):
+        calendar = self.generate(name="My Events")
+        self.assertTrue(calendar.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"))
+        self.assertTrue(calendar.endswith("END:VCALENDAR\r\n"))
+        self.assertIn("X-WR-CALNAME:My Events\r\n", calendar)
+        self.assertEqual(calendar.count("BEGIN:VEVENT"), 2)
+        # In date order:
+        self.assertLess(calendar.index("Cléo"), calendar.index("Band"))
+
+    def test_vevent(self):
+        calendar = self.generate(base_url="https://example.com/")
+        self.assertIn(f"UID:spectator-event-{self.gig.pk}@example.com\r\n", calendar)
+        self.assertIn("DTSTART;VALUE=DATE:20170215\r\n", calendar)
+        self.assertIn("DTEND;VALUE=DATE:20170216\r\n", calendar)
+        self.assertIn("SUMMARY:Band\r\n", calendar)
+        self.assertIn("CATEGORIES:Gig\r\n", calendar)
+        self.assertIn(
+            "LOCATION:The Hall\\, 1 High Street\\, London\\, UK\r\n", calendar
+        )
+        self.assertIn("GEO:51.500000;-0.100000\r\n", calendar)
+        self.assertIn(
+            f"URL:https://example.com{self.gig.get_absolute_url()}\r\n", calendar
+        )
+
+    @time_machine.travel("2020-05-01 12:30:00 +0000", tick=False)
+    def test_dtstamp(self):
+        "DTSTAMP is when the calendar was made; LAST-MODIFIED is the Event's."
+        self.gig.time_modified = datetime(2018, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        Event.objects.filter(pk=self.gig.pk).update(
+            time_modified=self.gig.time_modified
+        )
+        calendar = self.generate()
+        self.assertEqual(calendar.count("DTSTAMP:20200501T123000Z\r\n"), 2)
+        self.assertIn("LAST-MODIFIED:20180102T030405Z\r\n", calendar)
+
+    def test_no_base_url(self):
+        calendar = self.generate()
+        self.assertIn(f"UID:spectator-event-{self.gig.pk}@spectator\r\n", calendar)
+        self.assertNotIn("URL:", calendar)
+
+    def test_no_venue(self):
+        calendar = self.generate()
+        vevent = calendar[: calendar.index("END:VEVENT")]
+        self.assertIn("SUMMARY:Cléo", vevent)
+        self.assertNotIn("LOCATION", vevent)
+
+    def test_no_date(self):
+        "Events without dates aren't included."
+        GigEventFactory(date=None)
+        self.assertEqual(self.generate().count("BEGIN:VEVENT"), 2)
+
+    def test_filters(self):
+        calendar = "".join(ics.generate_calendar(ics.get_events(kind="gig", year=2017)))
+        self.assertEqual(calendar.count("BEGIN:VEVENT"), 1)
+        self.assertIn("SUMMARY:Band", calendar)
+
+    def test_queries(self):
+        "The number of queries depends on the number of chunks, not Events."
+        # The Events with their Venues, then for each chunk of 2: EventRoles,
+        # Creators, WorkSelections and Works.
+        with self.assertNumQueries(5):
+            self.generate(chunk_size=2)
+
+        for event in GigEventFactory.create_batch(
+            2, date=make_date("2017-03-01"), venue=self.venue
+        ):
+            WorkSelectionFactory(event=event)
+            EventRoleFactory(event=event)
+        with self.assertNumQueries(9):
+            self.generate(chunk_size=2)
+
+
+class EventCalendarViewTestCase(TestCase):
+    def setUp(self):
+        self.venue = VenueFactory(name="The Hall")
+        GigEventFactory(title="Gig 1", date=make_date("2017-02-15"), venue=self.venue)
+        GigEventFactory(title="Gig 2", date=make_date("2018-02-15"))
+        CinemaEventFactory(title="Film", date=make_date("2017-03-01"))
+
+    def get(self, **params):
+        return self.client.get(reverse("spectator:events:calendar"), params)
+
+    def test_response(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        calendar = b"".join(response.streaming_content).decode()
+        self.assertEqual(calendar.count("BEGIN:VEVENT"), 3)
+        self.assertIn("URL:http://testserver/events/", calendar)
+        self.assertIn("@testserver\r\n", calendar)
+
+    def test_filters(self):
+        for params, titles in (
+            ({"kind": "gigs"}, ["Gig 1", "Gig 2"]),
+            ({"venue": self.venue.slug}, ["Gig 1"]),
+            ({"year": "2017"}, ["Gig 1", "Film"]),
+            ({"kind": "gigs", "year": "2018"}, ["Gig 2"]),
+        ):
+            with self.subTest(params=params):
+                calendar = b"".join(self.get(**params).streaming_content).decode()
+                self.assertEqual(calendar.count("BEGIN:VEVENT"), len(titles))
+                for title in titles:
+                    self.assertIn(f"SUMMARY:{title}\r\n", calendar)
+
+    def test_response_404(self):
+        for params in ({"kind": "nope"}, {"venue": "nope"}, {"year": "nope"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.get(**params).status_code, 404)
@@ -0,0 +1,155 @@
+from io import StringIO
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from spectator.core.factories import GroupCreatorFactory, IndividualCreatorFactory
+from spectator.core.imports import ImportRowError, read_rows
+from spectator.core.models import Creator, SearchEntry
+from spectator.events.factories import MovieFactory, VenueFactory
+from spectator.events.imports import import_events
+from spectator.events.models import Event, Venue, Work
+from tests import make_date
+
+
+class ImportEventsTestCase(TestCase):
+    def test_creates_everything(self):
+        counts = import_events(
+            [
+                {
+                    "date": "2017-02-15",
+                    "kind": "theatre",
+                    "venue": "Royal Court",
+                    "works": "Top Girls",
+                    "creators": "Caryl Churchill (Writer); Max Stafford-Clark",
+                    "note": "Good.",
+                }
+            ]
+        )
+
+        self.assertEqual(counts, {"creators": 2, "venues": 1, "works": 1, "events": 1})
+        event = Event.objects.get()
+        self.assertEqual(event.date, make_date("2017-02-15"))
+        self.assertEqual(event.kind_slug, "theatre")
+        self.assertEqual(event.date_month, 2)
+        self.assertEqual(event.venue_name, "Royal Court")
+        self.assertEqual(event.note, "Good.")
+        self.assertEqual(event.title_sort, "top girls")
+        self.assertNotEqual(event.slug, "")
+        self.assertEqual(event.work_selections.get().work.kind, Work.Kind.PLAY)
+
+        roles = list(event.roles.order_by("role_order"))
+        self.assertEqual(roles[0].creator.name, "Caryl Churchill")
+        self.assertEqual(roles[0].role_name, "Writer")
+        self.assertEqual(roles[1].role_name, "")
+
+    def test_title_sort_from_creators(self):
+        import_events([{"date": "2017-02-15", "kind": "gig", "creators": "The Band"}])
+        self.assertEqual(Event.objects.get().title_sort, "band, the")
+
+    def test_reuses_existing_group_from_csv(self):
+        "CSV rows can't give a creator's kind, but existing groups are found."
+        band = GroupCreatorFactory(name="The Long Blondes")
+        rows = read_rows(
+            StringIO("date,kind,creators\n2020-01-02,gig,The Long Blondes\n"), "csv"
+        )
+
+        counts = import_events(rows)
+
+        self.assertEqual(counts["creators"], 0)
+        self.assertEqual(Creator.objects.get(), band)
+        self.assertEqual(Event.objects.get().roles.get().creator, band)
+
+    def test_reuses_existing_individual_given_as_group(self):
+        person = IndividualCreatorFactory(name="Agnès Varda")
+        import_events(
+            [
+                {
+                    "date": "2017-02-15",
+                    "kind": "cinema",
+                    "creators": [{"name": "Agnès Varda", "kind": "group"}],
+                }
+            ]
+        )
+        self.assertEqual(Creator.objects.get(), person)
+
+    def test_reuses_existing(self):
+        creator = IndividualCreatorFactory(name="Agnès Varda")
+        venue = VenueFactory(name="The Cinema")
+        movie = MovieFactory(title="Cléo from 5 to 7")
+
+        counts = import_events(
+            [
+                {
+                    "date": "2017-02-15",
+                    "kind": "cinema",
+                    "venue": "The Cinema",
+                    "works": [{"title": "Cléo from 5 to 7"}],
+                    "creators": [{"name": "Agnès Varda", "role": "Guest"}],
+                },
+                {
+                    "date": "2017-02-16",
+                    "kind": "cinema",
+                    "venue": "The Cinema",
+                    "works": "Cléo from 5 to 7",
+                },
+            ]
+        )
+
+        self.assertEqual(counts, {"creators": 0, "venues": 0, "works": 0, "events": 2})
+        self.assertEqual(Creator.objects.get(), creator)
+        self.assertEqual(Venue.objects.get(), venue)
+        self.assertEqual(Work.objects.get(), movie)
+
+    def test_search_index(self):
+        import_events(
+            [{"date": "2017-02-15", "kind": "gig", "venue": "Hall", "title": "Gig"}]
+        )
+        self.assertEqual(
+            set(SearchEntry.objects.values_list("object_type", "title")),
+            {("spectator_events.event", "Gig"), ("spectator_events.venue", "Hall")},
+        )
+
+    def test_invalid(self):
+        "Invalid rows should raise an error, and nothing should be created."
+        rows = [
+            {"date": "2017-02-15", "kind": "gig", "venue": "Hall"},
+            {"date": "2017-02-15", "kind": "comedy", "works": "A Set"},
+        ]
+        with self.assertRaisesRegex(ImportRowError, "Row 2: Unknown or missing work"):
+            import_events(rows)
+        self.assertFalse(Venue.objects.exists())
+
+        for row, message in (
+            ({"date": "2017-02", "kind": "gig"}, "must be YYYY-MM-DD"),
+            ({"date": "", "kind": "gig"}, "A date is required"),
+            ({"date": "2017-02-15", "kind": ""}, "Unknown event kind"),
+        ):
+            with self.subTest(row=row), self.assertRaisesRegex(ImportRowError, message):
+                import_events([row])
+
+    def test_queries(self):
+        "The number of queries shouldn't depend on the number of rows."
+
+        def make_rows(count):
+            return [
+                {
+                    "date": "2017-02-15",
+                    "kind": "cinema",
+                    "venue": f"Venue {i}",
+                    "works": f"Movie {i}",
+                    "creators": f"Creator {i} (Director)",
+                }
+                for i in range(count)
+            ]
+
+        with CaptureQueriesContext(connection) as queries:
+            import_events(make_rows(2))
+        few = len(queries)
+
+        for model in (Event, Venue, Work, Creator):
+            model.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            import_events(make_rows(20))
+        self.assertEqual(len(queries), few)
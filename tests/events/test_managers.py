@@ -13,7 +13,24 @@ from spectator.events.factories import (
     VenueFactory,
     WorkSelectionFactory,
 )
-from spectator.events.models import Venue, Work
+from spectator.events.models import Event, Venue, Work
+from tests import make_date
+
+
+class EventManagerOnThisDayTestCase(TestCase):
+    """
+    Testing the EventManager.on_this_day() method.
+    """
+
+    def test_events(self):
+        event_2015 = GigEventFactory(date=make_date("2015-02-10"))
+        event_2017 = CinemaEventFactory(date=make_date("2017-02-10"))
+        GigEventFactory(date=make_date("2017-02-11"))
+        GigEventFactory(date=make_date("2017-03-10"))
+
+        events = Event.objects.on_this_day(2, 10)
+
+        self.assertEqual(list(events), [event_2017, event_2015])
 
 
 class VenueManagerByVisitsTestCase(TestCase):
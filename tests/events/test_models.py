@@ -24,7 +24,14 @@ from spectator.events.factories import (
     WorkRoleFactory,
     WorkSelectionFactory,
 )
-from spectator.events.models import Event, Venue, Work
+from spectator.events.models import (
+    Event,
+    EventFact,
+    EventParticipation,
+    Venue,
+    VenueVisitSummary,
+    Work,
+)
 from tests import make_date
 
 
@@ -231,6 +238,21 @@ class EventTestCase(TestCase):
             ),
         )
 
+    def test_date_month_day(self):
+        "Should be set on save."
+        event = GigEventFactory(date=make_date("2017-02-15"))
+        self.assertEqual(event.date_month, 2)
+        self.assertEqual(event.date_day, 15)
+
+    def test_date_month_day_update_fields(self):
+        "Should be saved if date is in update_fields."
+        event = GigEventFactory(date=make_date("2017-02-15"))
+        event.date = make_date("2018-03-20")
+        event.save(update_fields=["date"])
+        event.refresh_from_db()
+        self.assertEqual(event.date_month, 3)
+        self.assertEqual(event.date_day, 20)
+
     def test_kind_slug(self):
         "Should be set on save."
         self.assertEqual(ComedyEventFactory().kind_slug, "comedy")
@@ -762,3 +784,86 @@ class VenueTestCase(TestCase):
 
     def test_get_country_name(self):
         self.assertEqual(Venue.get_country_name("CH"), "Switzerland")
+
+
+class ReportModelsTestCase(TestCase):
+    "The unmanaged models of the reporting views."
+
+    def setUp(self):
+        self.venue = VenueFactory(name="The Venue", country="GB")
+        self.creator = IndividualCreatorFactory()
+        play = PlayFactory()
+        WorkRoleFactory(work=play, creator=self.creator, role_name="Writer")
+
+        self.event = TheatreEventFactory(venue=self.venue, date=make_date("2017-02-15"))
+        WorkSelectionFactory(event=self.event, work=play)
+        EventRoleFactory(event=self.event, creator=self.creator, role_name="Actor")
+        EventRoleFactory(event=self.event)
+
+        TheatreEventFactory(venue=self.venue, date=make_date("2018-03-01"))
+        self.no_venue = GigEventFactory(venue=None)
+
+    def test_event_fact(self):
+        fact = EventFact.objects.select_related("event").get(event=self.event)
+        self.assertEqual(fact.event, self.event)
+        self.assertEqual(fact.kind, "theatre")
+        self.assertEqual(fact.date, make_date("2017-02-15"))
+        self.assertEqual(fact.venue_id, self.venue.pk)
+        self.assertEqual(fact.venue_name, "The Venue")
+        self.assertEqual(fact.venue_country, "GB")
+        self.assertEqual(fact.work_count, 1)
+        self.assertEqual(fact.creator_count, 2)
+
+        fact = EventFact.objects.get(event=self.no_venue)
+        self.assertEqual(fact.title, self.no_venue.title)
+        self.assertIsNone(fact.venue_id)
+        self.assertEqual(fact.venue_country, "")
+        self.assertEqual(fact.work_count, 0)
+
+    def test_event_fact_title(self):
+        "Events without titles should have their Works' titles, or Creators' names."
+        event = ConcertEventFactory(title="")
+        WorkSelectionFactory(
+            event=event, work=ClassicalWorkFactory(title="Work B"), order=2
+        )
+        WorkSelectionFactory(
+            event=event, work=ClassicalWorkFactory(title="Work A"), order=1
+        )
+        self.assertEqual(EventFact.objects.get(event=event).title, "Work A, Work B")
+
+        event = GigEventFactory(title="")
+        EventRoleFactory(
+            event=event, creator=IndividualCreatorFactory(name="Bob"), role_order=2
+        )
+        EventRoleFactory(
+            event=event, creator=IndividualCreatorFactory(name="Alice"), role_order=1
+        )
+        self.assertEqual(EventFact.objects.get(event=event).title, "Alice, Bob")
+
+        event = GigEventFactory(title="")
+        self.assertEqual(EventFact.objects.get(event=event).title, "")
+
+    def test_event_participation(self):
+        "A Creator with roles at an Event and in its Work only has one row."
+        rows = EventParticipation.objects.filter(creator=self.creator)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].event_id, self.event.pk)
+        self.assertEqual(rows[0].event_kind, "theatre")
+        self.assertEqual(rows[0].venue_id, self.venue.pk)
+        self.assertEqual(rows[0].event_roles, 1)
+        self.assertEqual(rows[0].work_roles, 1)
+        self.assertEqual(EventParticipation.objects.filter(event=self.event).count(), 2)
+
+    def test_venue_visit_summary(self):
+        summary = VenueVisitSummary.objects.get()
+        self.assertEqual(summary.venue_id, self.venue.pk)
+        self.assertEqual(summary.name, "The Venue")
+        self.assertEqual(summary.event_count, 2)
+        self.assertEqual(summary.first_date, make_date("2017-02-15"))
+        self.assertEqual(summary.last_date, make_date("2018-03-01"))
+
+    def test_deleting(self):
+        "Deleting objects shouldn't try to delete from the views."
+        self.event.delete()
+        self.venue.delete()
+        self.assertFalse(VenueVisitSummary.objects.exists())
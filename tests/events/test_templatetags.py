@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
-from django.test import TestCase
+import time_machine
+from django.test import TestCase, override_settings
 
 from spectator.core.factories import IndividualCreatorFactory
 from spectator.events.factories import (
@@ -28,6 +29,8 @@ from spectator.events.templatetags.spectator_events import (
     most_seen_creators_card,
     most_seen_works,
     most_seen_works_card,
+    on_this_day_events,
+    on_this_day_events_card,
     recent_events,
     recent_events_card,
 )
@@ -135,6 +138,46 @@ class DayEventsCardTestCase(TestCase):
         self.assertEqual(len(result["event_list"]), 2)
 
 
+class OnThisDayEventsTestCase(TestCase):
+    def test_queryset(self):
+        "It should only include Events in previous years."
+        event_2015 = GigEventFactory(date=make_date("2015-02-10"))
+        event_2016 = CinemaEventFactory(date=make_date("2016-02-10"))
+        GigEventFactory(date=make_date("2016-02-11"))
+        GigEventFactory(date=make_date("2017-02-10"))
+        qs = on_this_day_events(make_date("2017-02-10"))
+        self.assertEqual(list(qs), [event_2016, event_2015])
+
+    @time_machine.travel("2017-02-10 12:00:00", tick=False)
+    def test_default_date(self):
+        "It should default to today."
+        event = GigEventFactory(date=make_date("2015-02-10"))
+        GigEventFactory(date=make_date("2015-02-11"))
+        self.assertEqual(list(on_this_day_events()), [event])
+
+    @time_machine.travel("2017-02-09 20:00:00 +0000", tick=False)
+    @override_settings(TIME_ZONE="Pacific/Auckland")
+    def test_default_date_local(self):
+        "It should default to today in the current time zone, not UTC."
+        event = GigEventFactory(date=date(2015, 2, 10))
+        GigEventFactory(date=date(2015, 2, 9))
+        self.assertEqual(list(on_this_day_events()), [event])
+
+    def test_num(self):
+        for year in range(2010, 2017):
+            GigEventFactory(date=make_date(f"{year}-02-10"))
+        qs = on_this_day_events(make_date("2017-02-10"), num=3)
+        self.assertEqual(len(qs), 3)
+
+
+class OnThisDayEventsCardTestCase(TestCase):
+    def test_result(self):
+        GigEventFactory(date=make_date("2015-02-10"))
+        result = on_this_day_events_card(make_date("2017-02-10"))
+        self.assertEqual(result["card_title"], "On this day")
+        self.assertEqual(len(result["event_list"]), 1)
+
+
 class EventsYearsTestCase(TestCase):
     def test_result(self):
         GigEventFactory(date=make_date("2017-02-09"))
@@ -16,6 +16,17 @@ class EventsUrlsTestCase(TestCase):
         "Should use the correct view."
         self.assertEqual(resolve("/events/").func.view_class, views.EventListView)
 
+    # CALENDAR
+
+    def test_calendar_url(self):
+        self.assertEqual(reverse("spectator:events:calendar"), "/events/calendar.ics")
+
+    def test_calendar_view(self):
+        "Should use the correct view."
+        self.assertEqual(
+            resolve("/events/calendar.ics").func.view_class, views.EventCalendarView
+        )
+
     # VENUES
 
     def test_venue_list_url(self):
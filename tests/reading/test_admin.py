@@ -1,7 +1,18 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
 from spectator.core.factories import IndividualCreatorFactory
-from spectator.reading.admin import PublicationAdmin
-from spectator.reading.factories import PublicationFactory, PublicationRoleFactory
+from spectator.reading.admin import PublicationAdmin, ReadingsListFilter
+from spectator.reading.factories import (
+    PublicationFactory,
+    PublicationRoleFactory,
+    ReadingFactory,
+)
 from spectator.reading.models import Publication
+from tests import make_date
 from tests.core.test_admin import AdminTestCase
 
 
@@ -27,3 +38,65 @@ class PublicationAdminTestCase(AdminTestCase):
 
         ba = PublicationAdmin(Publication, self.site)
         self.assertEqual(ba.show_creators(pub), "-")
+
+
+class ReadingsListFilterTestCase(AdminTestCase):
+    def setUp(self):
+        super().setUp()
+        self.unread_pub = PublicationFactory()
+        self.in_progress_pub = PublicationFactory()
+        ReadingFactory(
+            publication=self.in_progress_pub, start_date=make_date("2017-02-15")
+        )
+        self.read_pub = PublicationFactory()
+        ReadingFactory(
+            publication=self.read_pub,
+            start_date=make_date("2017-02-15"),
+            end_date=make_date("2017-02-28"),
+        )
+
+    def filter_queryset(self, value):
+        request = RequestFactory().get("/", {"readings": value})
+        model_admin = PublicationAdmin(Publication, self.site)
+        list_filter = ReadingsListFilter(
+            request, dict(request.GET.lists()), Publication, model_admin
+        )
+        return list_filter.queryset(request, Publication.objects.all())
+
+    def test_in_progress(self):
+        self.assertQuerySetEqual(
+            self.filter_queryset("in-progress"), [self.in_progress_pub]
+        )
+
+    def test_unread(self):
+        self.assertQuerySetEqual(self.filter_queryset("unread"), [self.unread_pub])
+
+    def test_read(self):
+        self.assertQuerySetEqual(self.filter_queryset("read"), [self.read_pub])
+
+
+class PublicationAdminChangelistTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="test"
+        )
+        self.client.force_login(self.user)
+
+    def make_publications(self, num):
+        for _ in range(num):
+            PublicationRoleFactory(publication=PublicationFactory())
+
+    def count_changelist_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("admin:spectator_reading_publication_changelist")
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_changelist_num_queries(self):
+        "The number of queries shouldn't depend on the number of Publications."
+        self.make_publications(2)
+        num_queries = self.count_changelist_queries()
+        self.make_publications(3)
+        self.assertEqual(self.count_changelist_queries(), num_queries)
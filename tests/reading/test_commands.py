@@ -0,0 +1,149 @@
+import csv
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from spectator.core.factories import IndividualCreatorFactory
+from spectator.reading.factories import (
+    PublicationFactory,
+    PublicationRoleFactory,
+    PublicationSeriesFactory,
+    ReadingFactory,
+)
+from spectator.reading.management.commands.generate_reading_export import (
+    format_date,
+    get_isbns,
+)
+from spectator.reading.models import Reading
+from tests import make_date
+
+
+class GenerateReadingExportTestCase(TestCase):
+    def setUp(self):
+        self.pub = PublicationFactory(
+            title="Leviathan Wakes",
+            series=PublicationSeriesFactory(title="The Expanse"),
+            isbn_uk="978-1-84149-990-1",
+            isbn_us="0316129089",
+        )
+        PublicationRoleFactory(
+            publication=self.pub,
+            creator=IndividualCreatorFactory(name="Daniel Abraham"),
+            role_name="",
+            role_order=1,
+        )
+        PublicationRoleFactory(
+            publication=self.pub,
+            creator=IndividualCreatorFactory(name="Ty Franck"),
+            role_name="Author",
+            role_order=2,
+        )
+        PublicationRoleFactory(
+            publication=self.pub,
+            creator=IndividualCreatorFactory(name="An Illustrator"),
+            role_name="Illustrator",
+            role_order=3,
+        )
+        ReadingFactory(
+            publication=self.pub,
+            start_date=make_date("2020-01-15"),
+            start_granularity=Reading.DateGranularity.MONTH,
+            end_date=make_date("2020-02-10"),
+            end_granularity=Reading.DateGranularity.DAY,
+            is_finished=True,
+        )
+
+        edited = PublicationFactory(title="Anthology", series=None)
+        PublicationRoleFactory(
+            publication=edited,
+            creator=IndividualCreatorFactory(name="An Editor"),
+            role_name="Editor",
+        )
+        # Unfinished:
+        ReadingFactory(
+            publication=edited,
+            start_date=make_date("2021-03-01"),
+            end_date=make_date("2021-06-20"),
+            end_granularity=Reading.DateGranularity.YEAR,
+            is_finished=False,
+        )
+        # In progress:
+        ReadingFactory(
+            publication=edited, start_date=make_date("2022-01-01"), end_date=None
+        )
+
+    def call_command(self, *args):
+        out = StringIO()
+        err = StringIO()
+        call_command(
+            "generate_reading_export", "--output", "-", *args, stdout=out, stderr=err
+        )
+        return list(csv.DictReader(StringIO(out.getvalue()))), err.getvalue()
+
+    def test_rows(self):
+        rows, err = self.call_command()
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            rows[0],
+            {
+                "Title": "Leviathan Wakes (The Expanse)",
+                "Author": "Daniel Abraham",
+                "Additional Authors": "Ty Franck",
+                "ISBN": "0316129089",
+                "ISBN13": "9781841499901",
+                "Date Read": "2020/02/10",
+                "Date Added": "2020/01/01",
+                "Bookshelves": "",
+                "Exclusive Shelf": "read",
+            },
+        )
+        self.assertIn("Wrote 3 readings to stdout", err)
+
+    def test_unfinished(self):
+        rows, _ = self.call_command()
+        self.assertEqual(rows[1]["Title"], "Anthology")
+        # There are no authors so it uses the other roles:
+        self.assertEqual(rows[1]["Author"], "An Editor")
+        self.assertEqual(rows[1]["Date Read"], "2021/01/01")
+        self.assertEqual(rows[1]["Bookshelves"], "did-not-finish")
+        self.assertEqual(rows[1]["Exclusive Shelf"], "read")
+
+    def test_in_progress(self):
+        rows, _ = self.call_command()
+        self.assertEqual(rows[2]["Date Read"], "")
+        self.assertEqual(rows[2]["Date Added"], "2022/01/01")
+        self.assertEqual(rows[2]["Exclusive Shelf"], "currently-reading")
+
+    def test_since(self):
+        rows, _ = self.call_command("--since", "2021-01-01")
+        self.assertEqual(
+            [r["Exclusive Shelf"] for r in rows], ["read", "currently-reading"]
+        )
+
+    def test_queries(self):
+        "It shouldn't make more queries for more readings."
+        with self.assertNumQueries(2):
+            self.call_command()
+
+    def test_no_readings(self):
+        Reading.objects.all().delete()
+        with self.assertRaises(CommandError):
+            self.call_command()
+
+
+class GenerateReadingExportFunctionsTestCase(TestCase):
+    def test_format_date(self):
+        date = make_date("2020-02-10")
+        self.assertEqual(format_date(date, Reading.DateGranularity.DAY), "2020/02/10")
+        self.assertEqual(format_date(date, Reading.DateGranularity.MONTH), "2020/02/01")
+        self.assertEqual(format_date(date, Reading.DateGranularity.YEAR), "2020/01/01")
+        self.assertEqual(format_date(None, Reading.DateGranularity.DAY), "")
+
+    def test_get_isbns(self):
+        pub = PublicationFactory.build(isbn_uk="0-356-50048-9", isbn_us="")
+        self.assertEqual(get_isbns(pub), ("0356500489", ""))
+
+    def test_get_isbns_prefers_us(self):
+        pub = PublicationFactory.build(isbn_uk="0356500489", isbn_us="0316098094")
+        self.assertEqual(get_isbns(pub), ("0316098094", ""))
@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from spectator.reading.factories import (
+    PublicationFactory,
+    PublicationRoleFactory,
+    PublicationSeriesFactory,
+    ReadingFactory,
+)
+from tests import make_date
+
+
+class FinishedReadingsFeedTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.pub = PublicationFactory(
+            title="Dirk Gently", series=PublicationSeriesFactory(title="Series")
+        )
+        PublicationRoleFactory(publication=self.pub, creator__name="Douglas Adams")
+        self.reading = ReadingFactory(
+            publication=self.pub,
+            start_date=make_date("2017-02-01"),
+            end_date=make_date("2017-02-06"),
+            is_finished=True,
+        )
+        # Not included:
+        ReadingFactory(start_date=make_date("2017-03-01"), end_date=None)
+        ReadingFactory(
+            publication__title="Abandoned",
+            end_date=make_date("2017-03-01"),
+            is_finished=False,
+        )
+        ReadingFactory(
+            publication__title="Removed",
+            publication__is_removed=True,
+            end_date=make_date("2017-03-01"),
+            is_finished=True,
+        )
+
+    def test_feed(self):
+        response = self.client.get(reverse("spectator:reading:feed"))
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertEqual(content.count("<item>"), 1)
+        self.assertIn("<title>Dirk Gently (Series) by Douglas Adams</title>", content)
+        self.assertIn("Read 1–6 February 2017", content)
+        self.assertIn(f"#reading-{self.reading.pk}</guid>", content)
+
+    def test_atom_feed(self):
+        response = self.client.get(reverse("spectator:reading:feed_atom"))
+        self.assertEqual(
+            response["Content-Type"], "application/atom+xml; charset=utf-8"
+        )
+
+    def test_queries(self):
+        ReadingFactory.create_batch(5, end_date=make_date("2017-03-01"))
+        # The version, the Readings with their Publications, and their
+        # PublicationRoles and Creators:
+        with self.assertNumQueries(4):
+            self.client.get(reverse("spectator:reading:feed"))
+
+    def test_cached(self):
+        url = reverse("spectator:reading:feed")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+        # Finishing another Reading changes it:
+        with self.captureOnCommitCallbacks(execute=True):
+            ReadingFactory(
+                publication__title="Another",
+                end_date=make_date("2017-04-01"),
+                is_finished=True,
+            )
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Another", response.content.decode())
+
+    def test_cached_publication_changed(self):
+        url = reverse("spectator:reading:feed")
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pub.title = "New title"
+            self.pub.save()
+        self.assertIn("New title", self.client.get(url).content.decode())
+
+    def test_not_modified(self):
+        url = reverse("spectator:reading:feed")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,104 @@
+from django.test import TestCase
+
+from spectator.core.imports import ImportRowError
+from spectator.core.models import SearchEntry
+from spectator.reading.factories import (
+    PublicationFactory,
+    PublicationRoleFactory,
+    PublicationSeriesFactory,
+)
+from spectator.reading.imports import import_readings
+from spectator.reading.models import Publication, PublicationSeries, Reading
+from tests import make_date
+
+
+class ImportReadingsTestCase(TestCase):
+    def test_creates_everything(self):
+        counts = import_readings(
+            [
+                {
+                    "title": "Dirk Gently",
+                    "series": "Dirk Gently Series",
+                    "isbn_uk": "0330301624",
+                    "authors": "Douglas Adams; Jan Morris (Editor)",
+                    "start_date": "2017-02",
+                    "end_date": "2017-03-15",
+                },
+                {"title": "Dirk Gently", "series": "Dirk Gently Series"},
+            ]
+        )
+
+        self.assertEqual(
+            counts, {"creators": 2, "series": 1, "publications": 1, "readings": 2}
+        )
+        pub = Publication.objects.get()
+        self.assertEqual(pub.series.title, "Dirk Gently Series")
+        self.assertEqual(pub.isbn_uk, "0330301624")
+        self.assertNotEqual(pub.slug, "")
+        self.assertNotEqual(pub.series.slug, "")
+
+        roles = list(pub.roles.order_by("role_order"))
+        self.assertEqual(roles[0].creator.name, "Douglas Adams")
+        self.assertEqual(roles[1].role_name, "Editor")
+
+        reading = Reading.objects.get(end_date__isnull=False)
+        self.assertEqual(reading.start_date, make_date("2017-02-01"))
+        self.assertEqual(reading.start_granularity, Reading.DateGranularity.MONTH)
+        self.assertEqual(reading.end_date_day, 15)
+        self.assertTrue(reading.is_finished)
+
+        self.assertEqual(pub.reading_state, Publication.ReadingState.READ)
+
+    def test_reading_state(self):
+        import_readings(
+            [
+                {"title": "Unfinished", "start_date": "2017-02-15"},
+                {"title": "Unfinished", "start_date": "2017-02-10"},
+            ]
+        )
+        pub = Publication.objects.get()
+        self.assertEqual(pub.reading_state, Publication.ReadingState.IN_PROGRESS)
+        self.assertEqual(pub.current_reading.start_date, make_date("2017-02-10"))
+
+    def test_reuses_existing(self):
+        "Existing Publications are used, and their authors aren't changed."
+        series = PublicationSeriesFactory(title="The Series")
+        pub = PublicationFactory(title="The Book", series=series)
+        PublicationRoleFactory(publication=pub)
+        # A different Publication with the same title:
+        PublicationFactory(title="The Book", series=None)
+
+        counts = import_readings(
+            [{"title": "The Book", "series": "The Series", "authors": "Someone"}]
+        )
+
+        self.assertEqual(
+            counts, {"creators": 1, "series": 0, "publications": 0, "readings": 1}
+        )
+        self.assertEqual(PublicationSeries.objects.count(), 1)
+        self.assertEqual(Reading.objects.get().publication, pub)
+        self.assertEqual(pub.roles.count(), 1)
+
+    def test_search_index(self):
+        import_readings([{"title": "The Book", "authors": "Jan Morris"}])
+        self.assertEqual(
+            set(SearchEntry.objects.values_list("object_type", "title")),
+            {
+                ("spectator_core.creator", "Jan Morris"),
+                ("spectator_reading.publication", "The Book"),
+            },
+        )
+
+    def test_invalid(self):
+        for row, message in (
+            ({"title": ""}, "A title is required"),
+            ({"title": "A", "kind": "film"}, "Unknown publication kind"),
+            ({"title": "A", "is_finished": "maybe"}, "Invalid is_finished"),
+            (
+                {"title": "A", "start_date": "2017-02", "end_date": "2017-01"},
+                "before the start date",
+            ),
+        ):
+            with self.subTest(row=row), self.assertRaisesRegex(ImportRowError, message):
+                import_readings([{"title": "OK"}, row])
+        self.assertFalse(Publication.objects.exists())
@@ -7,6 +7,7 @@ from spectator.reading.factories import (
     BookFactory,
     PeriodicalFactory,
     PublicationFactory,
+    PublicationRoleFactory,
     ReadingFactory,
 )
 from spectator.reading.models import Publication, Reading
@@ -97,6 +98,82 @@ class PublicationManagersTestCase(TestCase):
         self.assertEqual(len(pubs), 3)
 
 
+class VisiblePublicationsManagerBeingReadOnDatesTestCase(TestCase):
+    "Testing the VisiblePublicationsManager.being_read_on_dates() method only"
+
+    def setUp(self):
+        self.pub_a = PublicationFactory(title="A")
+        ReadingFactory(
+            publication=self.pub_a,
+            start_date=make_date("2017-02-10"),
+            end_date=make_date("2017-02-12"),
+        )
+        self.pub_b = PublicationFactory(title="B")
+        ReadingFactory(publication=self.pub_b, start_date=make_date("2017-02-11"))
+        # Read twice, overlapping:
+        self.pub_c = PublicationFactory(title="C")
+        ReadingFactory(
+            publication=self.pub_c,
+            start_date=make_date("2017-02-01"),
+            end_date=make_date("2017-02-11"),
+        )
+        ReadingFactory(
+            publication=self.pub_c,
+            start_date=make_date("2017-02-11"),
+            end_date=make_date("2017-02-11"),
+        )
+        # Removed, so never included:
+        removed_pub = PublicationFactory(title="D", is_removed=True)
+        ReadingFactory(publication=removed_pub, start_date=make_date("2017-02-01"))
+
+    def test_dates_is_not_a_list(self):
+        with self.assertRaises(TypeError):
+            Publication.visible_objects.being_read_on_dates("oops")
+
+    def test_dates_does_not_contain_dates(self):
+        with self.assertRaises(TypeError):
+            Publication.visible_objects.being_read_on_dates(["oops"])
+
+    def test_empty_dates(self):
+        self.assertEqual(Publication.visible_objects.being_read_on_dates([]), {})
+
+    def test_publications(self):
+        dates = [
+            make_date("2017-02-13"),
+            make_date("2017-01-31"),
+            make_date("2017-02-10"),
+            make_date("2017-02-11"),
+            make_date("2017-02-12"),
+        ]
+        pubs = Publication.visible_objects.being_read_on_dates(dates)
+        self.assertEqual(
+            pubs,
+            {
+                make_date("2017-01-31"): [],
+                make_date("2017-02-10"): [self.pub_a, self.pub_c],
+                make_date("2017-02-11"): [self.pub_a, self.pub_b, self.pub_c],
+                make_date("2017-02-12"): [self.pub_a, self.pub_b],
+                make_date("2017-02-13"): [self.pub_b],
+            },
+        )
+
+    def test_same_as_being_read_on(self):
+        "It should match the single-date query for each date."
+        dates = [make_date(f"2017-02-{d:02}") for d in range(1, 15)]
+        pubs = Publication.visible_objects.being_read_on_dates(dates)
+        for d in dates:
+            self.assertEqual(
+                pubs[d], list(Publication.visible_objects.being_read_on(d))
+            )
+
+    def test_num_queries(self):
+        "One for Readings and Publications, two for roles and creators."
+        PublicationRoleFactory(publication=self.pub_a)
+        dates = [make_date(f"2017-02-{d:02}") for d in range(1, 29)]
+        with self.assertNumQueries(3):
+            Publication.visible_objects.being_read_on_dates(dates)
+
+
 @time_machine.travel("2026-07-15 12:00:00", tick=False)
 class UnreadPublicationsManagerGetCountsForDatesTestCase(TestCase):
     "Testing the UnreadPublicationsManager.get_counts_for_dates() method only"
@@ -404,3 +481,31 @@ class ReadingManagersTestCase(TestCase):
         self.assertEqual(readings[0], self.in_progress)
         self.assertEqual(readings[1], self.reading2)
         self.assertEqual(readings[2], self.reading1)
+
+
+class ReadingsManagerOnThisDayTestCase(TestCase):
+    "Testing the ReadingsManager.on_this_day() method"
+
+    def test_readings(self):
+        reading_2015 = ReadingFactory(end_date=make_date("2015-02-10"))
+        reading_2017 = ReadingFactory(end_date=make_date("2017-02-10"))
+        ReadingFactory(end_date=make_date("2017-02-11"))
+        ReadingFactory(start_date=make_date("2017-02-10"))
+        readings = Reading.objects.on_this_day(2, 10)
+        self.assertEqual(list(readings), [reading_2017, reading_2015])
+
+    def test_granularity(self):
+        "It should only include Readings whose end date is precise to a day."
+        reading = ReadingFactory(end_date=make_date("2015-02-10"))
+        ReadingFactory(
+            end_date=make_date("2016-02-10"),
+            end_granularity=Reading.DateGranularity.MONTH,
+        )
+        readings = Reading.objects.on_this_day(2, 10)
+        self.assertEqual(list(readings), [reading])
+
+    def test_objects_desc(self):
+        "It should also work with the other manager."
+        reading = ReadingFactory(end_date=make_date("2015-02-10"))
+        readings = Reading.objects_desc.on_this_day(2, 10)
+        self.assertEqual(list(readings), [reading])
@@ -1,8 +1,10 @@
 import os
+from unittest import mock
 
 import piexif
 from django.core.exceptions import ValidationError
 from django.core.files import File
+from django.core.files.storage import FileSystemStorage, default_storage
 from django.test import TestCase, override_settings
 from django.utils import timezone
 
@@ -13,7 +15,7 @@ from spectator.reading.factories import (
     PublicationSeriesFactory,
     ReadingFactory,
 )
-from spectator.reading.models import Publication
+from spectator.reading.models import Publication, ReadingFact, ReadingParticipation
 from tests import make_date
 
 
@@ -187,6 +189,72 @@ class PublicationTestCase(TestCase):
         # Tidy up:
         pub.thumbnail.delete()
 
+    def test_thumbnail_info(self):
+        "It should save the thumbnail's size and a placeholder when it's uploaded."
+        pub = PublicationFactory(
+            thumbnail__filename="tester.jpg",
+            thumbnail__width=400,
+            thumbnail__height=200,
+        )
+        pub.refresh_from_db()
+        self.assertEqual((pub.thumbnail_width, pub.thumbnail_height), (400, 200))
+        self.assertTrue(pub.thumbnail_placeholder.startswith("data:image/"))
+
+        # Tidy up:
+        pub.thumbnail.delete()
+
+    def test_thumbnail_info_cleared(self):
+        "It should remove the thumbnail's size when the thumbnail is removed."
+        pub = PublicationFactory(thumbnail__filename="tester.jpg")
+        pub.thumbnail.delete(save=False)
+        pub.save()
+        pub.refresh_from_db()
+        self.assertIsNone(pub.thumbnail_width)
+        self.assertIsNone(pub.thumbnail_height)
+        self.assertEqual(pub.thumbnail_placeholder, "")
+
+    @override_settings(
+        IMAGEKIT_DEFAULT_CACHEFILE_STRATEGY="imagekit.cachefiles.strategies.Optimistic"
+    )
+    def test_get_thumbnail_dimensions(self):
+        "It should calculate the same sizes as the generated thumbnails."
+        pub = PublicationFactory(
+            thumbnail__filename="tester_dimensions.jpg",
+            thumbnail__width=400,
+            thumbnail__height=300,
+        )
+        for spec_name in pub.thumbnail_spec_names:
+            image = getattr(pub, spec_name)
+            self.assertEqual(
+                pub.get_thumbnail_dimensions(spec_name), (image.width, image.height)
+            )
+
+        # Tidy up:
+        pub.thumbnail.delete()
+
+    def test_get_thumbnail_dimensions_unknown(self):
+        pub = PublicationFactory(thumbnail=None)
+        self.assertIsNone(pub.get_thumbnail_dimensions("list_thumbnail"))
+
+    @override_settings(
+        IMAGEKIT_DEFAULT_CACHEFILE_STRATEGY="imagekit.cachefiles.strategies.Optimistic"
+    )
+    def test_thumbnail_formats(self):
+        "It should save smaller versions of the thumbnails in other formats."
+        path = "tests/core/fixtures/images/tester_exif_gps.jpg"
+        pub = PublicationFactory(thumbnail__from_path=path)
+
+        for image_format in pub.thumbnail_formats:
+            for name in ("list_thumbnail", "detail_thumbnail_2x"):
+                jpeg = getattr(pub, name)
+                image = getattr(pub, f"{name}_{image_format}")
+                self.assertTrue(image.name.endswith(f".{image_format}"))
+                self.assertEqual((image.width, image.height), (jpeg.width, jpeg.height))
+                self.assertLess(image.size, jpeg.size)
+
+        # Tidy up:
+        pub.thumbnail.delete()
+
     def test_exif_data_removed_from_added_thumbnail(self):
         """An image with GPS EXIF data should have it stripped out with a new object.
         Testing the image when added to a brand new publication.
@@ -207,6 +275,41 @@ class PublicationTestCase(TestCase):
         # Tidy up:
         pub.thumbnail.delete()
 
+    def test_exif_data_removed_before_storing(self):
+        "A thumbnail with GPS data should only be written to storage once."
+        path = "tests/core/fixtures/images/tester_exif_gps.jpg"
+
+        with mock.patch.object(
+            FileSystemStorage,
+            "_save",
+            autospec=True,
+            side_effect=FileSystemStorage._save,
+        ) as storage_save:
+            pub = PublicationFactory(thumbnail__from_path=path)
+
+        storage_save.assert_called_once()
+        self.assertEqual(piexif.load(pub.thumbnail.path)["GPS"], {})
+
+        # Tidy up:
+        pub.thumbnail.delete()
+
+    def test_sanitize_thumbnail_exif_data(self):
+        "It should remove GPS data from a file that was stored with it."
+        path = "tests/core/fixtures/images/tester_exif_gps.jpg"
+        pub = PublicationFactory(thumbnail=None)
+        with open(path, "rb") as f:
+            pub.thumbnail.name = default_storage.save(
+                f"reading/publications/{pub.slug}/tester_exif_gps.jpg", File(f)
+            )
+        self.assertEqual(len(piexif.load(pub.thumbnail.path)["GPS"]), 15)
+
+        self.assertTrue(pub.sanitize_thumbnail_exif_data())
+        self.assertEqual(piexif.load(pub.thumbnail.path)["GPS"], {})
+        self.assertFalse(pub.sanitize_thumbnail_exif_data())
+
+        # Tidy up:
+        pub.thumbnail.delete()
+
     def test_exif_data_removed_from_updated_thumbnail(self):
         """A replacement thumbnail should have its GPS data removed.
         i.e. an image that's added to an existing publication, not a brand new one.
@@ -351,6 +454,95 @@ class PublicationTestCase(TestCase):
         )
         self.assertIsNone(p.get_current_reading())
 
+    def test_reading_state_unread(self):
+        p = PublicationFactory()
+        self.assertEqual(p.reading_state, Publication.ReadingState.UNREAD)
+        self.assertIsNone(p.current_reading)
+
+    def test_reading_state_in_progress(self):
+        "It should use the earliest-started unfinished Reading."
+        p = PublicationFactory()
+        ReadingFactory(publication=p, start_date=make_date("2017-02-20"))
+        earliest = ReadingFactory(publication=p, start_date=make_date("2017-02-15"))
+        p.refresh_from_db()
+        self.assertEqual(p.reading_state, Publication.ReadingState.IN_PROGRESS)
+        self.assertEqual(p.current_reading, earliest)
+
+    def test_reading_state_read(self):
+        p = PublicationFactory()
+        reading = ReadingFactory(publication=p, start_date=make_date("2017-02-15"))
+        reading.end_date = make_date("2017-02-28")
+        reading.save()
+        p.refresh_from_db()
+        self.assertEqual(p.reading_state, Publication.ReadingState.READ)
+        self.assertIsNone(p.current_reading)
+
+    def test_reading_state_reading_deleted(self):
+        p = PublicationFactory()
+        reading = ReadingFactory(publication=p, start_date=make_date("2017-02-15"))
+        reading.delete()
+        p.refresh_from_db()
+        self.assertEqual(p.reading_state, Publication.ReadingState.UNREAD)
+        self.assertIsNone(p.current_reading)
+
+    def test_reading_state_reading_moved(self):
+        "Both the old and new Publications should be updated."
+        p1 = PublicationFactory()
+        p2 = PublicationFactory()
+        reading = ReadingFactory(publication=p1, start_date=make_date("2017-02-15"))
+        reading.publication = p2
+        reading.save()
+        p1.refresh_from_db()
+        p2.refresh_from_db()
+        self.assertEqual(p1.reading_state, Publication.ReadingState.UNREAD)
+        self.assertEqual(p2.reading_state, Publication.ReadingState.IN_PROGRESS)
+        self.assertEqual(p2.current_reading, reading)
+
+    def test_reading_state_publication_deleted(self):
+        "Deleting a Publication with Readings shouldn't raise an error."
+        p = PublicationFactory()
+        ReadingFactory(publication=p, start_date=make_date("2017-02-15"))
+        p.delete()
+        self.assertFalse(Publication.objects.exists())
+
+    def test_update_reading_states(self):
+        "It should set the same states as update_reading_state(), in bulk."
+        unread, in_progress, read = PublicationFactory.create_batch(3)
+        ReadingFactory(publication=in_progress, start_date=make_date("2017-02-20"))
+        earliest = ReadingFactory(
+            publication=in_progress, start_date=make_date("2017-02-15")
+        )
+        ReadingFactory(
+            publication=in_progress,
+            start_date=make_date("2017-01-01"),
+            end_date=make_date("2017-01-10"),
+        )
+        ReadingFactory(
+            publication=read,
+            start_date=make_date("2017-02-15"),
+            end_date=make_date("2017-02-28"),
+        )
+        # Make them all wrong:
+        Publication.objects.update(
+            reading_state=Publication.ReadingState.READ, current_reading=None
+        )
+
+        with self.assertNumQueries(2):
+            Publication.update_reading_states([unread.pk, in_progress.pk, read.pk])
+
+        states = {
+            p.pk: (p.reading_state, p.current_reading_id)
+            for p in Publication.objects.all()
+        }
+        self.assertEqual(
+            states,
+            {
+                unread.pk: (Publication.ReadingState.UNREAD, None),
+                in_progress.pk: (Publication.ReadingState.IN_PROGRESS, earliest.pk),
+                read.pk: (Publication.ReadingState.READ, None),
+            },
+        )
+
 
 class ReadingTestCase(TestCase):
     def test_str(self):
@@ -377,3 +569,50 @@ class ReadingTestCase(TestCase):
             reading.clean()
         except ValidationError:
             self.fail("clean() raised ValidationError unexpectedly.")
+
+
+class ReportModelsTestCase(TestCase):
+    "The unmanaged models of the reporting views."
+
+    def setUp(self):
+        self.creator = IndividualCreatorFactory()
+        self.pub = PublicationFactory(
+            title="The Book", series=PublicationSeriesFactory(title="The Series")
+        )
+        PublicationRoleFactory(publication=self.pub, creator=self.creator)
+        PublicationRoleFactory(
+            publication=self.pub, creator=self.creator, role_name="Illustrator"
+        )
+        PublicationRoleFactory(publication=self.pub)
+        self.reading = ReadingFactory(
+            publication=self.pub,
+            start_date=make_date("2017-02-01"),
+            end_date=make_date("2017-02-28"),
+            is_finished=True,
+        )
+
+    def test_reading_fact(self):
+        fact = ReadingFact.objects.select_related("publication").get()
+        self.assertEqual(fact.reading_id, self.reading.pk)
+        self.assertEqual(fact.publication, self.pub)
+        self.assertEqual(fact.publication_title, "The Book")
+        self.assertEqual(fact.publication_kind, "book")
+        self.assertEqual(fact.series_title, "The Series")
+        self.assertEqual(fact.end_date, make_date("2017-02-28"))
+        self.assertEqual(fact.end_date_month, 2)
+        self.assertTrue(fact.is_finished)
+        self.assertFalse(fact.is_removed)
+        self.assertEqual(fact.creator_count, 3)
+
+    def test_reading_fact_no_series(self):
+        ReadingFactory(publication=PublicationFactory(series=None))
+        self.assertEqual(ReadingFact.objects.filter(series=None).get().series_title, "")
+
+    def test_reading_participation(self):
+        "A Creator with two roles on a Publication only has one row."
+        row = ReadingParticipation.objects.get(creator=self.creator)
+        self.assertEqual(row.pk, (self.creator.pk, self.reading.pk))
+        self.assertEqual(row.publication_id, self.pub.pk)
+        self.assertEqual(row.end_date, make_date("2017-02-28"))
+        self.assertEqual(row.roles, 2)
+        self.assertEqual(ReadingParticipation.objects.count(), 2)
@@ -1,14 +1,24 @@
+from datetime import date
 from unittest.mock import patch
 
+import time_machine
 from django.template import TemplateSyntaxError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils.safestring import SafeString
 
-from spectator.reading.factories import BookFactory, PublicationFactory, ReadingFactory
+from spectator.reading.factories import (
+    BookFactory,
+    PublicationFactory,
+    PublicationRoleFactory,
+    ReadingFactory,
+)
 from spectator.reading.templatetags.spectator_reading import (
     annual_reading_counts,
     day_publications,
+    days_publications,
     in_progress_publications,
+    on_this_day_readings,
+    on_this_day_readings_card,
     reading_dates,
     reading_years,
     unread_counts_for_dates,
@@ -139,6 +149,76 @@ class DayPublicationsTestCase(TestCase):
         qs = day_publications(make_date("2017-02-15"))
         self.assertEqual(len(qs), 0)
 
+    def test_num_queries(self):
+        "One query for the Publications, and two for their roles and creators."
+        for _ in range(3):
+            ReadingFactory(
+                publication=PublicationRoleFactory().publication,
+                start_date=make_date("2017-02-10"),
+            )
+        with self.assertNumQueries(3):
+            qs = day_publications(make_date("2017-02-15"))
+            for pub in qs:
+                [role.creator for role in pub.roles.all()]
+        self.assertEqual(len(qs), 3)
+
+
+class DaysPublicationsTestCase(TestCase):
+    def test_dates(self):
+        "It should call the manager method with a list of dates."
+        pub = PublicationFactory()
+        ReadingFactory(
+            publication=pub,
+            start_date=make_date("2017-02-10"),
+            end_date=make_date("2017-02-20"),
+        )
+        dates = (make_date("2017-02-09"), make_date("2017-02-10"))
+        result = days_publications(dates)
+        self.assertEqual(
+            result, {make_date("2017-02-09"): [], make_date("2017-02-10"): [pub]}
+        )
+
+
+class OnThisDayReadingsTestCase(TestCase):
+    def test_queryset(self):
+        "It should only include Readings that ended in previous years."
+        reading_2015 = ReadingFactory(end_date=make_date("2015-02-10"))
+        reading_2016 = ReadingFactory(end_date=make_date("2016-02-10"))
+        ReadingFactory(end_date=make_date("2016-02-11"))
+        ReadingFactory(end_date=make_date("2017-02-10"))
+        qs = on_this_day_readings(make_date("2017-02-10"))
+        self.assertEqual(list(qs), [reading_2016, reading_2015])
+
+    def test_no_removed_publications(self):
+        ReadingFactory(
+            publication=PublicationFactory(is_removed=True),
+            end_date=make_date("2015-02-10"),
+        )
+        qs = on_this_day_readings(make_date("2017-02-10"))
+        self.assertEqual(len(qs), 0)
+
+    @time_machine.travel("2017-02-10 12:00:00", tick=False)
+    def test_default_date(self):
+        "It should default to today."
+        reading = ReadingFactory(end_date=make_date("2015-02-10"))
+        self.assertEqual(list(on_this_day_readings()), [reading])
+
+    @time_machine.travel("2017-02-09 20:00:00 +0000", tick=False)
+    @override_settings(TIME_ZONE="Pacific/Auckland")
+    def test_default_date_local(self):
+        "It should default to today in the current time zone, not UTC."
+        reading = ReadingFactory(end_date=date(2015, 2, 10))
+        ReadingFactory(end_date=date(2015, 2, 9))
+        self.assertEqual(list(on_this_day_readings()), [reading])
+
+
+class OnThisDayReadingsCardTestCase(TestCase):
+    def test_result(self):
+        ReadingFactory(end_date=make_date("2015-02-10"))
+        result = on_this_day_readings_card(make_date("2017-02-10"))
+        self.assertEqual(result["card_title"], "Finished on this day")
+        self.assertEqual(len(result["reading_list"]), 1)
+
 
 class ReadingYearsTestCase(TestCase):
     def test_queryset(self):
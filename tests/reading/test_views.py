@@ -236,6 +236,18 @@ class PublicationDetailViewTestCase(ViewTestCase):
             response.template_name[0], "spectator_reading/publication_detail.html"
         )
 
+    def test_thumbnail_placeholder(self):
+        "It should show a placeholder until the thumbnail sizes are generated."
+        response = views.PublicationDetailView.as_view()(self.request, slug="9g5o8")
+        self.assertContains(response, "spectator-thumbnail-placeholder")
+        self.assertNotContains(response, "/media/CACHE/")
+
+    def test_thumbnail_ready(self):
+        Publication.objects.filter(pk=123).update(thumbnails_ready=True)
+        response = views.PublicationDetailView.as_view()(self.request, slug="9g5o8")
+        self.assertNotContains(response, "spectator-thumbnail-placeholder")
+        self.assertContains(response, "/media/CACHE/")
+
 
 class ReadingYearArchiveViewTestCase(ViewTestCase):
     def setUp(self):
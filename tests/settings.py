@@ -76,3 +76,7 @@ STATIC_URL = "/static/"
 MEDIA_ROOT = tempfile.mkdtemp()
 
 MEDIA_URL = "/media/"
+
+# Don't run background tasks, like generating thumbnails, unless a test
+# asks for them with @override_app_settings(TASKS_MODE="sync"):
+SPECTATOR_TASKS_MODE = "queue"
@@ -0,0 +1,110 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from spectator.core.models import Creator
+from spectator.core.search import prefix_filter
+from spectator.events.models import Event, EventRole, WorkSelection
+from spectator.reading.models import Publication, Reading
+
+# The query planners of other databases aren't checked.
+SUPPORTED_VENDORS = ("postgresql", "sqlite")
+
+
+@skipUnless(connection.vendor in SUPPORTED_VENDORS, "Unsupported database")
+class QueryPlanTestCase(TestCase):
+    """
+    Checks that common queries use the indexes defined on the models.
+
+    The tables are empty, so on PostgreSQL sequential scans are disabled to
+    stop the planner choosing them simply because they're cheapest.
+    """
+
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assert_uses_index(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_event_kind(self):
+        self.assert_uses_index(
+            Event.objects.filter(kind="gig").order_by("-date"),
+            "spectator_event_kind_date",
+        )
+
+    def test_event_date(self):
+        self.assert_uses_index(
+            Event.objects.filter(date__year=2017).order_by("date"),
+            "spectator_event_date",
+        )
+
+    def test_event_venue(self):
+        self.assert_uses_index(
+            Event.objects.filter(venue_id=1).order_by("-date"),
+            "spectator_event_venue_date",
+        )
+
+    def test_event_on_this_day(self):
+        self.assert_uses_index(
+            Event.objects.on_this_day(2, 10), "spectator_event_month_day"
+        )
+
+    def test_eventrole_creator(self):
+        self.assert_uses_index(
+            EventRole.objects.filter(creator_id=1), "spectator_eventrole_creator"
+        )
+
+    def test_workselection_work(self):
+        self.assert_uses_index(
+            WorkSelection.objects.filter(work_id=1), "spectator_worksel_work_event"
+        )
+
+    def test_reading_objects(self):
+        self.assert_uses_index(Reading.objects.all(), "spectator_reading_end_date")
+
+    def test_reading_objects_desc(self):
+        self.assert_uses_index(Reading.objects_desc.all(), "spectator_reading_end_date")
+
+    def test_reading_end_date(self):
+        self.assert_uses_index(
+            Reading.objects.filter(end_date__year=2017).order_by("end_date"),
+            "spectator_reading_end",
+        )
+
+    def test_reading_on_this_day(self):
+        self.assert_uses_index(
+            Reading.objects.on_this_day(2, 10), "spectator_reading_month_day"
+        )
+
+    def test_publication_kind(self):
+        self.assert_uses_index(
+            Publication.objects.filter(kind="book", is_removed=False).order_by(
+                "title_sort"
+            ),
+            "spectator_pub_kind_title",
+        )
+
+    def test_publication_series(self):
+        self.assert_uses_index(
+            Publication.objects.filter(series_id=1, is_removed=False).order_by(
+                "title_sort"
+            ),
+            "spectator_pub_series_title",
+        )
+
+    def test_publication_in_progress(self):
+        self.assert_uses_index(
+            Publication.in_progress_objects.all(), "spectator_pub_reading_state"
+        )
+
+    def test_creator_autocomplete_prefix(self):
+        self.assert_uses_index(
+            Creator.objects.filter(prefix_filter("name_sort", "ada")).order_by(
+                "name_sort"
+            ),
+            "name_sort",
+        )